@@ -1,3 +1,4 @@
+import logging
 import json
 import re
 from typing import List, Dict, Optional
@@ -12,6 +13,15 @@ except ImportError:
     GenerationConfig = None
 
 from .blog_prompts import BlogPrompts
+from .news_ranker import select_top_news
+from .gemini_client import (get_prefix_cached_model, invalidate_prefix_cache, is_cache_miss_error,
+                            call_with_fallback, generation_limiter, error_status_code, ROTATE_STATUS_CODES,
+                            DEFAULT_MODEL_TIERS, DEFAULT_LATENCY_BUDGET)
+from utils.credential_pool import CredentialsExhaustedError
+from utils.article_fetcher import get_article_fetcher
+from utils.metrics import GEMINI_CALLS, GEMINI_SECONDS, RETRIES
+
+logger = logging.getLogger(__name__)
 
 class BlogGenerator(QThread):
     blog_generated = pyqtSignal(dict)
@@ -19,25 +29,102 @@ class BlogGenerator(QThread):
     status_changed = pyqtSignal(str)
     progress_updated = pyqtSignal(int)
 
-    def __init__(self, gemini_api_key: str):
+    BATCH_OUTPUT_TOKENS_PER_POST = 4000
+    MAX_OUTPUT_TOKENS = 65536
+    BATCH_RESPONSE_SCHEMA = {
+        'type': 'array',
+        'items': {
+            'type': 'object',
+            'properties': {
+                'news_index': {'type': 'integer'},
+                'title': {'type': 'string'},
+                'content': {'type': 'string'},
+                'conclusion': {'type': 'string'},
+                'image_keywords': {'type': 'array', 'items': {'type': 'string'}},
+                'tags': {'type': 'array', 'items': {'type': 'string'}}
+            },
+            'required': ['news_index', 'title', 'content', 'conclusion', 'image_keywords', 'tags']
+        }
+    }
+
+    def __init__(self, gemini_api_key: str, credential_pool=None, story_index=None, article_fetcher=None,
+                 model_tiers: Optional[List[str]] = None, latency_budget: float = DEFAULT_LATENCY_BUDGET,
+                 hedge: bool = True):
         super().__init__()
         self.gemini_api_key = gemini_api_key
+        self.credential_pool = credential_pool
+        self.model_tiers = [name for name in (model_tiers or DEFAULT_MODEL_TIERS) if name]
+        self.latency_budget = latency_budget
+        self.hedge = hedge
+        self.story_index = story_index
+        self.article_fetcher = article_fetcher or get_article_fetcher()
         self.news_data = []
         self.model = None
         self._init_client()
 
     def _init_client(self):
         if not genai:
-            print("google-generativeai 라이브러리가 설치되지 않았습니다.")
+            logger.error("google-generativeai 라이브러리가 설치되지 않았습니다.")
             self.model = None
             return
         try:
-            genai.configure(api_key=self.gemini_api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
+            self.model = self._get_model(self.gemini_api_key, self.model_tiers[0])
         except Exception as e:
-            print(f"클라이언트 초기화 실패: {e}")
+            logger.error("클라이언트 초기화 실패: %s", e, extra={'model': self.model_tiers[0]})
             self.model = None
 
+    def _get_model(self, api_key: str, model_name: str):
+        return get_prefix_cached_model(api_key, model_name, BlogPrompts.SYSTEM_INSTRUCTION)
+
+    def _generate(self, api_key: str, model_name: str, prompt: str, generation_config, timeout: float):
+        try:
+            with GEMINI_SECONDS.time(model=model_name):
+                response = self._generate_content(api_key, model_name, prompt, generation_config, timeout)
+        except Exception as e:
+            GEMINI_CALLS.inc(model=model_name, outcome=str(error_status_code(e) or type(e).__name__))
+            raise
+        GEMINI_CALLS.inc(model=model_name, outcome='ok')
+        return response
+
+    def _generate_content(self, api_key: str, model_name: str, prompt: str, generation_config, timeout: float):
+        request_options = {'timeout': timeout}
+        with generation_limiter:
+            try:
+                return self._get_model(api_key, model_name).generate_content(
+                    prompt, generation_config=generation_config, request_options=request_options)
+            except Exception as e:
+                if not is_cache_miss_error(e):
+                    raise
+                # TTL 만료 등으로 서버에서 캐시가 사라졌으면 다시 등록한 뒤 한 번만 재시도
+                RETRIES.inc(operation='gemini', reason='prefix_cache_miss')
+                invalidate_prefix_cache(api_key, model_name, BlogPrompts.SYSTEM_INSTRUCTION)
+                return self._get_model(api_key, model_name).generate_content(
+                    prompt, generation_config=generation_config, request_options=request_options)
+
+    def _call_model(self, prompt: str, generation_config, latency_budget: Optional[float] = None):
+        return call_with_fallback(
+            lambda model_name, timeout: self._call_model_with_keys(model_name, prompt, generation_config, timeout),
+            self.model_tiers, latency_budget or self.latency_budget, self.hedge
+        )
+
+    def _call_model_with_keys(self, model_name: str, prompt: str, generation_config, timeout: float):
+        if not self.credential_pool or not len(self.credential_pool):
+            return self._generate(self.gemini_api_key, model_name, prompt, generation_config, timeout)
+        attempts = len(self.credential_pool)
+        for attempt in range(attempts):
+            api_key = self.credential_pool.acquire()
+            try:
+                response = self._generate(api_key, model_name, prompt, generation_config, timeout)
+            except Exception as e:
+                status_code = error_status_code(e)
+                self.credential_pool.release(api_key, status_code)
+                if status_code in ROTATE_STATUS_CODES and attempt < attempts - 1:
+                    RETRIES.inc(operation='gemini', reason=f'key_rotation_{status_code}')
+                    continue
+                raise
+            self.credential_pool.release(api_key, 200)
+            return response
+
     def set_news_data(self, news_data: List[Dict]):
         self.news_data = news_data
 
@@ -71,53 +158,72 @@ class BlogGenerator(QThread):
             self.error_occurred.emit(f"오류: {str(e)}")
 
     def _select_top_news(self) -> Optional[Dict]:
-        if not self.news_data:
-            return None
-        news_scores = []
-        for i, news in enumerate(self.news_data):
-            score = max(0, 100 - i)
-            title = news.get('title', '')
-            keywords = ['국정감사', '정치', '경제', '대통령', '개혁', '정책']
-            for keyword in keywords:
-                if keyword in title:
-                    score += 20
-            news_scores.append((score, news))
-        news_scores.sort(key=lambda x: x[0], reverse=True)
-        return news_scores[0][1] if news_scores else None
-
-    def _get_additional_context(self, news_item: Dict) -> str:
-        title = news_item.get('title', '')
-        category = news_item.get('category', '')
-        keywords = re.findall(r'[가-힣\w]{2,}', title)[:3]
-        search_query = ' '.join(keywords) if keywords else title
-        return BlogPrompts.get_context_template(category, search_query)
-
-    def _generate_with_sdk(self, prompt: str) -> Dict:
+        return select_top_news(self.news_data, self.story_index)
+
+    def _get_additional_context(self, news_item: Dict, deadline: Optional[float] = None) -> str:
+        try:
+            if deadline is None:
+                context = self.article_fetcher.build_context(news_item, self.news_data)
+            else:
+                context = self.article_fetcher.build_context(news_item, self.news_data, deadline=deadline)
+        except Exception as e:
+            logger.warning("기사 원문 수집 실패 (기본 배경 정보 사용): %s", e, extra={'title': news_item.get('title', '')})
+            context = ''
+        return context or BlogPrompts.get_news_context(news_item)
+
+    def _generate_with_sdk(self, prompt: str, temperature: float = 0.7, latency_budget: Optional[float] = None) -> Dict:
         try:
             generation_config = GenerationConfig(
-                temperature=0.7,
+                temperature=temperature,
                 top_k=40,
                 top_p=0.9,
                 max_output_tokens=4000,
                 response_mime_type="application/json"
             )
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
-            return json.loads(response.text)
-        except json.JSONDecodeError:
-            return self._extract_json(response.text)
+            response, model_name = self._call_model(prompt, generation_config, latency_budget)
+            try:
+                blog_data = json.loads(response.text)
+            except json.JSONDecodeError:
+                blog_data = self._extract_json(response.text)
+            blog_data['generator'] = model_name
+            return blog_data
+        except CredentialsExhaustedError:
+            raise
         except Exception as e:
             raise Exception(f"SDK 호출 실패: {str(e)}")
 
+    def generate_batch(self, news_picks: List[Dict], latency_budget: Optional[float] = None) -> List[Optional[Dict]]:
+        # 여러 뉴스를 한 번의 요청으로 묶어 고정 지시문과 요청 오버헤드를 나눠 쓰고, 응답 배열을 뉴스별 결과로 다시 나눔
+        prompt = BlogPrompts.get_batch_prompt([pick['prompt'] for pick in news_picks])
+        generation_config = GenerationConfig(
+            temperature=0.7,
+            top_k=40,
+            top_p=0.9,
+            max_output_tokens=min(self.BATCH_OUTPUT_TOKENS_PER_POST * len(news_picks), self.MAX_OUTPUT_TOKENS),
+            response_mime_type="application/json",
+            response_schema=self.BATCH_RESPONSE_SCHEMA
+        )
+        response, model_name = self._call_model(
+            prompt, generation_config, latency_budget or self.latency_budget * len(news_picks))
+        try:
+            posts = json.loads(response.text)
+        except json.JSONDecodeError as e:
+            raise Exception(f"배치 응답 파싱 실패: {e}")
+        results = [None] * len(news_picks)
+        for post in posts if isinstance(posts, list) else []:
+            index = post.pop('news_index', None)
+            if isinstance(index, int) and 0 <= index < len(news_picks) and results[index] is None:
+                post['generator'] = model_name
+                results[index] = self._post_process(post, news_picks[index]['top_news'])
+        return results
+
     def _extract_json(self, text: str) -> Dict:
         json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', text, re.DOTALL)
         if json_match:
             try:
                 return json.loads(json_match.group(1))
             except json.JSONDecodeError as e:
-                print(f"JSON 파싱 실패: {e}")
+                logger.warning("JSON 파싱 실패: %s", e)
 
         return {
             "title": "AI 생성 블로그",
@@ -135,10 +241,11 @@ class BlogGenerator(QThread):
             "source_news": {
                 "title": original_news.get("title", ""),
                 "url": original_news.get("originallink", ""),
-                "pub_date": original_news.get("pubDate", "")
+                "pub_date": original_news.get("pubDate", ""),
+                "category": original_news.get("category", "")
             },
             "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "generator": "Gemini 2.5 Flash",
+            "generator": blog_data.get("generator", self.model_tiers[0]),
             "word_count": word_count,
             "estimated_read_time": max(1, word_count // 300)
         }
\ No newline at end of file
@@ -0,0 +1,33 @@
+import re
+from typing import Dict
+
+TITLE_LENGTH_RANGE = (30, 50)
+TARGET_CONTENT_LENGTH = 2500
+CONCLUSION_LENGTH_RANGE = (100, 300)
+TAG_COUNT_RANGE = (5, 8)
+IMAGE_MARKERS = ('[이미지_1]', '[이미지_2]')
+FALLBACK_TITLE = "AI 생성 블로그"
+
+_HEADING_RE = re.compile(r'^##\s+\S', re.MULTILINE)
+
+def _range_score(value: int, low: int, high: int, weight: float) -> float:
+    if low <= value <= high:
+        return weight
+    distance = low - value if value < low else value - high
+    return max(0.0, weight * (1 - distance / max(low, 1)))
+
+def score_blog(blog_data: Dict) -> float:
+    # 프롬프트의 작성 지침(제목 길이, 본문 분량, 이미지 마커, 결론 길이, 태그 수)을 얼마나 지켰는지로 점수를 매김
+    title = blog_data.get('title', '') or ''
+    content = blog_data.get('content', '') or ''
+    if not content or title == FALLBACK_TITLE:
+        return 0.0
+    score = _range_score(len(title), *TITLE_LENGTH_RANGE, weight=20)
+    score += 25 * max(0.0, 1 - abs(len(content) - TARGET_CONTENT_LENGTH) / TARGET_CONTENT_LENGTH)
+    score += sum(10 for marker in IMAGE_MARKERS if marker in content)
+    score += min(len(_HEADING_RE.findall(content)), 3) / 3 * 10
+    score += _range_score(len(blog_data.get('conclusion', '') or ''), *CONCLUSION_LENGTH_RANGE, weight=10)
+    score += _range_score(len(blog_data.get('tags', []) or []), *TAG_COUNT_RANGE, weight=10)
+    if len(blog_data.get('image_keywords', []) or []) >= 2:
+        score += 5
+    return round(score, 2)
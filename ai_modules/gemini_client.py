@@ -0,0 +1,191 @@
+import logging
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import timedelta
+from typing import Callable, List, Tuple
+from utils.rate_limiter import RateLimiter
+from utils import http_replay
+from utils.metrics import RETRIES, cache_lookup
+
+try:
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
+    from google.generativeai import caching as genai_caching
+except ImportError:
+    genai = None
+    genai_client = None
+    genai_caching = None
+
+logger = logging.getLogger(__name__)
+
+_CONFIGURE_LOCK = threading.Lock()
+
+ROTATE_STATUS_CODES = (401, 403, 429)
+
+# 로컬 스텁 서버로 검증할 때 사용 (예: GEMINI_API_ENDPOINT=http://127.0.0.1:8090)
+ENDPOINT_ENV = 'GEMINI_API_ENDPOINT'
+
+PREFIX_CACHE_TTL = 3600
+PREFIX_CACHE_REFRESH_MARGIN = 120
+PREFIX_CACHE_RETRY_SECONDS = 600
+# 명시적 컨텍스트 캐시의 최소 입력 토큰 수. 토큰 수는 UTF-8 바이트 수로 어림함
+PREFIX_CACHE_MIN_TOKENS = 1024
+BYTES_PER_TOKEN = 4
+
+DEFAULT_MODEL_TIERS = ['gemini-2.5-flash', 'gemini-2.5-flash-lite']
+DEFAULT_LATENCY_BUDGET = 120
+HEDGE_AFTER_FRACTION = 0.6
+
+# 후보 동시 생성·헤지 요청이 모두 같은 한도를 나눠 쓰도록 프로세스 전체에서 공유
+generation_limiter = RateLimiter(max_concurrent=4, requests_per_minute=30)
+
+class LatencyBudgetExceeded(Exception):
+    pass
+
+_prefix_models = {}
+_prefix_create_locks = {}
+
+def _configure(api_key: str):
+    endpoint = os.environ.get(ENDPOINT_ENV, '').strip()
+    if endpoint:
+        genai.configure(api_key=api_key, transport='rest', client_options={'api_endpoint': endpoint})
+    elif http_replay.is_active():
+        # 녹화/재생은 requests 어댑터에서 이뤄지므로 gRPC 대신 REST 전송을 사용
+        genai.configure(api_key=api_key, transport='rest')
+    else:
+        genai.configure(api_key=api_key)
+
+def _prefix_key(api_key: str, model_name: str, system_instruction: str) -> tuple:
+    return api_key, model_name, hashlib.sha1(system_instruction.encode('utf-8')).hexdigest()
+
+def _estimated_tokens(text: str) -> int:
+    return len(text.encode('utf-8')) // BYTES_PER_TOKEN
+
+def _create_cached_content(cache_client, model_name: str, display_name: str, system_instruction: str,
+                           ttl_seconds: int):
+    # CachedContent.create()는 호출 시점의 전역 클라이언트를 쓰므로, 미리 고정한 키의 클라이언트로 같은 요청을 보냄
+    request = genai_caching.CachedContent._prepare_create_request(
+        model=f"models/{model_name}",
+        display_name=display_name,
+        system_instruction=system_instruction,
+        ttl=timedelta(seconds=ttl_seconds)
+    )
+    return genai_caching.CachedContent._from_obj(cache_client.create_cached_content(request))
+
+def get_prefix_cached_model(api_key: str, model_name: str, system_instruction: str,
+                            ttl_seconds: int = PREFIX_CACHE_TTL):
+    # 고정 지시문을 CachedContent로 등록한 모델을 키별로 공유하고, 만료가 가까우면 새로 만든다
+    key = _prefix_key(api_key, model_name, system_instruction)
+    with _CONFIGURE_LOCK:
+        entry = _prefix_models.get(key)
+        if entry and entry[1] - PREFIX_CACHE_REFRESH_MARGIN > time.time():
+            cache_lookup('gemini_prefix', True)
+            return entry[0]
+        create_lock = _prefix_create_locks.setdefault(key, threading.Lock())
+    # 캐시 생성은 네트워크 호출이므로 전역 잠금 밖에서 하고, 같은 키를 동시에 두 번 만들지 않도록 키별 잠금만 잡음
+    with create_lock:
+        with _CONFIGURE_LOCK:
+            entry = _prefix_models.get(key)
+            if entry and entry[1] - PREFIX_CACHE_REFRESH_MARGIN > time.time():
+                cache_lookup('gemini_prefix', True)
+                return entry[0]
+            # configure()는 프로세스 전역 설정이므로 다른 키로 바뀌기 전에 이 키의 클라이언트를 고정
+            _configure(api_key)
+            generative_client = genai_client.get_default_generative_client()
+            cache_client = genai_client.get_default_cache_client()
+        cache_lookup('gemini_prefix', False)
+        if _estimated_tokens(system_instruction) < PREFIX_CACHE_MIN_TOKENS:
+            # 최소 토큰 수에 못 미치면 생성 요청이 매번 실패하므로 시도하지 않고 일반 system_instruction 모델을 계속 씀
+            logger.info("지시문이 짧아 프롬프트 컨텍스트 캐시를 쓰지 않습니다.",
+                        extra={'model': model_name, 'estimated_tokens': _estimated_tokens(system_instruction)})
+            model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+            expires_at = float('inf')
+        else:
+            try:
+                cached_content = _create_cached_content(cache_client, model_name, f"blog-prefix-{key[2][:12]}",
+                                                        system_instruction, ttl_seconds)
+                model = genai.GenerativeModel.from_cached_content(cached_content)
+                expires_at = cached_content.expire_time.timestamp()
+            except Exception as e:
+                # 미지원 모델 등으로 캐시를 만들 수 없으면 일반 system_instruction으로 대체하고 나중에 다시 시도
+                logger.warning("프롬프트 컨텍스트 캐시 생성 실패 (일반 호출로 진행): %s", e, extra={'model': model_name})
+                model = genai.GenerativeModel(model_name, system_instruction=system_instruction)
+                expires_at = time.time() + PREFIX_CACHE_RETRY_SECONDS + PREFIX_CACHE_REFRESH_MARGIN
+        model._client = generative_client
+        with _CONFIGURE_LOCK:
+            _prefix_models[key] = (model, expires_at)
+    return model
+
+def invalidate_prefix_cache(api_key: str, model_name: str, system_instruction: str):
+    with _CONFIGURE_LOCK:
+        _prefix_models.pop(_prefix_key(api_key, model_name, system_instruction), None)
+
+def is_cache_miss_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return error_status_code(error) in (403, 404) and 'cachedcontent' in message.replace(' ', '').replace('_', '')
+
+def error_status_code(error: Exception) -> int:
+    code = getattr(error, 'code', None)
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return 0
+
+def call_with_fallback(call: Callable[[str, float], object], model_tiers: List[str],
+                       latency_budget: float = DEFAULT_LATENCY_BUDGET, hedge: bool = True) -> Tuple[object, str]:
+    # call(model_name, timeout)을 앞쪽 모델부터 시도하고, 실패하면 즉시 다음 단계로 넘어간다.
+    # hedge가 켜져 있으면 남은 예산의 HEDGE_AFTER_FRACTION이 지나도록 응답이 없을 때 다음 모델을 동시에 호출해 먼저 끝난 결과를 쓴다.
+    if not model_tiers:
+        raise ValueError("모델 단계가 비어 있습니다.")
+    started = time.monotonic()
+    deadline = started + latency_budget
+    next_hedge = started + latency_budget * HEDGE_AFTER_FRACTION
+    executor = ThreadPoolExecutor(max_workers=len(model_tiers), thread_name_prefix='gemini-tier')
+    pending = {}
+    errors = []
+    next_tier = 0
+
+    def launch():
+        nonlocal next_tier
+        model_name = model_tiers[next_tier]
+        next_tier += 1
+        pending[executor.submit(call, model_name, max(1.0, deadline - time.monotonic()))] = model_name
+
+    try:
+        launch()
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            timeout = deadline - now
+            can_hedge = hedge and next_tier < len(model_tiers)
+            if can_hedge:
+                timeout = min(timeout, max(0.0, next_hedge - now))
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if can_hedge and time.monotonic() >= next_hedge:
+                    logger.info("%s 응답 지연, %s 동시 호출", pending[next(iter(pending))], model_tiers[next_tier],
+                                extra={'model': model_tiers[next_tier]})
+                    RETRIES.inc(operation='gemini', reason='hedge')
+                    launch()
+                    next_hedge = time.monotonic() + (deadline - time.monotonic()) * HEDGE_AFTER_FRACTION
+                continue
+            for future in done:
+                model_name = pending.pop(future)
+                try:
+                    return future.result(), model_name
+                except Exception as e:
+                    logger.warning("%s 호출 실패: %s", model_name, e, extra={'model': model_name})
+                    errors.append(e)
+            if not pending and next_tier < len(model_tiers):
+                RETRIES.inc(operation='gemini', reason='fallback')
+                launch()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if pending:
+        raise LatencyBudgetExceeded(f"생성 지연 예산 {latency_budget:.0f}초를 초과했습니다.")
+    raise errors[-1]
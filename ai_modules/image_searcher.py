@@ -1,5 +1,42 @@
-import requests
-from typing import List, Dict
+import re
+import math
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
+from utils.http_session import get_session
+from utils.metrics import ERRORS
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_MARKERS = 2
+DEFAULT_CANDIDATES = 12
+SEARCH_TIMEOUT = 10
+PREFERRED_WIDTH = 1600
+PREFERRED_ASPECT = 16 / 9
+
+def _words(text: str) -> set:
+    return {word for word in re.findall(r'[0-9a-z가-힣]+', str(text).lower()) if len(word) > 1}
+
+def score_candidate(candidate: Dict, keyword: str, context: str = '') -> float:
+    # 설명이 검색어·글 내용과 얼마나 겹치는지와 해상도, 가로 비율로 점수를 매김
+    description = _words(candidate.get('description', ''))
+    keyword_words = _words(keyword)
+    keyword_overlap = len(description & keyword_words) / len(keyword_words) if keyword_words else 0.0
+    context_overlap = min(len(description & _words(context)), 3) / 3
+    width = candidate.get('width') or 0
+    height = candidate.get('height') or 0
+    size_score = min(width / PREFERRED_WIDTH, 1.0) if width else 0.5
+    aspect_score = 0.5
+    if width and height:
+        aspect_score = max(0.0, 1.0 - abs(math.log((width / height) / PREFERRED_ASPECT)))
+    return round(2.0 * keyword_overlap + 1.0 * context_overlap + 1.0 * size_score + 1.0 * aspect_score, 4)
+
+def rank_candidates(candidates: List[Dict], keyword: str, context: str = '') -> List[Dict]:
+    for candidate in candidates:
+        candidate['score'] = score_candidate(candidate, keyword, context)
+    # 점수가 같으면 API가 돌려준 관련도 순서를 유지
+    return sorted(candidates, key=lambda candidate: -candidate['score'])
 
 class ImageSearcher:
     def __init__(self, settings_manager):
@@ -9,35 +46,55 @@ class ImageSearcher:
         self.unsplash_url = "https://api.unsplash.com/search/photos"
         self.pixabay_url = "https://pixabay.com/api/"
 
-    def search_images(self, keywords: List[str], per_keyword: int = 1) -> Dict[str, List[Dict]]:
-        results = {}
+    def search_images(self, keywords: List[str], per_keyword: int = DEFAULT_CANDIDATES, context: str = '',
+                      timeout: Optional[float] = None) -> Dict[str, List[Dict]]:
+        keywords = keywords[:MAX_IMAGE_MARKERS]
         if not keywords:
-            return results
-        for i, keyword in enumerate(keywords[:2], 1):
-            try:
-                images = []
-                if self.unsplash_access_key:
-                    images = self._search_unsplash(keyword, per_keyword)
-                if not images and self.pixabay_key:
-                    images = self._search_pixabay(keyword, per_keyword)
-                results[f"이미지_{i}"] = images
-            except Exception as e:
-                print(f"'{keyword}' 검색 실패: {e}")
-                results[f"이미지_{i}"] = []
-        return results
+            return {}
+        expires_at = time.monotonic() + (SEARCH_TIMEOUT if timeout is None else timeout)
+        executor = ThreadPoolExecutor(max_workers=len(keywords))
+        try:
+            futures = [executor.submit(self._search_keyword, keyword, per_keyword, context, expires_at)
+                       for keyword in keywords]
+            # 제한 시간 안에 끝나지 않은 키워드는 후보 없이 두고 기다리지 않음
+            wait(futures, timeout=max(0.0, expires_at - time.monotonic()))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        pools = [future.result() if future.done() and not future.cancelled() else [] for future in futures]
+        return {f"이미지_{i}": images for i, images in enumerate(pools, 1)}
 
-    def _search_unsplash(self, keyword: str, count: int) -> List[Dict]:
+    @staticmethod
+    def _request_timeout(expires_at: Optional[float]) -> float:
+        if expires_at is None:
+            return SEARCH_TIMEOUT
+        return min(SEARCH_TIMEOUT, expires_at - time.monotonic())
+
+    def _search_keyword(self, keyword: str, count: int, context: str,
+                        expires_at: Optional[float] = None) -> List[Dict]:
+        try:
+            images = []
+            if self.unsplash_access_key:
+                images = self._search_unsplash(keyword, count, self._request_timeout(expires_at))
+            if not images and self.pixabay_key and self._request_timeout(expires_at) > 0:
+                images = self._search_pixabay(keyword, count, self._request_timeout(expires_at))
+            return rank_candidates(images, keyword, context)
+        except Exception as e:
+            ERRORS.inc(component='image_search', kind=type(e).__name__)
+            logger.warning("이미지 검색 실패: %s", e, extra={'keyword': keyword})
+            return []
+
+    def _search_unsplash(self, keyword: str, count: int, timeout: float = SEARCH_TIMEOUT) -> List[Dict]:
         if not self.unsplash_access_key:
             return []
         try:
             params = {
                 'query': keyword,
-                'per_page': count,
+                'per_page': min(count, 30),
                 'orientation': 'landscape',
                 'content_filter': 'high'
             }
             headers = {'Authorization': f'Client-ID {self.unsplash_access_key}'}
-            response = requests.get(self.unsplash_url, params=params, headers=headers, timeout=10)
+            response = get_session().get(self.unsplash_url, params=params, headers=headers, timeout=timeout)
             if response.status_code == 200:
                 data = response.json()
                 images = []
@@ -48,14 +105,17 @@ class ImageSearcher:
                         'description': photo.get('alt_description', keyword),
                         'photographer': photo['user']['name'],
                         'source': 'Unsplash',
-                        'download_url': photo['links']['download']
+                        'download_url': photo['links']['download'],
+                        'width': photo.get('width', 0),
+                        'height': photo.get('height', 0)
                     })
                 return images
         except Exception as e:
-            print(f"Unsplash 검색 오류: {e}")
+            ERRORS.inc(component='unsplash', kind=type(e).__name__)
+            logger.warning("Unsplash 검색 오류: %s", e, extra={'keyword': keyword})
         return []
 
-    def _search_pixabay(self, keyword: str, count: int) -> List[Dict]:
+    def _search_pixabay(self, keyword: str, count: int, timeout: float = SEARCH_TIMEOUT) -> List[Dict]:
         if not self.pixabay_key:
             return []
         try:
@@ -66,10 +126,10 @@ class ImageSearcher:
                 'orientation': 'horizontal',
                 'category': 'backgrounds',
                 'min_width': 1280,
-                'per_page': count,
+                'per_page': min(max(count, 3), 200),
                 'safesearch': 'true'
             }
-            response = requests.get(self.pixabay_url, params=params, timeout=10)
+            response = get_session().get(self.pixabay_url, params=params, timeout=timeout)
             if response.status_code == 200:
                 data = response.json()
                 images = []
@@ -80,9 +140,12 @@ class ImageSearcher:
                         'description': hit.get('tags', keyword),
                         'photographer': hit['user'],
                         'source': 'Pixabay',
-                        'download_url': hit['webformatURL']
+                        'download_url': hit['webformatURL'],
+                        'width': hit.get('imageWidth', 0),
+                        'height': hit.get('imageHeight', 0)
                     })
-                return images
+                return images[:count]
         except Exception as e:
-            print(f"Pixabay 검색 오류: {e}")
+            ERRORS.inc(component='pixabay', kind=type(e).__name__)
+            logger.warning("Pixabay 검색 오류: %s", e, extra={'keyword': keyword})
         return []
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import List, Dict, Optional, Tuple
+
+RANKING_KEYWORDS = ['국정감사', '정치', '경제', '대통령', '개혁', '정책']
+COVERED_PENALTY = 1000
+
+def rank_news(news_list: List[Dict], story_index=None) -> List[Tuple[int, Dict]]:
+    news_scores = []
+    for i, news in enumerate(news_list):
+        score = max(0, 100 - i)
+        title = news.get('title', '')
+        for keyword in RANKING_KEYWORDS:
+            if keyword in title:
+                score += 20
+        if story_index and story_index.is_covered(news):
+            score -= COVERED_PENALTY
+        news_scores.append((score, news))
+    news_scores.sort(key=lambda x: x[0], reverse=True)
+    return news_scores
+
+def select_top_news(news_list: List[Dict], story_index=None) -> Optional[Dict]:
+    if not news_list:
+        return None
+    news_scores = rank_news(news_list, story_index)
+    return news_scores[0][1] if news_scores else None
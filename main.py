@@ -1,10 +1,44 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon, QFont
-from views import MainWindow
+import argparse
 
-def main():
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Blog Generator')
+    parser.add_argument('--serve', action='store_true', help='GUI 없이 로컬 REST 작업 서버로 실행')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queue-size', type=int, default=20)
+    parser.add_argument('--enqueue', metavar='JOBS_JSONL', help='배치 작업 파일(JSONL)을 영구 작업 큐에 추가')
+    parser.add_argument('--run-queue', action='store_true', help='영구 작업 큐의 작업을 처리 (중단된 작업은 마지막 단계부터 재개, 재시도 대기 작업이 끝날 때까지 실행)')
+    parser.add_argument('--queue-db', default=None, help='작업 큐 DB 경로')
+    parser.add_argument('--queue-threads', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=1, help='한 번의 Gemini 요청으로 함께 생성할 작업 수')
+    parser.add_argument('--queue-stats', action='store_true', help='작업 큐 상태 출력')
+    parser.add_argument('--record-http', metavar='CASSETTE_DIR', help='모든 HTTP 응답을 카세트 디렉터리에 녹화')
+    parser.add_argument('--replay-http', metavar='CASSETTE_DIR', help='네트워크 대신 녹화된 카세트의 응답으로 실행')
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='PROFILE_DIR',
+                        help='생성 실행마다 cProfile·tracemalloc 보고서 저장 (기본: ~/.blog_generator/profiles)')
+    parser.add_argument('--replay-latency', default='recorded',
+                        help="재생 지연: recorded(녹화 당시 시간), none, 또는 고정 초 단위 값")
+    parser.add_argument('--export', metavar='OUTPUT', help='글을 이미지와 함께 내보내기 (.zip이면 ZIP, 아니면 폴더)')
+    parser.add_argument('--export-from', choices=('history', 'queue'), default='history',
+                        help='내보낼 글: 생성 기록(history) 또는 작업 큐의 완료된 작업(queue)')
+    parser.add_argument('--export-ids', default='', help='내보낼 글/작업 ID (쉼표로 구분, 기본: 전체)')
+    parser.add_argument('--export-inline-images', action='store_true', help='HTML에 이미지를 data URI로 포함')
+    parser.add_argument('--export-max-width', type=int, default=0, help='이미지를 이 너비 이하로 재압축 (0: 원본 유지)')
+    parser.add_argument('--metrics-file', metavar='PATH', help='메트릭을 Prometheus 텍스트 형식으로 주기적으로 기록할 파일')
+    parser.add_argument('--metrics-interval', type=float, default=15, help='메트릭 파일 기록 주기 (초)')
+    parser.add_argument('--metrics-port', type=int, default=0, help='이 포트에서 /metrics 엔드포인트 제공 (0: 끔)')
+    parser.add_argument('--log-level', default='INFO', help='로그 레벨 (DEBUG, INFO, WARNING, ERROR)')
+    parser.add_argument('--log-json', action='store_true', help='로그를 한 줄에 하나씩 JSON으로 출력')
+    parser.add_argument('--log-file', default='', help='로그를 표준 에러 대신 이 파일에 기록')
+    return parser.parse_known_args(argv)[0]
+
+def run_gui():
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QIcon, QFont
+    from views import MainWindow
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     app.setFont(QFont("Segoe UI", 9))
@@ -15,5 +49,94 @@ def main():
     window.show()
     sys.exit(app.exec())
 
+def run_job_queue(args):
+    from utils import SettingsManager
+    from utils.news_archive import NewsArchive
+    from utils.story_index import open_story_index
+    from workers.job_queue import DurableJobQueue, JobQueueRunner, load_jobs_file, DEFAULT_QUEUE_PATH
+    job_queue = DurableJobQueue(args.queue_db or DEFAULT_QUEUE_PATH)
+    if args.enqueue:
+        job_ids = job_queue.enqueue_many(load_jobs_file(args.enqueue))
+        print(f"{len(job_ids)}개 작업을 큐에 추가했습니다.")
+    if args.run_queue:
+        news_archive = NewsArchive()
+        story_index = open_story_index()
+        runner = JobQueueRunner(job_queue, SettingsManager(), news_archive, story_index=story_index,
+                                batch_size=args.batch_size)
+        try:
+            runner.run(threads=args.queue_threads)
+        except KeyboardInterrupt:
+            runner.stop()
+        finally:
+            news_archive.close()
+            if story_index:
+                story_index.close()
+    print(f"작업 큐 상태: {job_queue.stats()}")
+
+def iter_export_posts(args):
+    ids = [int(value) for value in args.export_ids.split(',') if value.strip()]
+    if args.export_from == 'queue':
+        from workers.job_queue import DurableJobQueue, DEFAULT_QUEUE_PATH
+        job_queue = DurableJobQueue(args.queue_db or DEFAULT_QUEUE_PATH)
+        for job_id in ids or job_queue.succeeded_ids():
+            job = job_queue.get(job_id)
+            if job and job['result']:
+                yield {'blog_data': job['result'], 'image_paths': job['result'].get('local_images', {})}
+        return
+    from utils.post_history import PostHistory
+    post_history = PostHistory()
+    try:
+        if not ids:
+            ids = [row['id'] for row in post_history.list_page(0, post_history.count())]
+        for post_id in ids:
+            post = post_history.get_post(post_id)
+            if post:
+                yield post
+    finally:
+        post_history.close()
+
+def run_export(args):
+    from utils.exporter import export_posts
+    count = export_posts(iter_export_posts(args), args.export, inline_images=args.export_inline_images,
+                         max_image_width=args.export_max_width)
+    print(f"{count}개 글을 내보냈습니다: {args.export}")
+
+def install_http_cassette(args):
+    from utils import http_replay
+    if args.record_http:
+        http_replay.install(args.record_http, 'record')
+    elif args.replay_http:
+        http_replay.install(args.replay_http, 'replay', args.replay_latency)
+    else:
+        http_replay.install_from_env()
+
+def setup_observability(args):
+    from utils.log_config import setup_logging
+    from utils import metrics
+    setup_logging(args.log_level, json_format=args.log_json, log_file=args.log_file)
+    if args.metrics_file:
+        metrics.start_file_export(args.metrics_file, args.metrics_interval)
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port, args.host)
+
+def main():
+    args = parse_args(sys.argv[1:])
+    setup_observability(args)
+    install_http_cassette(args)
+    if args.profile is not None:
+        from utils import profiler
+        profiler.enable(args.profile or None, forced=True)
+    if args.enqueue or args.run_queue or args.queue_stats or args.export:
+        if args.enqueue or args.run_queue or args.queue_stats:
+            run_job_queue(args)
+        if args.export:
+            run_export(args)
+        return
+    if args.serve:
+        from server import serve
+        serve(args.host, args.port, workers=args.workers, queue_size=args.queue_size)
+        return
+    run_gui()
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,3 @@
+from .job_server import JobManager, serve
+
+__all__ = ['JobManager', 'serve']
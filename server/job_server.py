@@ -0,0 +1,304 @@
+import json
+import time
+import logging
+import uuid
+import queue
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+from utils.naver_news import CATEGORIES
+from utils.credential_pool import naver_pool_from_settings, gemini_pool_from_settings
+from utils.image_downloader import ImageDownloader
+from utils.story_index import open_story_index
+from utils.metrics import JOBS, REGISTRY, CONTENT_TYPE
+from workers.pipeline import GenerationPipeline
+
+logger = logging.getLogger(__name__)
+
+# 파이프라인에 초 단위로 그대로 넘기는 옵션
+NUMERIC_OPTIONS = ('deadline', 'latency_budget')
+
+class Job:
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = 'queued'
+        self.events = []
+        self.result = None
+        self.deadline_report = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'params': self.params,
+            'error': self.error,
+            'deadline_report': self.deadline_report,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'last_event': self.events[-1] if self.events else None
+        }
+
+class JobManager:
+    def __init__(self, settings_manager, news_archive=None, workers=2, queue_size=20, max_finished=500,
+                 story_index=None):
+        self.story_index = story_index
+        self.settings_manager = settings_manager
+        self.news_archive = news_archive
+        self.max_finished = max_finished
+        self.jobs = {}
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.condition = threading.Condition()
+        self.image_downloader = ImageDownloader()
+        api_settings = settings_manager.get_api_settings()
+        self.naver_pool = naver_pool_from_settings(api_settings)
+        self.gemini_pool = gemini_pool_from_settings(api_settings)
+        self._stopping = False
+        self.threads = [threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+                        for i in range(max(1, workers))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, params):
+        category_name = params.get('category', 'IT/과학')
+        if not isinstance(category_name, str) or category_name not in CATEGORIES:
+            raise ValueError(f"알 수 없는 카테고리: {category_name}")
+        keyword = params.get('keyword') or ''
+        if not isinstance(keyword, str):
+            raise ValueError("keyword는 문자열이어야 합니다.")
+        options = params.get('options') or {}
+        if not isinstance(options, dict):
+            raise ValueError("options는 JSON 객체여야 합니다.")
+        for name in NUMERIC_OPTIONS:
+            value = options.get(name)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+                raise ValueError(f"options.{name}는 0 이상의 숫자여야 합니다.")
+        candidates = options.get('candidates')
+        if candidates is not None and (isinstance(candidates, bool) or not isinstance(candidates, int)
+                                       or not 1 <= candidates <= GenerationPipeline.MAX_CANDIDATES):
+            raise ValueError(f"options.candidates는 1~{GenerationPipeline.MAX_CANDIDATES} 사이의 정수여야 합니다.")
+        candidate_mode = options.get('candidate_mode')
+        if candidate_mode is not None and candidate_mode not in GenerationPipeline.CANDIDATE_MODES:
+            raise ValueError(f"options.candidate_mode는 {', '.join(GenerationPipeline.CANDIDATE_MODES)} 중 하나여야 합니다.")
+        job = Job({
+            'category': category_name,
+            'keyword': keyword.strip(),
+            'options': options
+        })
+        with self.condition:
+            self.queue.put_nowait(job)
+            self.jobs[job.id] = job
+            self._evict_finished()
+        return job
+
+    def get(self, job_id):
+        with self.condition:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self.condition:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def wait_for_events(self, job, since, timeout=15):
+        with self.condition:
+            self.condition.wait_for(lambda: len(job.events) > since or job.done, timeout=timeout)
+            return job.events[since:], job.done
+
+    def stop(self):
+        self._stopping = True
+        for _ in self.threads:
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                break
+
+    def _evict_finished(self):
+        finished = [job for job in self.jobs.values() if job.done]
+        for job in sorted(finished, key=lambda j: j.finished_at)[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job.id]
+
+    def _add_event(self, job, stage, message):
+        with self.condition:
+            job.events.append({'stage': stage, 'message': message, 'time': time.time()})
+            self.condition.notify_all()
+
+    def _set_status(self, job, status, **fields):
+        with self.condition:
+            job.status = status
+            for name, value in fields.items():
+                setattr(job, name, value)
+            self.condition.notify_all()
+
+    def _worker_loop(self):
+        while not self._stopping:
+            job = self.queue.get()
+            if job is None:
+                break
+            self._set_status(job, 'running', started_at=time.time())
+            try:
+                result, deadline_report = self._run_job(job)
+                self._set_status(job, 'succeeded', result=result, deadline_report=deadline_report,
+                                 finished_at=time.time())
+                JOBS.inc(runner='server', status='succeeded')
+            except Exception as e:
+                logger.exception("작업 실패: %s", e, extra={'job_id': job.id})
+                JOBS.inc(runner='server', status='failed')
+                self._add_event(job, 'error', str(e))
+                self._set_status(job, 'failed', error=str(e), finished_at=time.time())
+
+    def _run_job(self, job):
+        api_settings = self.settings_manager.get_api_settings()
+        category_name = job.params['category']
+        pipeline = GenerationPipeline(
+            api_settings['naver_client_id'], api_settings['naver_client_secret'], api_settings['google_api_key'],
+            job.params['keyword'], CATEGORIES[category_name], category_name,
+            news_archive=self.news_archive,
+            news_cache_max_age=self.settings_manager.get_setting('news_cache_max_age', 0),
+            naver_pool=self.naver_pool, gemini_pool=self.gemini_pool,
+            settings_manager=self.settings_manager,
+            progress_callback=lambda stage, message: self._add_event(job, stage, message),
+            download_images=bool(job.params['options'].get('download_images')),
+            image_downloader=self.image_downloader,
+            story_index=self.story_index,
+            latency_budget=job.params['options'].get('latency_budget'),
+            deadline=job.params['options'].get('deadline'),
+            candidates=job.params['options'].get('candidates'),
+            candidate_mode=job.params['options'].get('candidate_mode')
+        )
+        return pipeline.run(), pipeline.deadline_report
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'BlogGeneratorJobServer/1.0'
+
+    @property
+    def job_manager(self):
+        return self.server.job_manager
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _path_parts(self):
+        return [part for part in urlparse(self.path).path.split('/') if part]
+
+    def do_POST(self):
+        if self._path_parts() != ['jobs']:
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(params, dict):
+                raise ValueError("요청 본문은 JSON 객체여야 합니다.")
+            job = self.job_manager.submit(params)
+        except queue.Full:
+            self._send_json(503, {'error': '작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.'})
+            return
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        self._send_json(202, job.to_dict())
+
+    def do_GET(self):
+        parts = self._path_parts()
+        if parts == ['health']:
+            self._send_json(200, {'status': 'ok', 'queued': self.job_manager.queue.qsize()})
+        elif parts == ['metrics']:
+            self._send_metrics()
+        elif parts == ['jobs']:
+            self._send_json(200, {'jobs': self.job_manager.list_jobs()})
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.job_manager.get(parts[1])
+            if not job:
+                self._send_json(404, {'error': 'job not found'})
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict())
+            elif parts[2] == 'result':
+                self._send_result(job)
+            elif parts[2] == 'events':
+                self._stream_events(job)
+            else:
+                self._send_json(404, {'error': 'not found'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def _send_metrics(self):
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_result(self, job):
+        if job.status == 'succeeded':
+            self._send_json(200, job.result)
+        elif job.status == 'failed':
+            self._send_json(500, {'error': job.error})
+        else:
+            self._send_json(409, {'status': job.status})
+
+    def _stream_events(self, job):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        sent = 0
+        try:
+            while True:
+                events, done = self.job_manager.wait_for_events(job, sent)
+                for event in events:
+                    self.wfile.write(f"event: progress\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode('utf-8'))
+                sent += len(events)
+                if done:
+                    self.wfile.write(f"event: end\ndata: {json.dumps(job.to_dict(), ensure_ascii=False)}\n\n".encode('utf-8'))
+                    break
+                if not events:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def serve(host='127.0.0.1', port=8765, workers=2, queue_size=20):
+    from utils import SettingsManager
+    from utils.news_archive import NewsArchive
+    settings_manager = SettingsManager()
+    try:
+        news_archive = NewsArchive()
+    except Exception as e:
+        logger.warning("뉴스 아카이브 열기 실패 (아카이브 없이 진행): %s", e)
+        news_archive = None
+    story_index = open_story_index()
+    job_manager = JobManager(settings_manager, news_archive, workers=workers, queue_size=queue_size,
+                             story_index=story_index)
+    httpd = ThreadingHTTPServer((host, port), JobRequestHandler)
+    httpd.daemon_threads = True
+    httpd.job_manager = job_manager
+    logger.info("작업 서버 시작: http://%s:%s", host, port)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        job_manager.stop()
+        httpd.server_close()
+        if news_archive:
+            news_archive.close()
+        if story_index:
+            story_index.close()
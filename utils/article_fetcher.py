@@ -0,0 +1,254 @@
+import logging
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from .http_session import get_session
+from .metrics import cache_lookup
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+MAX_ARTICLE_BYTES = 2 * 1024 * 1024
+DEFAULT_DEADLINE = 6.0
+DEFAULT_TOKEN_BUDGET = 1500
+
+_SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'button', 'select',
+              'iframe', 'svg', 'figure', 'figcaption'}
+_BLOCK_TAGS = {'p', 'div', 'article', 'section', 'li', 'td', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'main'}
+_VOID_TAGS = {'br', 'img', 'hr', 'meta', 'link', 'input', 'source', 'wbr'}
+_BOILERPLATE_RE = re.compile(r'무단\s*전재|재배포\s*금지|copyright|ⓒ|©|all rights reserved')
+_SPACE_RE = re.compile(r'[ \t\r\f\v]+')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?다요])\s')
+_TITLE_TOKEN_RE = re.compile(r'[가-힣A-Za-z0-9]{2,}')
+
+class _TextBlockParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._text = []
+        self._link_chars = 0
+
+    def _flush(self):
+        text = _SPACE_RE.sub(' ', ''.join(self._text)).strip()
+        if text:
+            self.blocks.append((text, self._link_chars))
+        self._text = []
+        self._link_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag == 'br' and not self._skip_depth:
+                self._text.append('\n')
+            return
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'a':
+            self._link_depth += 1
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'a':
+            self._link_depth = max(0, self._link_depth - 1)
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        self._text.append(data)
+        if self._link_depth:
+            self._link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+def extract_main_text(html_text: str, min_block_chars: int = 40) -> str:
+    parser = _TextBlockParser()
+    try:
+        parser.feed(html_text)
+        parser.close()
+    except Exception:
+        pass
+    paragraphs = []
+    seen = set()
+    for text, link_chars in parser.blocks:
+        for line in text.split('\n'):
+            line = line.strip()
+            # 메뉴·관련기사 목록처럼 링크 비중이 높은 블록과 짧은 문구, 저작권 안내는 본문이 아니므로 제외
+            if len(line) < min_block_chars or line in seen:
+                continue
+            if link_chars > len(text) * 0.5 or _BOILERPLATE_RE.search(line.lower()):
+                continue
+            seen.add(line)
+            paragraphs.append(line)
+    return '\n'.join(paragraphs)
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ''
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    trimmed = []
+    used = 0
+    for sentence in _SENTENCE_END_RE.split(text):
+        cost = estimate_tokens(sentence)
+        if used + cost > max_tokens:
+            break
+        trimmed.append(sentence)
+        used += cost
+    if not trimmed:
+        return text[:int(max_tokens * 1.5)]
+    return ' '.join(trimmed)
+
+def _title_tokens(title: str) -> set:
+    return set(_TITLE_TOKEN_RE.findall((title or '').lower()))
+
+def find_related_news(news_item: Dict, news_list: List[Dict], limit: int = 2, min_overlap: float = 0.2) -> List[Dict]:
+    base_tokens = _title_tokens(news_item.get('title', ''))
+    base_link = news_item.get('originallink') or news_item.get('link', '')
+    if not base_tokens:
+        return []
+    scored = []
+    for candidate in news_list:
+        link = candidate.get('originallink') or candidate.get('link', '')
+        if not link or link == base_link:
+            continue
+        tokens = _title_tokens(candidate.get('title', ''))
+        if not tokens:
+            continue
+        overlap = len(base_tokens & tokens) / len(base_tokens | tokens)
+        if overlap >= min_overlap:
+            scored.append((overlap, candidate))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [candidate for _, candidate in scored[:limit]]
+
+class ArticleFetcher:
+    def __init__(self, max_workers: int = 4, cache_size: int = 256, cache_ttl: float = 6 * 3600,
+                 max_bytes: int = MAX_ARTICLE_BYTES):
+        self.max_bytes = max_bytes
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='article')
+
+    def _cached(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if not entry:
+                return None
+            text, fetched_at = entry
+            if time.time() - fetched_at > self.cache_ttl:
+                del self._cache[url]
+                return None
+            self._cache.move_to_end(url)
+            return text
+
+    def _store(self, url: str, text: str):
+        with self._lock:
+            self._cache[url] = (text, time.time())
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _download(self, url: str, timeout: float) -> str:
+        response = get_session().get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if 'html' not in content_type.lower():
+                return ''
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=65536):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    break
+            raw = b''.join(chunks)
+        finally:
+            response.close()
+        # charset이 없는 한국 언론사 페이지가 많아 헤더에 없으면 본문에서 인코딩을 추정
+        encoding = response.encoding if 'charset' in content_type.lower() else None
+        if not encoding:
+            match = re.search(rb'charset=["\']?([\w-]+)', raw[:4096], re.IGNORECASE)
+            encoding = match.group(1).decode('ascii') if match else 'utf-8'
+        try:
+            html_text = raw.decode(encoding, errors='replace')
+        except LookupError:
+            html_text = raw.decode('utf-8', errors='replace')
+        return extract_main_text(html_text)
+
+    def fetch(self, url: str, timeout: float = DEFAULT_DEADLINE) -> str:
+        cached = self._cached(url)
+        cache_lookup('article', cached is not None)
+        if cached is not None:
+            return cached
+        try:
+            text = self._download(url, timeout)
+        except Exception as e:
+            logger.info("기사 본문 가져오기 실패: %s", e, extra={'url': url})
+            return ''
+        self._store(url, text)
+        return text
+
+    def fetch_many(self, urls: List[str], deadline: float = DEFAULT_DEADLINE) -> Dict[str, str]:
+        results = {}
+        futures = {}
+        for url in dict.fromkeys(u for u in urls if u and u.startswith(('http://', 'https://'))):
+            cached = self._cached(url)
+            if cached is not None:
+                cache_lookup('article', True)
+                results[url] = cached
+            else:
+                futures[self._executor.submit(self.fetch, url, deadline)] = url
+        if futures:
+            done, _ = wait(futures, timeout=deadline)
+            # 마감 시간 안에 끝나지 않은 요청은 기다리지 않고, 완료되면 캐시에만 남김
+            for future in done:
+                results[futures[future]] = future.result()
+        return results
+
+    def build_context(self, news_item: Dict, news_list: Optional[List[Dict]] = None,
+                      deadline: float = DEFAULT_DEADLINE, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+        main_url = news_item.get('originallink') or news_item.get('link', '')
+        related = find_related_news(news_item, news_list or [])
+        related_urls = [r.get('originallink') or r.get('link', '') for r in related]
+        texts = self.fetch_many([main_url] + related_urls, deadline)
+
+        sections = []
+        main_text = texts.get(main_url, '')
+        related_texts = [(r, texts.get(url, '')) for r, url in zip(related, related_urls) if texts.get(url)]
+        main_budget = token_budget if not related_texts else int(token_budget * 0.6)
+        if main_text:
+            sections.append(f"### 기사 원문 발췌\n{trim_to_tokens(main_text, main_budget)}")
+        if related_texts:
+            per_related = (token_budget - (main_budget if main_text else 0)) // len(related_texts)
+            for related_item, text in related_texts:
+                sections.append(f"### 관련 기사: {related_item.get('title', '')}\n{trim_to_tokens(text, per_related)}")
+        return '\n\n'.join(sections)
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_article_fetcher() -> ArticleFetcher:
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = ArticleFetcher()
+    return _fetcher
@@ -0,0 +1,104 @@
+import time
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+class CredentialsExhaustedError(Exception):
+    pass
+
+class _CredentialState:
+    __slots__ = ('credential', 'in_flight', 'calls', 'failures', 'day', 'blocked_until', 'last_used')
+
+    def __init__(self, credential):
+        self.credential = credential
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.day = time.strftime('%Y-%m-%d')
+        self.blocked_until = 0.0
+        self.last_used = 0.0
+
+def _next_midnight() -> float:
+    tomorrow = datetime.now().date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+class CredentialPool:
+    def __init__(self, name: str, credentials: List[Any], daily_limit: Optional[int] = None,
+                 cooldown_seconds: float = 60):
+        self.name = name
+        self.daily_limit = daily_limit
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._states = []
+        seen = set()
+        for credential in credentials:
+            if credential and credential not in seen:
+                seen.add(credential)
+                self._states.append(_CredentialState(credential))
+
+    def __len__(self):
+        return len(self._states)
+
+    def _state_for(self, credential) -> Optional[_CredentialState]:
+        for state in self._states:
+            if state.credential == credential:
+                return state
+        return None
+
+    def _is_available(self, state: _CredentialState, now: float) -> bool:
+        today = time.strftime('%Y-%m-%d')
+        if state.day != today:
+            state.day = today
+            state.calls = 0
+        if state.blocked_until > now:
+            return False
+        return self.daily_limit is None or state.calls < self.daily_limit
+
+    def acquire(self):
+        with self._lock:
+            now = time.time()
+            available = [s for s in self._states if self._is_available(s, now)]
+            if not available:
+                raise CredentialsExhaustedError(f"{self.name}: 사용 가능한 API 키가 없습니다. 한도 초기화 후 다시 시도해주세요.")
+            state = min(available, key=lambda s: (s.in_flight, s.calls, s.last_used))
+            state.in_flight += 1
+            state.calls += 1
+            state.last_used = now
+            return state.credential
+
+    def release(self, credential, status_code: Optional[int] = None):
+        with self._lock:
+            state = self._state_for(credential)
+            if not state:
+                return
+            state.in_flight = max(0, state.in_flight - 1)
+            if status_code == 429:
+                state.failures += 1
+                state.blocked_until = time.time() + self.cooldown_seconds * min(2 ** (state.failures - 1), 16)
+            elif status_code == 403:
+                state.blocked_until = _next_midnight()
+            elif status_code == 401:
+                state.blocked_until = float('inf')
+            elif status_code is not None and 200 <= status_code < 300:
+                # 상태 코드를 모르는 실패(None)는 백오프 단계를 되돌리지 않도록 실제 성공 응답에서만 초기화
+                state.failures = 0
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            now = time.time()
+            return [{
+                'index': i,
+                'in_flight': s.in_flight,
+                'calls_today': s.calls,
+                'available': self._is_available(s, now)
+            } for i, s in enumerate(self._states)]
+
+def naver_pool_from_settings(api_settings: Dict[str, Any]) -> CredentialPool:
+    credentials = [(api_settings.get('naver_client_id', '').strip(), api_settings.get('naver_client_secret', '').strip())]
+    for extra in api_settings.get('naver_extra_credentials', []):
+        credentials.append((extra.get('client_id', '').strip(), extra.get('client_secret', '').strip()))
+    return CredentialPool('Naver', [c for c in credentials if c[0] and c[1]], daily_limit=25000)
+
+def gemini_pool_from_settings(api_settings: Dict[str, Any]) -> CredentialPool:
+    keys = [api_settings.get('google_api_key', '')] + list(api_settings.get('google_extra_api_keys', []))
+    return CredentialPool('Gemini', [k.strip() for k in keys if k and k.strip()])
@@ -0,0 +1,115 @@
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+from .metrics import STAGE_OVERRUNS, STAGE_SKIPPED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUN_DEADLINE = 180
+# 단계별 몫. 실행하지 않는 단계의 몫은 나머지 단계가 비율대로 나눠 가짐
+DEFAULT_STAGE_SHARES = {'news': 0.15, 'blog': 0.6, 'images': 0.1, 'downloads': 0.15}
+OPTIONAL_STAGES = ('images', 'downloads')
+MIN_STAGE_BUDGET = 1.0
+
+class DeadlineExceeded(Exception):
+    pass
+
+def cap_timeout(default: float, limit: Optional[float]) -> float:
+    return default if limit is None else max(0.0, min(default, limit))
+
+class RunDeadline:
+    def __init__(self, total: float, stages: Iterable[str], shares: Optional[Dict[str, float]] = None,
+                 optional: Iterable[str] = OPTIONAL_STAGES):
+        shares = shares or DEFAULT_STAGE_SHARES
+        self.total = float(total or 0)
+        self.optional = set(optional)
+        stages = [stage for stage in stages if shares.get(stage, 0) > 0]
+        share_sum = sum(shares[stage] for stage in stages) or 1
+        self.plan = {stage: shares[stage] / share_sum for stage in stages}
+        self.started = time.monotonic()
+        self.stages = {}
+
+    @property
+    def bounded(self) -> bool:
+        return self.total > 0
+
+    def remaining(self) -> Optional[float]:
+        if not self.bounded:
+            return None
+        return max(0.0, self.started + self.total - time.monotonic())
+
+    def planned(self, stage: str) -> Optional[float]:
+        if not self.bounded:
+            return None
+        return self.total * self.plan.get(stage, 0)
+
+    def limit(self, stage: str) -> Optional[float]:
+        # 남은 시간을 아직 시작하지 않은 단계들의 몫 비율대로 나눔.
+        # 필수 단계는 선택 단계 몫까지 끌어다 쓸 수 있고, 선택 단계는 뒤 단계 몫을 침범하지 않음
+        remaining = self.remaining()
+        if remaining is None or stage not in self.plan:
+            return remaining
+        pending = [s for s in self.plan if s not in self.stages or s == stage]
+        if stage not in self.optional:
+            pending = [s for s in pending if s not in self.optional]
+        return remaining * self.plan[stage] / sum(self.plan[s] for s in pending)
+
+    def allows(self, stage: str) -> bool:
+        limit = self.limit(stage)
+        if stage in self.optional and limit is not None and limit < MIN_STAGE_BUDGET:
+            self.skip(stage, 'budget_exhausted')
+            return False
+        return True
+
+    @contextmanager
+    def stage(self, stage: str):
+        limit = self.limit(stage)
+        if limit is not None and limit < MIN_STAGE_BUDGET and stage not in self.optional:
+            raise DeadlineExceeded(f"전체 마감 시간 {self.total:.0f}초를 넘겨 '{stage}' 단계를 시작할 수 없습니다.")
+        record = self.stages[stage] = {'planned': self._round(self.planned(stage)), 'limit': self._round(limit)}
+        started = time.monotonic()
+        try:
+            yield limit
+        finally:
+            self._finish(stage, record, time.monotonic() - started)
+
+    def record(self, stage: str, elapsed: float):
+        # 배치 생성처럼 단계 밖에서 측정한 시간을 단계 결과로 남김
+        record = self.stages[stage] = {'planned': self._round(self.planned(stage)), 'limit': None}
+        self._finish(stage, record, elapsed)
+
+    def skip(self, stage: str, reason: str):
+        self.stages[stage] = {'planned': self._round(self.planned(stage)), 'skipped': reason}
+        STAGE_SKIPPED.inc(stage=stage, reason=reason)
+        logger.warning("'%s' 단계 건너뜀: %s", stage, reason, extra={'remaining': self._round(self.remaining())})
+
+    def degrade(self, stage: str, reason: str):
+        # 단계는 실행했지만 일부 결과를 포기한 경우
+        self.stages.setdefault(stage, {})['degraded'] = reason
+        STAGE_SKIPPED.inc(stage=stage, reason=reason)
+
+    def _finish(self, stage: str, record: Dict, elapsed: float):
+        record['elapsed'] = round(elapsed, 3)
+        planned = self.planned(stage)
+        if planned is not None and elapsed > planned:
+            record['overrun'] = round(elapsed - planned, 3)
+            STAGE_OVERRUNS.inc(stage=stage)
+            logger.warning("'%s' 단계가 계획보다 %.1f초 더 걸림", stage, elapsed - planned,
+                           extra={'stage': stage, 'planned': round(planned, 3), 'elapsed': round(elapsed, 3)})
+
+    @staticmethod
+    def _round(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value, 3)
+
+    def report(self) -> Dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            'deadline': self.total or None,
+            'elapsed': round(elapsed, 3),
+            'exceeded': self.bounded and elapsed > self.total,
+            'stages': {stage: dict(record) for stage, record in self.stages.items()},
+            'overruns': [stage for stage, record in self.stages.items() if 'overrun' in record],
+            'degraded': [stage for stage, record in self.stages.items()
+                         if 'skipped' in record or 'degraded' in record]
+        }
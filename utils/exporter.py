@@ -0,0 +1,253 @@
+import logging
+import os
+import re
+import html
+import time
+import base64
+import shutil
+import zipfile
+import tempfile
+from typing import Dict, Iterable, Optional
+from PyQt6.QtCore import Qt, QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QImage
+from .image_downloader import detect_image_type
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('zip', 'dir')
+IMAGE_MARKER_RE = re.compile(r'\[(이미지_\d+)\]')
+MIME_TYPES = {'.jpg': 'image/jpeg', '.png': 'image/png', '.gif': 'image/gif', '.bmp': 'image/bmp', '.webp': 'image/webp'}
+# base64는 3바이트 단위로 끊어 인코딩해야 조각을 이어 붙여도 결과가 같음
+BASE64_CHUNK = 3 * 64 * 1024
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ max-width: 760px; margin: 2em auto; padding: 0 1em; font-size: 16px; line-height: 1.7; }}
+h1 {{ font-size: 2em; }}
+h2 {{ font-size: 1.5em; }}
+p {{ margin: 1em 0; }}
+figure {{ margin: 1.5em 0; text-align: center; }}
+img {{ max-width: 100%; border-radius: 8px; }}
+figcaption {{ font-size: 0.85em; color: #777; }}
+</style>
+</head>
+<body>
+"""
+
+def content_text(blog_data: Dict) -> str:
+    content = blog_data.get('body', '') or blog_data.get('content', '')
+    if isinstance(content, list):
+        return '\n'.join(str(item) for item in content)
+    return content if isinstance(content, str) else str(content)
+
+def post_slug(blog_data: Dict) -> str:
+    stamp = re.sub(r'\D', '', blog_data.get('generated_at', ''))[:12] or time.strftime('%Y%m%d%H%M')
+    title = re.sub(r'[^\w가-힣]+', '-', blog_data.get('title', '')).strip('-')[:40]
+    return f"{stamp}_{title}" if title else stamp
+
+def _image_caption(blog_data: Dict, marker_key: str) -> str:
+    candidates = blog_data.get('images', {}).get(marker_key) or [{}]
+    candidate = candidates[0]
+    if candidate.get('photographer'):
+        return f"Photo: {candidate['photographer']} / {candidate.get('source', '')}"
+    return ''
+
+def _inline_html(text: str) -> str:
+    return re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(text))
+
+def recompress_image(path: str, max_width: int, quality: int = 85) -> Optional[bytes]:
+    image = QImage(path)
+    if image.isNull():
+        return None
+    if max_width and image.width() > max_width:
+        image = image.scaledToWidth(max_width, Qt.TransformationMode.SmoothTransformation)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    # 투명도가 있는 이미지는 JPEG로 바꾸면 배경이 검게 변하므로 PNG로 유지
+    image.save(buffer, 'PNG' if image.hasAlphaChannel() else 'JPEG', -1 if image.hasAlphaChannel() else quality)
+    return bytes(data)
+
+class _DirTarget:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def open(self, name: str, compress: bool = True):
+        full_path = os.path.join(self.path, *name.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        return open(full_path, 'wb')
+
+    def close(self, success: bool = True):
+        pass
+
+class _ZipTarget:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # 완성된 뒤에만 원래 이름으로 바꿔 중간에 실패해도 깨진 ZIP이 남지 않게 함
+        self.temp_path = f"{path}.part"
+        self.zip = zipfile.ZipFile(self.temp_path, 'w', zipfile.ZIP_DEFLATED)
+
+    def open(self, name: str, compress: bool = True):
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        return self.zip.open(info, 'w')
+
+    def close(self, success: bool = True):
+        self.zip.close()
+        if success:
+            os.replace(self.temp_path, self.path)
+        elif os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+class BundleExporter:
+    def __init__(self, dest: str, fmt: Optional[str] = None, inline_images: bool = False,
+                 max_image_width: int = 0, jpeg_quality: int = 85):
+        fmt = fmt or ('zip' if dest.lower().endswith('.zip') else 'dir')
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"알 수 없는 내보내기 형식: {fmt}")
+        self.dest = dest
+        self.inline_images = inline_images
+        self.max_image_width = max_image_width
+        self.jpeg_quality = jpeg_quality
+        self.target = _ZipTarget(dest) if fmt == 'zip' else _DirTarget(dest)
+        self.exported = []
+        self._slugs = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(success=exc_type is None)
+        return False
+
+    def close(self, success: bool = True):
+        self.target.close(success)
+
+    def _unique_slug(self, blog_data: Dict) -> str:
+        base = slug = post_slug(blog_data)
+        counter = 2
+        while slug in self._slugs:
+            slug = f"{base}_{counter}"
+            counter += 1
+        self._slugs.add(slug)
+        return slug
+
+    def add_post(self, blog_data: Dict, image_paths: Optional[Dict[str, str]] = None) -> str:
+        slug = self._unique_slug(blog_data)
+        temp_files = []
+        try:
+            images = self._prepare_images(blog_data, image_paths or {}, temp_files)
+            for marker_key, image in images.items():
+                if image['local']:
+                    with open(image['local'], 'rb') as src, \
+                            self.target.open(f"{slug}/{image['name']}", compress=False) as dst:
+                        shutil.copyfileobj(src, dst)
+            with self.target.open(f"{slug}/index.md") as f:
+                f.write(self._render_markdown(blog_data, images).encode('utf-8'))
+            with self.target.open(f"{slug}/index.html") as f:
+                self._write_html(f, blog_data, images)
+        finally:
+            for path in temp_files:
+                os.remove(path)
+        self.exported.append(slug)
+        return slug
+
+    def _prepare_images(self, blog_data: Dict, image_paths: Dict[str, str], temp_files) -> Dict[str, Dict]:
+        images = {}
+        for marker_key in IMAGE_MARKER_RE.findall(content_text(blog_data)):
+            path = image_paths.get(marker_key, '')
+            if path and os.path.exists(path):
+                local = path
+                if self.max_image_width:
+                    data = recompress_image(path, self.max_image_width, self.jpeg_quality)
+                    if data:
+                        # 재압축한 결과는 임시 파일로 두고 이미지 파일과 인라인 HTML 양쪽에서 스트리밍으로 읽음
+                        fd, local = tempfile.mkstemp(suffix='.img')
+                        with os.fdopen(fd, 'wb') as f:
+                            f.write(data)
+                        temp_files.append(local)
+                with open(local, 'rb') as f:
+                    ext = detect_image_type(f.read(16)) or os.path.splitext(path)[1].lower() or '.jpg'
+                images[marker_key] = {'local': local, 'name': f"images/{marker_key.replace('_', '')}{ext}",
+                                      'mime': MIME_TYPES.get(ext, 'application/octet-stream')}
+                continue
+            candidates = blog_data.get('images', {}).get(marker_key) or []
+            if candidates and candidates[0].get('url'):
+                # 내려받은 파일이 없으면 원본 주소를 그대로 사용 (이 이미지는 번들에 포함되지 않음)
+                logger.info("로컬 이미지가 없어 원격 주소로 연결합니다.", extra={'marker': marker_key})
+                images[marker_key] = {'local': '', 'name': candidates[0]['url'], 'mime': ''}
+        return images
+
+    def _render_markdown(self, blog_data: Dict, images: Dict[str, Dict]) -> str:
+        def replace(match):
+            image = images.get(match.group(1))
+            if not image:
+                return ''
+            return f"\n\n![{match.group(1)}]({image['name']})\n\n"
+        content = re.sub(r'\n{3,}', '\n\n', IMAGE_MARKER_RE.sub(replace, content_text(blog_data))).strip()
+        parts = [f"# {blog_data.get('title', '')}\n", content]
+        if blog_data.get('conclusion'):
+            parts.extend(['\n---\n## 💭 결론\n', blog_data['conclusion']])
+        if blog_data.get('tags'):
+            parts.extend(['\n---\n## 🏷️ 태그\n', ' '.join(blog_data['tags'])])
+        return '\n'.join(parts) + '\n'
+
+    def _write_html(self, f, blog_data: Dict, images: Dict[str, Dict]):
+        write = lambda text: f.write(text.encode('utf-8'))
+        title = html.escape(blog_data.get('title', ''))
+        write(HTML_HEAD.format(title=title))
+        write(f"<h1>{title}</h1>\n")
+        for line in content_text(blog_data).splitlines():
+            # 마커가 문장 중간에 있어도 마크다운·미리보기처럼 그 위치에 그림을 넣도록 줄을 마커 기준으로 나눔
+            parts = IMAGE_MARKER_RE.split(line.strip())
+            for i, part in enumerate(parts):
+                if i % 2:
+                    self._write_figure(f, blog_data, part, images.get(part))
+                    continue
+                text = part.strip()
+                if not text:
+                    continue
+                heading = re.match(r'(#{1,6})\s+(.*)', text) if i == 0 else None
+                if heading:
+                    level = max(len(heading.group(1)), 2)
+                    write(f"<h{level}>{_inline_html(heading.group(2))}</h{level}>\n")
+                else:
+                    write(f"<p>{_inline_html(text)}</p>\n")
+        if blog_data.get('conclusion'):
+            write(f"<h2>결론</h2>\n<p>{_inline_html(blog_data['conclusion'])}</p>\n")
+        if blog_data.get('tags'):
+            write(f"<h2>태그</h2>\n<p>{html.escape(' '.join(blog_data['tags']))}</p>\n")
+        write("</body>\n</html>\n")
+
+    def _write_figure(self, f, blog_data: Dict, marker_key: str, image: Optional[Dict]):
+        if not image:
+            return
+        f.write(b'<figure><img alt="' + html.escape(marker_key).encode('utf-8') + b'" src="')
+        if self.inline_images and image['local']:
+            f.write(f"data:{image['mime']};base64,".encode('ascii'))
+            with open(image['local'], 'rb') as src:
+                while True:
+                    chunk = src.read(BASE64_CHUNK)
+                    if not chunk:
+                        break
+                    f.write(base64.b64encode(chunk))
+        else:
+            f.write(html.escape(image['name']).encode('utf-8'))
+        f.write(b'">')
+        caption = _image_caption(blog_data, marker_key)
+        if caption:
+            f.write(f"<figcaption>{html.escape(caption)}</figcaption>".encode('utf-8'))
+        f.write(b'</figure>\n')
+
+def export_posts(posts: Iterable[Dict], dest: str, fmt: Optional[str] = None, inline_images: bool = False,
+                 max_image_width: int = 0) -> int:
+    with BundleExporter(dest, fmt, inline_images, max_image_width) as exporter:
+        for post in posts:
+            exporter.add_post(post['blog_data'], post.get('image_paths'))
+        return len(exporter.exported)
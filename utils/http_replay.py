@@ -0,0 +1,167 @@
+import logging
+import io
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+MODE_ENV = 'BLOG_HTTP_MODE'
+CASSETTE_ENV = 'BLOG_HTTP_CASSETTE'
+LATENCY_ENV = 'BLOG_HTTP_LATENCY'
+
+# 카세트에 API 키가 남지 않도록 URL에서 지우고, 요청 매칭에서도 제외하는 쿼리 파라미터
+SECRET_QUERY_PARAMS = {'key', 'client_id', 'client_secret', 'access_key', 'api_key', 'apikey'}
+RECORDED_RESPONSE_HEADERS = ('Content-Type', 'Content-Length', 'ETag', 'Last-Modified', 'Cache-Control')
+
+_original_send = HTTPAdapter.send
+_cassette = None
+
+def _normalized_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in SECRET_QUERY_PARAMS and not k.startswith('$'))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+def _normalized_body(body) -> bytes:
+    if body is None:
+        return b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode('utf-8')
+    except (ValueError, TypeError):
+        return body
+
+def request_key(method: str, url: str, body=None) -> str:
+    digest = hashlib.sha256(_normalized_body(body)).hexdigest()[:16]
+    return f"{method.upper()} {_normalized_url(url)} {digest}"
+
+class Cassette:
+    def __init__(self, path: str, mode: str, latency: str = 'recorded'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"알 수 없는 HTTP 모드: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.index_path = os.path.join(path, 'index.jsonl')
+        self.bodies_dir = os.path.join(path, 'bodies')
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._positions = {}
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry['key'], []).append(entry)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, request, response: requests.Response, elapsed: float):
+        body = response.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = os.path.join(self.bodies_dir, body_hash)
+        entry = {
+            'key': request_key(request.method, request.url, request.body),
+            'method': request.method,
+            'url': _normalized_url(request.url),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: response.headers[name] for name in RECORDED_RESPONSE_HEADERS
+                        if name in response.headers},
+            'body': body_hash,
+            'elapsed': round(elapsed, 4)
+        }
+        with self._lock:
+            if not os.path.exists(body_path):
+                with open(body_path, 'wb') as f:
+                    f.write(body)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._entries.setdefault(entry['key'], []).append(entry)
+
+    def next_entry(self, request) -> Optional[Dict]:
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            # 같은 요청이 여러 번 녹화됐으면 순서대로 돌려주고, 다 쓰면 마지막 응답을 반복
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[min(position, len(entries) - 1)]
+
+    def _delay_for(self, entry: Dict) -> float:
+        if self.latency == 'recorded':
+            return entry.get('elapsed', 0)
+        if self.latency == 'none':
+            return 0.0
+        return float(self.latency)
+
+    def replay(self, request, adapter: HTTPAdapter) -> requests.Response:
+        entry = self.next_entry(request)
+        if entry is None:
+            raise requests.ConnectionError(f"카세트에 없는 요청: {request.method} {_normalized_url(request.url)}",
+                                           request=request)
+        delay = self._delay_for(entry)
+        if delay > 0:
+            time.sleep(delay)
+        with open(os.path.join(self.bodies_dir, entry['body']), 'rb') as f:
+            body = f.read()
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason', '')
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.connection = adapter
+        return response
+
+def _patched_send(adapter, request, *args, **kwargs):
+    cassette = _cassette
+    if cassette is None:
+        return _original_send(adapter, request, *args, **kwargs)
+    if cassette.mode == 'replay':
+        return cassette.replay(request, adapter)
+    started = time.perf_counter()
+    response = _original_send(adapter, request, *args, **kwargs)
+    response.content
+    cassette.record(request, response, time.perf_counter() - started)
+    # 녹화하면서 본문을 모두 읽었으므로 response.raw를 직접 읽는 코드(네이버 XML 스트림 파서)를 위해 다시 채워 둠
+    response.raw = io.BytesIO(response.content)
+    return response
+
+def install(path: str, mode: str, latency: str = 'recorded') -> Cassette:
+    global _cassette
+    _cassette = Cassette(path, mode, latency)
+    HTTPAdapter.send = _patched_send
+    logger.info("HTTP %s 모드: %s (녹화된 응답 %d개)", mode, path, len(_cassette))
+    return _cassette
+
+def uninstall():
+    global _cassette
+    _cassette = None
+    HTTPAdapter.send = _original_send
+
+def install_from_env() -> Optional[Cassette]:
+    mode = os.environ.get(MODE_ENV, '').strip().lower()
+    path = os.environ.get(CASSETTE_ENV, '').strip()
+    if not mode or not path:
+        return None
+    return install(path, mode, os.environ.get(LATENCY_ENV, 'recorded').strip() or 'recorded')
+
+def is_active() -> bool:
+    return _cassette is not None
@@ -0,0 +1,36 @@
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from .metrics import HTTP_REQUESTS, HTTP_SECONDS, ERRORS, provider_for_url
+
+_session = None
+_session_lock = threading.Lock()
+
+class InstrumentedSession(requests.Session):
+    # 모든 요청의 공급자별 지연 시간과 상태 코드를 메트릭으로 남김
+    def request(self, method, url, *args, **kwargs):
+        provider = provider_for_url(url)
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException as e:
+            HTTP_REQUESTS.inc(provider=provider, status='error')
+            ERRORS.inc(component='http', kind=type(e).__name__)
+            raise
+        finally:
+            HTTP_SECONDS.observe(time.perf_counter() - started, provider=provider)
+        HTTP_REQUESTS.inc(provider=provider, status=str(response.status_code))
+        return response
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = InstrumentedSession()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
@@ -1,49 +1,213 @@
 import os
+import json
+import logging
+import sqlite3
+import hashlib
+import tempfile
+import time
+import threading
 import requests
-from urllib.parse import urlparse
 from datetime import datetime
+from typing import Optional
+from .http_session import get_session
+from .metrics import ERRORS, cache_lookup
+
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+DOWNLOAD_TIMEOUT = 15
+INDEX_FILENAME = '.download_index.db'
+LEGACY_INDEX_FILENAME = '.download_index.json'
+HEAD_BYTES = 16
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# 확장자는 URL이 아니라 실제 파일의 시그니처(매직 바이트)로 결정
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'GIF87a', '.gif'),
+    (b'GIF89a', '.gif'),
+    (b'BM', '.bmp'),
+)
+GENERIC_CONTENT_TYPES = ('', 'application/octet-stream', 'binary/octet-stream')
+
+class InvalidImageError(Exception):
+    pass
+
+def detect_image_type(head: bytes) -> Optional[str]:
+    if len(head) >= 12 and head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
 
 class ImageDownloader:
-    def __init__(self, save_dir='img'):
+    def __init__(self, save_dir='img', max_bytes=MAX_IMAGE_BYTES):
         self.save_dir = save_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(save_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
+        # GUI, 작업 서버, 큐 워커가 같은 폴더를 함께 쓰므로 인스턴스별 사본 대신 SQLite 색인을 공유
+        self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS downloads ("
+                "url TEXT PRIMARY KEY, path TEXT NOT NULL, sha256 TEXT NOT NULL, size INTEGER NOT NULL DEFAULT 0, "
+                "content_type TEXT NOT NULL DEFAULT '', etag TEXT NOT NULL DEFAULT '', "
+                "last_modified TEXT NOT NULL DEFAULT '')"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_downloads_sha256 ON downloads(sha256)")
+        self._import_legacy_index()
 
-    def download_image(self, url, filename_prefix="image") -> str:
+    def _import_legacy_index(self):
+        legacy_path = os.path.join(self.save_dir, LEGACY_INDEX_FILENAME)
         try:
-            parsed_url = urlparse(url)
-            original_filename = os.path.basename(parsed_url.path)
-            if '.' in original_filename:
-                ext = os.path.splitext(original_filename)[1]
-            else:
-                ext = '.jpg'
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{filename_prefix}_{timestamp}{ext}"
-            save_path = os.path.join(self.save_dir, filename)
-            counter = 1
-            while os.path.exists(save_path):
-                filename = f"{filename_prefix}_{timestamp}_{counter}{ext}"
-                save_path = os.path.join(self.save_dir, filename)
-                counter += 1
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15, stream=True)
-            response.raise_for_status()
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        rows = [(url, entry.get('path', ''), entry.get('sha256', ''), entry.get('size', 0),
+                 entry.get('content_type', ''), entry.get('etag', ''), entry.get('last_modified', ''))
+                for url, entry in legacy.items() if isinstance(entry, dict) and entry.get('path')]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO downloads (url, path, sha256, size, content_type, etag, last_modified) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        try:
+            os.remove(legacy_path)
+        except OSError:
+            pass
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _known_entry(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, etag, last_modified FROM downloads WHERE url = ?", (url,)).fetchone()
+        if row and os.path.exists(row[0]):
+            return {'path': row[0], 'etag': row[1], 'last_modified': row[2]}
+        return None
+
+    def _path_for_hash(self, sha256):
+        rows = self._conn.execute("SELECT path FROM downloads WHERE sha256 = ?", (sha256,)).fetchall()
+        for (path,) in rows:
+            if os.path.exists(path):
+                return path
+        return None
+
+    def download_image(self, url, filename_prefix="image", timeout=DOWNLOAD_TIMEOUT) -> str:
+        temp_path = None
+        # requests의 timeout은 읽기 한 번마다 적용되므로 전체 다운로드 시간은 따로 확인
+        expires_at = time.monotonic() + timeout
+        try:
+            headers = {'User-Agent': USER_AGENT}
+            known = self._known_entry(url)
+            if known:
+                # 이전에 받은 URL이면 조건부 요청으로 바뀌었는지만 확인
+                if known.get('etag'):
+                    headers['If-None-Match'] = known['etag']
+                if known.get('last_modified'):
+                    headers['If-Modified-Since'] = known['last_modified']
+
+            with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+                if response.status_code == 304 and known:
+                    cache_lookup('image_download', True)
+                    return known['path']
+                cache_lookup('image_download', False)
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if not content_type.startswith('image/') and content_type not in GENERIC_CONTENT_TYPES:
+                    raise InvalidImageError(f"이미지가 아닌 응답입니다 ({content_type})")
+                content_length = response.headers.get('Content-Length', '')
+                if content_length.isdigit() and int(content_length) > self.max_bytes:
+                    raise InvalidImageError(f"이미지가 너무 큽니다 ({int(content_length)} bytes)")
+
+                digest = hashlib.sha256()
+                size = 0
+                head = b''
+                ext = None
+                with tempfile.NamedTemporaryFile(dir=self.save_dir, prefix='.', suffix='.part', delete=False) as f:
+                    temp_path = f.name
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if not chunk:
+                            continue
+                        if time.monotonic() > expires_at:
+                            raise requests.exceptions.Timeout(f"{timeout:.1f}초 안에 다운로드를 마치지 못했습니다")
+                        if ext is None:
+                            # 첫 조각이 시그니처보다 짧을 수 있으므로 앞부분을 모아서 판별
+                            head += chunk[:HEAD_BYTES - len(head)]
+                            if len(head) >= HEAD_BYTES:
+                                ext = self._check_image_type(head)
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            raise InvalidImageError(f"이미지가 {self.max_bytes} bytes를 넘습니다")
+                        digest.update(chunk)
+                        f.write(chunk)
+                if not size:
+                    raise InvalidImageError("빈 응답입니다")
+                if ext is None:
+                    ext = self._check_image_type(head)
+                etag = response.headers.get('ETag', '')
+                last_modified = response.headers.get('Last-Modified', '')
+
+            sha256 = digest.hexdigest()
+            with self._lock:
+                save_path = self._path_for_hash(sha256)
+                cache_lookup('image_content', bool(save_path))
+                if save_path:
+                    os.remove(temp_path)
+                else:
+                    save_path = self._unique_path(filename_prefix, ext)
+                    os.replace(temp_path, save_path)
+                temp_path = None
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO downloads (url, path, sha256, size, content_type, etag, last_modified) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (url, save_path, sha256, size, content_type, etag, last_modified))
             return save_path
         except requests.exceptions.RequestException as e:
-            print(f"이미지 다운로드 실패 (네트워크): {e}")
+            ERRORS.inc(component='image_download', kind=type(e).__name__)
+            logger.warning("이미지 다운로드 실패 (네트워크): %s", e, extra={'url': url})
             return ''
         except Exception as e:
-            print(f"이미지 다운로드 실패: {e}")
+            ERRORS.inc(component='image_download', kind=type(e).__name__)
+            logger.warning("이미지 다운로드 실패: %s", e, extra={'url': url})
             return ''
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def _check_image_type(head):
+        ext = detect_image_type(head)
+        if not ext:
+            raise InvalidImageError("지원하지 않는 이미지 형식입니다")
+        return ext
+
+    def _unique_path(self, filename_prefix, ext):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        save_path = os.path.join(self.save_dir, f"{filename_prefix}_{timestamp}{ext}")
+        counter = 1
+        while True:
+            try:
+                # 다른 프로세스가 같은 이름을 고르지 못하도록 빈 파일로 먼저 자리를 잡음
+                with open(save_path, 'x'):
+                    return save_path
+            except FileExistsError:
+                save_path = os.path.join(self.save_dir, f"{filename_prefix}_{timestamp}_{counter}{ext}")
+                counter += 1
 
     def get_file_url(self, local_path):
         if not local_path or not os.path.exists(local_path):
             return ''
         abs_path = os.path.abspath(local_path)
         file_url = f"file:///{abs_path.replace(os.sep, '/')}"
-        return file_url
\ No newline at end of file
+        return file_url
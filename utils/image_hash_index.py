@@ -0,0 +1,190 @@
+import logging
+import os
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+from .http_session import get_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".blog_generator", "image_hashes.db")
+SIMILAR_DISTANCE = 8
+REUSE_WINDOW_DAYS = 30
+HASH_FETCH_TIMEOUT = 10
+HASH_FETCH_WORKERS = 8
+
+def dhash(data: bytes) -> Optional[int]:
+    image = QImage()
+    if not image.loadFromData(data):
+        return None
+    # 9x8 흑백으로 줄인 뒤 가로로 이웃한 픽셀의 밝기 차이를 64비트로 기록 (difference hash)
+    small = image.scaled(9, 8, Qt.AspectRatioMode.IgnoreAspectRatio,
+                         Qt.TransformationMode.SmoothTransformation).convertToFormat(QImage.Format.Format_Grayscale8)
+    pixels = bytes(small.constBits().asarray(small.sizeInBytes()))
+    stride = small.bytesPerLine()
+    value = 0
+    for y in range(8):
+        row = y * stride
+        for x in range(8):
+            value = (value << 1) | (pixels[row + x] > pixels[row + x + 1])
+    return value
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+class BKTree:
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value: int, item):
+        if self._root is None:
+            self._root = (value, [item], {})
+            self._size += 1
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [item], {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, object]]:
+        if self._root is None:
+            return []
+        results = []
+        stack = [self._root]
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                results.extend((distance, item) for item in items)
+            # 삼각 부등식: 거리 d±max_distance 범위의 자식 가지만 탐색하면 됨
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return results
+
+class ImageHashIndex:
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS image_hashes ("
+                "url TEXT PRIMARY KEY, phash TEXT NOT NULL, used_at INTEGER NOT NULL)"
+            )
+        self._tree = BKTree()
+        self._used_at = {}
+        for url, phash, used_at in self._conn.execute("SELECT url, phash, used_at FROM image_hashes"):
+            self._tree.add(int(phash, 16), url)
+            self._used_at[url] = used_at
+
+    def __len__(self):
+        return len(self._used_at)
+
+    def find_similar(self, phash: int, max_distance: int = SIMILAR_DISTANCE,
+                     since_ts: float = 0) -> List[Tuple[int, str]]:
+        with self._lock:
+            matches = self._tree.search(phash, max_distance)
+            return sorted((distance, url) for distance, url in matches if self._used_at.get(url, 0) >= since_ts)
+
+    def record_use(self, phash: int, url: str):
+        now = int(time.time())
+        with self._lock:
+            if url not in self._used_at:
+                self._tree.add(phash, url)
+            self._used_at[url] = now
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO image_hashes (url, phash, used_at) VALUES (?, ?, ?)",
+                    (url, f"{phash:016x}", now))
+
+    def pick_unused(self, candidates: List[Dict], max_distance: int = SIMILAR_DISTANCE,
+                    window_days: int = REUSE_WINDOW_DAYS,
+                    expires_at: Optional[float] = None) -> Tuple[Optional[Dict], Optional[int]]:
+        # 후보의 썸네일로 해시를 계산해 최근에 쓴 사진과 비슷한 후보는 건너뛰고, 모두 비슷하면 첫 후보를 사용
+        # expires_at(time.monotonic 기준)이 지나면 더 기다리지 않고 그때까지 계산된 해시만 사용
+        if not candidates:
+            return None, None
+        hashes = self._fetch_hashes(candidates, self._fetch_timeout(expires_at))
+        since_ts = time.time() - window_days * 86400
+        for candidate in candidates:
+            phash = hashes.get(self._hash_url(candidate))
+            if phash is None:
+                continue
+            if not self.find_similar(phash, max_distance, since_ts):
+                return candidate, phash
+            logger.info("최근 사용한 이미지와 비슷해 건너뜀", extra={'url': candidate.get('url', '')})
+        return candidates[0], hashes.get(self._hash_url(candidates[0]))
+
+    @staticmethod
+    def _fetch_timeout(expires_at: Optional[float]) -> float:
+        if expires_at is None:
+            return HASH_FETCH_TIMEOUT
+        return min(HASH_FETCH_TIMEOUT, expires_at - time.monotonic())
+
+    @staticmethod
+    def _hash_url(candidate: Dict) -> str:
+        return candidate.get('thumb_url') or candidate.get('url') or ''
+
+    @classmethod
+    def _fetch_hashes(cls, candidates: List[Dict], timeout: float) -> Dict[str, Optional[int]]:
+        # 썸네일을 동시에 받아 전체가 timeout 한 번 안에 끝나게 함. 결과는 후보 dict를 건드리지 않고 URL별로 모음
+        urls = list(dict.fromkeys(url for url in map(cls._hash_url, candidates) if url))
+        if not urls or timeout <= 0:
+            return {}
+        hashes = {}
+        executor = ThreadPoolExecutor(max_workers=min(len(urls), HASH_FETCH_WORKERS))
+        futures = {executor.submit(cls._url_hash, url, timeout): url for url in urls}
+        try:
+            done, _ = wait(futures, timeout=timeout)
+            for future in done:
+                hashes[futures[future]] = future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return hashes
+
+    @staticmethod
+    def _url_hash(url: str, timeout: float) -> Optional[int]:
+        try:
+            response = get_session().get(url, timeout=timeout)
+            response.raise_for_status()
+            return dhash(response.content)
+        except Exception as e:
+            logger.warning("이미지 해시 계산 실패: %s", e, extra={'url': url})
+            return None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_image_hash_index() -> Optional[ImageHashIndex]:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = ImageHashIndex()
+                except Exception as e:
+                    logger.warning("이미지 해시 색인 열기 실패 (중복 검사 없이 진행): %s", e)
+                    return None
+    return _index
@@ -0,0 +1,43 @@
+import json
+import logging
+import time
+
+# LogRecord가 기본으로 가진 속성. 이 밖의 속성은 logger 호출의 extra로 넘긴 구조화 필드로 간주
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        for name, value in vars(record).items():
+            if name not in _STANDARD_ATTRS and not name.startswith('_'):
+                entry[name] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class KeyValueFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s', '%H:%M:%S')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = [f"{name}={value}" for name, value in vars(record).items()
+                  if name not in _STANDARD_ATTRS and not name.startswith('_')]
+        return f"{text} [{' '.join(fields)}]" if fields else text
+
+def setup_logging(level: str = 'INFO', json_format: bool = False, log_file: str = ''):
+    handler = logging.FileHandler(log_file, encoding='utf-8') if log_file else logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if json_format else KeyValueFormatter())
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+    # 라이브러리의 요청 단위 디버그 로그는 기본적으로 숨김
+    logging.getLogger('urllib3').setLevel(max(root.level, logging.WARNING))
@@ -0,0 +1,242 @@
+import os
+import time
+import atexit
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+DEFAULT_FLUSH_INTERVAL = 15
+
+# 라벨 값이 끝없이 늘어나지 않도록 알려진 호스트만 공급자 이름으로 쓰고 나머지는 other로 묶음
+PROVIDER_HOSTS = {
+    'openapi.naver.com': 'naver',
+    'api.unsplash.com': 'unsplash',
+    'images.unsplash.com': 'unsplash_image',
+    'pixabay.com': 'pixabay',
+    'cdn.pixabay.com': 'pixabay_image',
+    'generativelanguage.googleapis.com': 'gemini',
+}
+
+def provider_for_url(url: str) -> str:
+    host = (urlsplit(url).hostname or '').lower()
+    return PROVIDER_HOSTS.get(host, 'other')
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} 라벨이 맞지 않습니다: {sorted(labels)} != {sorted(self.label_names)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # 버킷별 개수(마지막 칸은 +Inf), 합계, 전체 개수
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _render_sample(self, key, state):
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(round(total, 6))}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, help_text, label_names, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, label_names, **kwargs)
+            elif not isinstance(metric, cls) or metric.label_names != tuple(label_names):
+                raise ValueError(f"{name} 메트릭이 다른 형식으로 이미 등록되어 있습니다.")
+            return metric
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, label_names, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter('blog_http_requests_total', 'HTTP requests by provider and status code',
+                                 ('provider', 'status'))
+HTTP_SECONDS = REGISTRY.histogram('blog_http_request_seconds', 'HTTP request latency by provider', ('provider',))
+GEMINI_CALLS = REGISTRY.counter('blog_gemini_calls_total', 'Gemini generate calls by model and outcome',
+                                ('model', 'outcome'))
+GEMINI_SECONDS = REGISTRY.histogram('blog_gemini_call_seconds', 'Gemini generate latency by model', ('model',))
+RETRIES = REGISTRY.counter('blog_retries_total', 'Retries, key rotations, hedges and fallbacks',
+                           ('operation', 'reason'))
+CACHE_REQUESTS = REGISTRY.counter('blog_cache_requests_total', 'Cache lookups by cache and result (hit/miss)',
+                                  ('cache', 'result'))
+STAGE_SECONDS = REGISTRY.histogram('blog_stage_seconds', 'Pipeline stage latency', ('stage',))
+ERRORS = REGISTRY.counter('blog_errors_total', 'Errors by component and kind', ('component', 'kind'))
+STAGE_OVERRUNS = REGISTRY.counter('blog_stage_overruns_total', 'Pipeline stages that ran past their planned budget',
+                                  ('stage',))
+STAGE_SKIPPED = REGISTRY.counter('blog_stage_skipped_total', 'Optional pipeline stages skipped or cut short',
+                                 ('stage', 'reason'))
+JOBS = REGISTRY.counter('blog_jobs_total', 'Finished generation runs by runner and status', ('runner', 'status'))
+
+def cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+def write_metrics_file(path: str, registry: MetricsRegistry = REGISTRY):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+    os.replace(temp_path, path)
+
+class MetricsFileWriter(threading.Thread):
+    def __init__(self, path: str, interval: float = DEFAULT_FLUSH_INTERVAL, registry: MetricsRegistry = REGISTRY):
+        super().__init__(name='metrics-writer', daemon=True)
+        self.path = path
+        self.interval = max(1.0, interval)
+        self.registry = registry
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        try:
+            write_metrics_file(self.path, self.registry)
+        except OSError as e:
+            logger.warning("메트릭 파일 저장 실패: %s", e, extra={'path': self.path})
+
+    def stop(self):
+        self._stop_event.set()
+        self.flush()
+
+def start_file_export(path: str, interval: float = DEFAULT_FLUSH_INTERVAL) -> MetricsFileWriter:
+    writer = MetricsFileWriter(path, interval)
+    writer.start()
+    # node_exporter textfile collector 등이 종료 직전 값까지 읽을 수 있게 끝날 때 한 번 더 기록
+    atexit.register(writer.stop)
+    logger.info("메트릭 파일 기록 시작: %s (%s초마다)", path, writer.interval)
+    return writer
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if urlsplit(self.path).path != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_http_server(port: int, host: str = '127.0.0.1') -> Optional[ThreadingHTTPServer]:
+    try:
+        httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.error("메트릭 서버 시작 실패: %s", e, extra={'host': host, 'port': port})
+        return None
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name='metrics-http', daemon=True).start()
+    logger.info("메트릭 엔드포인트: http://%s:%s/metrics", host, httpd.server_port)
+    return httpd
@@ -0,0 +1,178 @@
+import re
+import html
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, List, Dict, Tuple
+from .http_session import get_session
+
+NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.xml"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+NAVER_ERROR_MESSAGES = {
+    400: "잘못된 파라미터", 401: "Client ID/Secret이 올바르지 않음",
+    403: "API 사용량 초과 또는 서비스 제한", 429: "너무 많은 요청"
+}
+
+CATEGORIES = {
+    "정치": 100, "경제": 101, "사회": 102,
+    "생활/문화": 103, "세계": 104, "IT/과학": 105
+}
+
+CATEGORY_QUERIES = {
+    '100': '정치', '101': '경제', '102': '사회',
+    '103': '생활문화', '104': '세계', '105': 'IT과학'
+}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_ITEM_FIELDS = frozenset(('title', 'originallink', 'link', 'description', 'pubDate'))
+
+
+@dataclass(slots=True)
+class NewsItem:
+    title: str = ''
+    originallink: str = ''
+    link: str = ''
+    description: str = ''
+    pubDate: str = ''
+    category: str = '전체'
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+class NaverAPIError(Exception):
+    def __init__(self, status_code: int, body: str = ''):
+        self.status_code = status_code
+        cause = NAVER_ERROR_MESSAGES.get(status_code, f"HTTP {status_code}")
+        super().__init__(f"네이버 뉴스 API 오류: {cause}\n응답 내용: {body[:200]}...")
+
+
+def build_search_query(topic: str = '', category_name: str = '', category_id=None) -> str:
+    if topic and topic.strip():
+        search_query = topic.strip()
+    elif category_name and category_name.strip():
+        search_query = category_name.strip()
+    elif category_id:
+        search_query = CATEGORY_QUERIES.get(str(category_id), '최신뉴스')
+    else:
+        search_query = '최신뉴스'
+    if len(search_query.encode('utf-8')) > 100:
+        search_query = search_query[:30]
+    return search_query
+
+
+def parse_pub_date(pub_date: str) -> int:
+    try:
+        return int(parsedate_to_datetime(pub_date).timestamp())
+    except (TypeError, ValueError, IndexError):
+        return 0
+
+
+def clean_html(text: str) -> str:
+    if not text:
+        return ''
+    return html.unescape(_TAG_RE.sub('', text)).strip()
+
+
+def iter_news_items(stream, category: str = '전체') -> Iterator[NewsItem]:
+    fields = {}
+    in_item = False
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'item':
+                in_item = True
+                fields = {}
+            continue
+        if not in_item:
+            continue
+        if tag == 'item':
+            in_item = False
+            title = clean_html(fields.get('title', ''))
+            if title:
+                yield NewsItem(
+                    title=title,
+                    originallink=fields.get('originallink', ''),
+                    link=fields.get('link', ''),
+                    description=clean_html(fields.get('description', '')),
+                    pubDate=fields.get('pubDate', ''),
+                    category=category
+                )
+            elem.clear()
+        elif tag in _ITEM_FIELDS:
+            fields[tag] = elem.text or ''
+
+
+class NaverNewsClient:
+    ROTATE_STATUS_CODES = (401, 403, 429)
+
+    def __init__(self, client_id: str = '', client_secret: str = '', credential_pool=None):
+        self.client_id = (client_id or '').strip()
+        self.client_secret = (client_secret or '').strip()
+        self.credential_pool = credential_pool
+
+    def _headers(self, credential) -> Dict[str, str]:
+        return {
+            'X-Naver-Client-Id': credential[0],
+            'X-Naver-Client-Secret': credential[1],
+            'User-Agent': USER_AGENT
+        }
+
+    def iter_search(self, query: str, display: int = 50, start: int = 1, sort: str = 'date',
+                    category: str = '전체', timeout: float = 15) -> Iterator[NewsItem]:
+        params = {'query': query, 'display': display, 'start': start, 'sort': sort}
+        attempts = max(1, len(self.credential_pool)) if self.credential_pool else 1
+        for attempt in range(attempts):
+            if self.credential_pool:
+                credential = self.credential_pool.acquire()
+            else:
+                credential = (self.client_id, self.client_secret)
+            try:
+                response = get_session().get(NAVER_NEWS_URL, params=params, headers=self._headers(credential),
+                                        timeout=timeout, stream=True)
+            except Exception:
+                if self.credential_pool:
+                    self.credential_pool.release(credential)
+                raise
+            with response:
+                if self.credential_pool:
+                    self.credential_pool.release(credential, response.status_code)
+                if response.status_code != 200:
+                    if response.status_code in self.ROTATE_STATUS_CODES and attempt < attempts - 1:
+                        continue
+                    raise NaverAPIError(response.status_code, response.text)
+                response.raw.decode_content = True
+                yield from iter_news_items(response.raw, category)
+                return
+
+    def search(self, query: str, display: int = 50, start: int = 1, sort: str = 'date',
+               category: str = '전체', timeout: float = 15) -> List[NewsItem]:
+        return list(self.iter_search(query, display, start, sort, category, timeout))
+
+    def search_since(self, query: str, since_ts: int, seen_links: Iterable[str] = (), limit: int = 50,
+                     page_size: int = 10, category: str = '전체', timeout: float = 15) -> Tuple[List[NewsItem], int]:
+        # 최신순 결과를 작은 페이지부터 받다가 이미 본 기사에 닿으면 나머지는 받지도 파싱하지도 않음
+        seen_links = set(seen_links)
+        new_items = []
+        calls = 0
+        start = 1
+        while len(new_items) < limit and start <= 1000:
+            display = min(page_size, limit - len(new_items), 100)
+            calls += 1
+            received = 0
+            items = self.iter_search(query, display, start, 'date', category, timeout)
+            try:
+                for item in items:
+                    received += 1
+                    pub_ts = parse_pub_date(item.pubDate)
+                    if pub_ts < since_ts or (pub_ts == since_ts and (item.originallink or item.link) in seen_links):
+                        return new_items, calls
+                    new_items.append(item)
+            finally:
+                items.close()
+            if received < display:
+                break
+            start += display
+            page_size = min(page_size * 2, 100)
+        return new_items, calls
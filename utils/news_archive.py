@@ -0,0 +1,219 @@
+import os
+import time
+import sqlite3
+import threading
+import json
+from typing import Iterable, List, Dict, Optional, Tuple, Union
+from .naver_news import NewsItem, parse_pub_date
+
+DEFAULT_ARCHIVE_PATH = os.path.join(os.path.expanduser("~"), ".blog_generator", "news_archive.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    originallink TEXT PRIMARY KEY,
+    link TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    pub_date TEXT NOT NULL DEFAULT '',
+    pub_ts INTEGER NOT NULL DEFAULT 0,
+    category TEXT NOT NULL DEFAULT '',
+    fetched_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_pub_ts ON articles(pub_ts);
+CREATE TABLE IF NOT EXISTS query_hits (
+    query TEXT NOT NULL,
+    originallink TEXT NOT NULL,
+    PRIMARY KEY (query, originallink)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS queries (
+    query TEXT PRIMARY KEY,
+    fetched_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fetch_cursors (
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    newest_ts INTEGER NOT NULL DEFAULT 0,
+    newest_links TEXT NOT NULL DEFAULT '[]',
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (source, query)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS api_usage (
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, name)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO articles_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+"""
+
+_FTS_TABLE = ("CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+              "title, description, content='articles', content_rowid='rowid', tokenize='{tokenizer}')")
+
+_ARTICLE_COLUMNS = "a.title, a.originallink, a.link, a.description, a.pub_date, a.category"
+
+
+class NewsArchive:
+    def __init__(self, db_path: str = DEFAULT_ARCHIVE_PATH):
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            # 조사가 붙은 한국어 어절도 부분 일치로 찾기 위해 trigram 우선 사용
+            try:
+                self._conn.execute(_FTS_TABLE.format(tokenizer='trigram'))
+                self.trigram = True
+            except sqlite3.OperationalError:
+                self._conn.execute(_FTS_TABLE.format(tokenizer='unicode61'))
+                self.trigram = False
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def store(self, items: Iterable[Union[NewsItem, Dict]], query: Optional[str] = None) -> int:
+        now = int(time.time())
+        rows = []
+        for item in items:
+            data = item.to_dict() if isinstance(item, NewsItem) else item
+            key = data.get('originallink') or data.get('link')
+            if not key or not data.get('title'):
+                continue
+            pub_date = data.get('pubDate', '')
+            rows.append((key, data.get('link', ''), data['title'], data.get('description', ''),
+                         pub_date, parse_pub_date(pub_date), data.get('category', ''), now))
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO articles (originallink, link, title, description, pub_date, pub_ts, category, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(originallink) DO UPDATE SET "
+                "title = excluded.title, description = excluded.description, fetched_at = excluded.fetched_at",
+                rows
+            )
+            if query:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO query_hits (query, originallink) VALUES (?, ?)",
+                    [(query, row[0]) for row in rows]
+                )
+                self._conn.execute(
+                    "INSERT INTO queries (query, fetched_at) VALUES (?, ?) "
+                    "ON CONFLICT(query) DO UPDATE SET fetched_at = excluded.fetched_at",
+                    (query, now)
+                )
+        return len(rows)
+
+    def is_fresh(self, query: str, max_age: float) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT fetched_at FROM queries WHERE query = ?", (query,)).fetchone()
+        return bool(row) and time.time() - row[0] <= max_age
+
+    def get_cursor(self, source: str, query: str) -> Optional[Tuple[int, List[str]]]:
+        with self._lock:
+            row = self._conn.execute("SELECT newest_ts, newest_links FROM fetch_cursors WHERE source = ? AND query = ?",
+                                     (source, query)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def advance_cursor(self, source: str, query: str, items: Iterable[Union[NewsItem, Dict]]):
+        # 가장 최신 발행 시각과 그 시각의 기사 링크를 기억해 두면 다음 조회는 그보다 새 기사만 받으면 됨
+        now = int(time.time())
+        newest_ts, newest_links = self.get_cursor(source, query) or (0, [])
+        newest_links = set(newest_links)
+        for item in items:
+            data = item.to_dict() if isinstance(item, NewsItem) else item
+            pub_ts = parse_pub_date(data.get('pubDate', ''))
+            link = data.get('originallink') or data.get('link')
+            if not link or pub_ts < newest_ts:
+                continue
+            if pub_ts > newest_ts:
+                newest_ts, newest_links = pub_ts, set()
+            newest_links.add(link)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO fetch_cursors (source, query, newest_ts, newest_links, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(source, query) DO UPDATE SET newest_ts = excluded.newest_ts, "
+                "newest_links = excluded.newest_links, updated_at = excluded.updated_at",
+                (source, query, newest_ts, json.dumps(sorted(newest_links)), now)
+            )
+            self._conn.execute(
+                "INSERT INTO queries (query, fetched_at) VALUES (?, ?) "
+                "ON CONFLICT(query) DO UPDATE SET fetched_at = excluded.fetched_at",
+                (query, now)
+            )
+
+    def add_usage(self, name: str, calls: int = 1):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO api_usage (day, name, calls) VALUES (?, ?, ?) "
+                "ON CONFLICT(day, name) DO UPDATE SET calls = calls + excluded.calls",
+                (time.strftime('%Y-%m-%d'), name, calls)
+            )
+
+    def usage_today(self, name: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT calls FROM api_usage WHERE day = ? AND name = ?",
+                                     (time.strftime('%Y-%m-%d'), name)).fetchone()
+        return row[0] if row else 0
+
+    def get_query_results(self, query: str, limit: int = 50, category: Optional[str] = None) -> List[NewsItem]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM query_hits h JOIN articles a ON a.originallink = h.originallink "
+                "WHERE h.query = ? ORDER BY a.pub_ts DESC LIMIT ?",
+                (query, limit)
+            ).fetchall()
+        return [self._to_item(row, category) for row in rows]
+
+    def search(self, text: str, limit: int = 50, since_ts: int = 0) -> List[NewsItem]:
+        text = text.strip()
+        if not text:
+            return []
+        if self.trigram and len(text) < 3:
+            # trigram 토크나이저는 3글자 미만 질의를 처리하지 못하므로 LIKE로 대체
+            pattern = f"%{text}%"
+            sql = (f"SELECT {_ARTICLE_COLUMNS} FROM articles a "
+                   "WHERE (a.title LIKE ? OR a.description LIKE ?) AND a.pub_ts >= ? "
+                   "ORDER BY a.pub_ts DESC LIMIT ?")
+            params = (pattern, pattern, since_ts, limit)
+        else:
+            phrase = '"' + text.replace('"', '""') + '"'
+            sql = (f"SELECT {_ARTICLE_COLUMNS} FROM articles_fts f JOIN articles a ON a.rowid = f.rowid "
+                   "WHERE articles_fts MATCH ? AND a.pub_ts >= ? ORDER BY a.pub_ts DESC LIMIT ?")
+            params = (phrase, since_ts, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_item(row) for row in rows]
+
+    def daily_counts(self, text: str, days: int = 7) -> Dict[str, int]:
+        since_ts = int(time.time()) - days * 86400
+        counts = {}
+        for item in self.search(text, limit=100000, since_ts=since_ts):
+            day = time.strftime('%Y-%m-%d', time.localtime(parse_pub_date(item.pubDate)))
+            counts[day] = counts.get(day, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    @staticmethod
+    def _to_item(row, category: Optional[str] = None) -> NewsItem:
+        return NewsItem(title=row[0], originallink=row[1], link=row[2], description=row[3],
+                        pubDate=row[4], category=category if category is not None else row[5])
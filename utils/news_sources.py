@@ -0,0 +1,264 @@
+import logging
+import os
+import re
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Optional, Tuple
+from .http_session import get_session
+from .naver_news import NaverNewsClient, NewsItem, CATEGORY_QUERIES, USER_AGENT, clean_html, parse_pub_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCE_DEADLINE = 15
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+# 카테고리 기본 검색어는 RSS/파일 항목을 걸러낼 수 없으므로 필터 없이 최신순으로 사용
+UNFILTERED_QUERIES = set(CATEGORY_QUERIES.values()) | {'최신뉴스'}
+
+# 파이프라인과 선행 수집기가 실행마다 소스를 새로 만들므로, 파일 내용은 경로별로 모듈 수준에서 한 번만 읽어 둠
+_jsonl_cache: Dict[str, Tuple[float, List[NewsItem]]] = {}
+_jsonl_cache_lock = threading.Lock()
+
+def _query_terms(query: str) -> List[str]:
+    if query in UNFILTERED_QUERIES:
+        return []
+    return [term for term in re.split(r'\s+', query.lower()) if len(term) > 1]
+
+def matches_query(item: NewsItem, terms: List[str]) -> bool:
+    if not terms:
+        return True
+    text = f"{item.title} {item.description}".lower()
+    return any(term in text for term in terms)
+
+def _rfc822(date_text: str) -> str:
+    # Atom의 ISO 8601 날짜를 네이버와 같은 RFC 822 형식으로 맞춰 아카이브·정렬이 한 가지 형식만 다루게 함
+    date_text = (date_text or '').strip()
+    if not date_text or date_text[:4].isalpha():
+        return date_text
+    try:
+        parsed = datetime.fromisoformat(date_text.replace('Z', '+00:00'))
+    except ValueError:
+        return date_text
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return format_datetime(parsed)
+
+class NewsSource(ABC):
+    name = 'source'
+
+    def __init__(self, deadline: float = DEFAULT_SOURCE_DEADLINE, news_archive=None):
+        self.deadline = deadline
+        self.news_archive = news_archive
+
+    def _archive(self, items: List[NewsItem], query: str):
+        # 각 소스가 새로 받은 항목만 직접 저장하므로, 아카이브에서 읽어 온 결과를 다시 쓰는 일이 없음
+        if not self.news_archive or not items:
+            return
+        try:
+            self.news_archive.store(items, query)
+        except Exception as e:
+            logger.warning("뉴스 아카이브 저장 실패 (계속 진행): %s", e, extra={'source': self.name, 'query': query})
+
+    @abstractmethod
+    def search(self, query: str, category: str = '전체', limit: int = 50) -> List[NewsItem]:
+        pass
+
+def fetch_incremental(client: NaverNewsClient, news_archive, query: str, category: str = '전체',
+                      limit: int = 50, timeout: float = DEFAULT_SOURCE_DEADLINE,
+                      source: str = 'naver') -> Tuple[List[NewsItem], int]:
+    # 처음 보는 검색어만 전체 창을 받고, 이후에는 마지막으로 본 기사보다 새 기사만 받아 아카이브에 합침
+    cursor = news_archive.get_cursor(source, query)
+    if cursor is None:
+        news_items = client.search(query, display=limit, category=category, timeout=timeout)
+        calls = 1
+    else:
+        news_items, calls = client.search_since(query, cursor[0], cursor[1], limit=limit,
+                                                category=category, timeout=timeout)
+    news_archive.store(news_items, query)
+    news_archive.advance_cursor(source, query, news_items)
+    return news_items, calls
+
+class NaverNewsSource(NewsSource):
+    name = 'naver'
+
+    def __init__(self, client: NaverNewsClient, deadline: float = DEFAULT_SOURCE_DEADLINE, news_archive=None):
+        super().__init__(deadline, news_archive)
+        self.client = client
+
+    def search(self, query: str, category: str = '전체', limit: int = 50) -> List[NewsItem]:
+        if not self.news_archive:
+            return self.client.search(query, display=limit, category=category, timeout=self.deadline)
+        fetch_incremental(self.client, self.news_archive, query, category, limit, self.deadline, self.name)
+        return self.news_archive.get_query_results(query, limit=limit, category=category)
+
+class FeedNewsSource(NewsSource):
+    def __init__(self, url: str, deadline: float = DEFAULT_SOURCE_DEADLINE, name: str = '', news_archive=None):
+        super().__init__(deadline, news_archive)
+        self.url = url
+        self.name = name or f"feed:{url}"
+
+    def search(self, query: str, category: str = '전체', limit: int = 50) -> List[NewsItem]:
+        response = get_session().get(self.url, headers={'User-Agent': USER_AGENT}, timeout=self.deadline)
+        response.raise_for_status()
+        terms = _query_terms(query)
+        items = [item for item in self.parse(response.content, category) if matches_query(item, terms)][:limit]
+        self._archive(items, query)
+        return items
+
+    @staticmethod
+    def parse(content: bytes, category: str = '전체') -> List[NewsItem]:
+        root = ET.fromstring(content)
+        items = []
+        for elem in root.iter('item'):
+            title = clean_html(elem.findtext('title', ''))
+            if title:
+                link = (elem.findtext('link', '') or '').strip()
+                items.append(NewsItem(
+                    title=title,
+                    originallink=link,
+                    link=link,
+                    description=clean_html(elem.findtext('description', '')),
+                    pubDate=_rfc822(elem.findtext('pubDate', '')),
+                    category=category
+                ))
+        for elem in root.iter(f'{ATOM_NS}entry'):
+            title = clean_html(elem.findtext(f'{ATOM_NS}title', ''))
+            if not title:
+                continue
+            link = ''
+            for link_elem in elem.findall(f'{ATOM_NS}link'):
+                if link_elem.get('rel', 'alternate') == 'alternate':
+                    link = link_elem.get('href', '')
+                    break
+            summary = elem.findtext(f'{ATOM_NS}summary') or elem.findtext(f'{ATOM_NS}content') or ''
+            published = elem.findtext(f'{ATOM_NS}published') or elem.findtext(f'{ATOM_NS}updated') or ''
+            items.append(NewsItem(
+                title=title,
+                originallink=link,
+                link=link,
+                description=clean_html(summary),
+                pubDate=_rfc822(published),
+                category=category
+            ))
+        return items
+
+class JsonlNewsSource(NewsSource):
+    def __init__(self, path: str, deadline: float = DEFAULT_SOURCE_DEADLINE, name: str = '', news_archive=None):
+        super().__init__(deadline, news_archive)
+        self.path = path
+        self.name = name or f"file:{os.path.basename(path)}"
+
+    def _load(self) -> List[NewsItem]:
+        # 파일이 바뀌었을 때만 다시 읽고, 최신순으로 정렬해 둠
+        path = os.path.abspath(self.path)
+        mtime = os.path.getmtime(path)
+        with _jsonl_cache_lock:
+            cached = _jsonl_cache.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            items = []
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    title = clean_html(record.get('title', ''))
+                    if not title:
+                        continue
+                    link = record.get('link') or record.get('url') or ''
+                    items.append(NewsItem(
+                        title=title,
+                        originallink=record.get('originallink') or link,
+                        link=link,
+                        description=clean_html(record.get('description', '')),
+                        pubDate=_rfc822(record.get('pubDate', '')),
+                        category=record.get('category', '전체')
+                    ))
+            items.sort(key=lambda item: parse_pub_date(item.pubDate), reverse=True)
+            _jsonl_cache[path] = (mtime, items)
+            return items
+
+    def search(self, query: str, category: str = '전체', limit: int = 50) -> List[NewsItem]:
+        terms = _query_terms(query)
+        results = []
+        for item in self._load():
+            if matches_query(item, terms):
+                results.append(NewsItem(item.title, item.originallink, item.link, item.description,
+                                        item.pubDate, category if category != '전체' else item.category))
+                if len(results) >= limit:
+                    break
+        self._archive(results, query)
+        return results
+
+def merge_news(result_lists: List[List[NewsItem]], limit: int = 0) -> List[NewsItem]:
+    merged = []
+    seen = set()
+    for items in result_lists:
+        for item in items:
+            keys = {(item.originallink or item.link).rstrip('/'), re.sub(r'\s+', '', item.title)}
+            keys.discard('')
+            if keys & seen:
+                continue
+            seen |= keys
+            merged.append(item)
+    merged.sort(key=lambda item: parse_pub_date(item.pubDate), reverse=True)
+    return merged[:limit] if limit else merged
+
+def gather_news(sources: List[NewsSource], query: str, category: str = '전체', limit: int = 50,
+                timeout: Optional[float] = None) -> Tuple[List[NewsItem], Dict[str, Exception]]:
+    if not sources:
+        return [], {}
+    results = {}
+    errors = {}
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='news-source')
+    started = time.monotonic()
+    deadlines = {}
+    for source in sources:
+        # 호출한 쪽의 남은 시간이 소스 자체 마감보다 짧으면 그 시간까지만 기다림
+        source_deadline = source.deadline if timeout is None else min(source.deadline, timeout)
+        future = executor.submit(source.search, query, category, limit)
+        deadlines[future] = (source, started + source_deadline)
+    pending = set(deadlines)
+    try:
+        while pending:
+            now = time.monotonic()
+            # 자기 마감 시간이 지난 소스는 기다리지 않고 버림 (스레드는 백그라운드에서 끝나게 둠)
+            for future in [f for f in pending if deadlines[f][1] <= now]:
+                pending.discard(future)
+                source = deadlines[future][0]
+                errors[source.name] = TimeoutError(f"{deadlines[future][1] - started:.1f}초 안에 응답하지 않음")
+                logger.warning("뉴스 소스 시간 초과 (건너뜀): %s", source.name, extra={'source': source.name, 'query': query})
+            if not pending:
+                break
+            wait_seconds = min(deadlines[f][1] for f in pending) - now
+            done, pending = wait(pending, timeout=max(0, wait_seconds), return_when=FIRST_COMPLETED)
+            for future in done:
+                source = deadlines[future][0]
+                try:
+                    results[source.name] = future.result()
+                except Exception as e:
+                    errors[source.name] = e
+                    logger.warning("뉴스 소스 실패 (건너뜀): %s: %s", source.name, e, extra={'source': source.name, 'query': query})
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    ordered = [results[source.name] for source in sources if source.name in results]
+    return merge_news(ordered, limit), errors
+
+def build_news_sources(settings_manager=None, naver_id: str = '', naver_secret: str = '',
+                       naver_pool=None, news_archive=None) -> List[NewsSource]:
+    source_settings = settings_manager.get_news_source_settings() if settings_manager else {}
+    deadline = source_settings.get('news_source_deadline', DEFAULT_SOURCE_DEADLINE)
+    sources = []
+    if naver_pool or (naver_id and naver_secret):
+        sources.append(NaverNewsSource(NaverNewsClient(naver_id, naver_secret, credential_pool=naver_pool),
+                                       deadline=deadline, news_archive=news_archive))
+    for url in source_settings.get('news_feeds', []):
+        sources.append(FeedNewsSource(url, deadline=deadline, news_archive=news_archive))
+    for path in source_settings.get('news_jsonl_paths', []):
+        sources.append(JsonlNewsSource(os.path.expanduser(path), deadline=deadline, news_archive=news_archive))
+    return sources
@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import List, Dict, Optional, Any
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".blog_generator", "post_history.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    category TEXT NOT NULL DEFAULT '',
+    source_url TEXT NOT NULL DEFAULT '',
+    blog_json TEXT NOT NULL,
+    markdown TEXT NOT NULL DEFAULT '',
+    html TEXT NOT NULL DEFAULT '',
+    image_paths TEXT NOT NULL DEFAULT '{}',
+    timings TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at);
+CREATE INDEX IF NOT EXISTS idx_posts_source_url ON posts(source_url);
+CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts(rowid, title, markdown) VALUES (new.id, new.title, new.markdown);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, title, markdown) VALUES ('delete', old.id, old.title, old.markdown);
+END;
+"""
+
+_FTS_TABLE = ("CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+              "title, markdown, content='posts', content_rowid='id', tokenize='{tokenizer}')")
+
+
+class PostHistory:
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH):
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            try:
+                self._conn.execute(_FTS_TABLE.format(tokenizer='trigram'))
+                self.trigram = True
+            except sqlite3.OperationalError:
+                self._conn.execute(_FTS_TABLE.format(tokenizer='unicode61'))
+                self.trigram = False
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add_post(self, blog_data: Dict[str, Any], markdown: str = '', html: str = '',
+                 image_paths: Optional[Dict[str, str]] = None, timings: Optional[Dict[str, float]] = None) -> int:
+        source = blog_data.get('source_news', {}) or {}
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO posts (created_at, title, category, source_url, blog_json, markdown, html, image_paths, timings) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (int(time.time()), blog_data.get('title', ''), source.get('category', ''),
+                 source.get('url', ''), json.dumps(blog_data, ensure_ascii=False), markdown or '', html or '',
+                 json.dumps(image_paths or {}, ensure_ascii=False), json.dumps(timings or {}))
+            )
+        return cursor.lastrowid
+
+    def update_images(self, post_id: int, blog_data: Dict[str, Any], html: str, image_paths: Dict[str, str]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE posts SET blog_json = ?, html = ?, image_paths = ? WHERE id = ?",
+                (json.dumps(blog_data, ensure_ascii=False), html or '',
+                 json.dumps(image_paths or {}, ensure_ascii=False), post_id)
+            )
+
+    def _where(self, query: str):
+        query = query.strip()
+        if not query:
+            return "", ()
+        if self.trigram and len(query) < 3:
+            pattern = f"%{query}%"
+            return "WHERE (title LIKE ? OR markdown LIKE ?)", (pattern, pattern)
+        phrase = '"' + query.replace('"', '""') + '"'
+        return "WHERE id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)", (phrase,)
+
+    def count(self, query: str = '') -> int:
+        where, params = self._where(query)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM posts {where}", params).fetchone()[0]
+
+    def list_page(self, offset: int, limit: int, query: str = '') -> List[Dict[str, Any]]:
+        where, params = self._where(query)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, created_at, title, category FROM posts {where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + (limit, offset)
+            ).fetchall()
+        return [{'id': r[0], 'created_at': r[1], 'title': r[2], 'category': r[3]} for r in rows]
+
+    def get_post(self, post_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, created_at, blog_json, markdown, html, image_paths, timings FROM posts WHERE id = ?",
+                (post_id,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            'id': row[0],
+            'created_at': row[1],
+            'blog_data': json.loads(row[2]),
+            'markdown': row[3],
+            'html': row[4],
+            'image_paths': json.loads(row[5]),
+            'timings': json.loads(row[6])
+        }
+
+    def delete_post(self, post_id: int):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
@@ -0,0 +1,160 @@
+import logging
+import io
+import os
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".blog_generator", "profiles")
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 15
+
+_output_dir = None
+_forced = False
+# cProfile은 스레드마다 켜지지만 파이썬 버전에 따라 동시에 하나만 허용되므로 실행 단위로 직렬화
+_profile_lock = threading.Lock()
+
+def enable(output_dir: Optional[str] = None, forced: bool = False):
+    global _output_dir, _forced
+    _output_dir = output_dir or DEFAULT_PROFILE_DIR
+    _forced = _forced or forced
+    os.makedirs(_output_dir, exist_ok=True)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(1)
+
+def disable():
+    global _output_dir
+    # --profile로 켠 경우에는 설정 저장으로 꺼지지 않게 유지
+    if _forced:
+        return
+    _output_dir = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def apply_setting(enabled: bool):
+    if enabled:
+        enable(_output_dir)
+    else:
+        disable()
+
+def is_enabled() -> bool:
+    return _output_dir is not None
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+
+class RunProfiler:
+    def __init__(self, name: str, enabled: Optional[bool] = None):
+        self.name = name
+        self.enabled = is_enabled() if enabled is None else enabled
+        self.summary = None
+        self._profile = None
+        self._locked = False
+        self._before = None
+        self._started = 0.0
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+        self._before = _snapshot()
+        tracemalloc.reset_peak()
+        self._locked = _profile_lock.acquire(blocking=False)
+        if self._locked:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        wall = time.perf_counter() - self._started
+        if self._profile:
+            self._profile.disable()
+        if self._locked:
+            _profile_lock.release()
+        try:
+            self.summary = self._write_report(wall, exc)
+        except Exception as e:
+            logger.warning("프로파일 저장 실패: %s", e)
+        return False
+
+    def _write_report(self, wall: float, exc) -> Dict[str, Any]:
+        _, peak = tracemalloc.get_traced_memory()
+        after = _snapshot()
+        diffs = after.compare_to(self._before, 'lineno')
+        self._before = None
+        output_dir = _output_dir or DEFAULT_PROFILE_DIR
+        os.makedirs(output_dir, exist_ok=True)
+        base_path = os.path.join(output_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.name}")
+
+        top_functions = []
+        stats_text = "(다른 실행이 프로파일 중이라 CPU 프로파일은 생략됨)\n"
+        if self._profile:
+            self._profile.dump_stats(f"{base_path}.prof")
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream).sort_stats('cumulative')
+            stats.print_stats(TOP_FUNCTIONS * 2)
+            stats_text = stream.getvalue()
+            for (filename, line, func), (_, ncalls, _, cumtime, _) in sorted(
+                    stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]:
+                top_functions.append({
+                    'function': f"{os.path.basename(filename)}:{line}({func})",
+                    'calls': ncalls,
+                    'cumulative_seconds': round(cumtime, 4)
+                })
+
+        top_allocations = [{
+            'location': f"{os.path.basename(diff.traceback[0].filename)}:{diff.traceback[0].lineno}",
+            'size_diff_kb': round(diff.size_diff / 1024, 1),
+            'count_diff': diff.count_diff
+        } for diff in diffs[:TOP_ALLOCATIONS]]
+
+        summary = {
+            'name': self.name,
+            'wall_seconds': round(wall, 3),
+            'failed': exc is not None,
+            'memory_diff_kb': round(sum(diff.size_diff for diff in diffs) / 1024, 1),
+            'peak_kb': round(peak / 1024, 1),
+            'top_functions': top_functions,
+            'top_allocations': top_allocations,
+            'report_path': f"{base_path}.txt",
+            'profile_path': f"{base_path}.prof" if self._profile else ''
+        }
+        with open(summary['report_path'], 'w', encoding='utf-8') as f:
+            f.write(format_summary(summary))
+            f.write("\n\n## cProfile (누적 시간 순)\n")
+            f.write(stats_text)
+        return summary
+
+def format_summary(summary: Dict[str, Any], max_rows: int = TOP_FUNCTIONS) -> str:
+    lines = [
+        f"# {summary['name']} — {summary['wall_seconds']}초" + (" (실패)" if summary.get('failed') else ""),
+        f"메모리 증가: {summary['memory_diff_kb']} KB, 최대 사용: {summary['peak_kb']} KB",
+        "",
+        "## 누적 시간 상위 함수"
+    ]
+    for row in summary['top_functions'][:max_rows]:
+        lines.append(f"  {row['cumulative_seconds']:>9.4f}s  {row['calls']:>7}회  {row['function']}")
+    lines.append("")
+    lines.append("## 메모리 증가 상위 위치")
+    for row in summary['top_allocations'][:max_rows]:
+        lines.append(f"  {row['size_diff_kb']:>9.1f} KB  {row['count_diff']:>+7}개  {row['location']}")
+    lines.append("")
+    lines.append(f"보고서: {summary['report_path']}")
+    if summary.get('profile_path'):
+        lines.append(f"프로파일: {summary['profile_path']} (snakeviz, pstats로 열기)")
+    return '\n'.join(lines)
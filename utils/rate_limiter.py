@@ -0,0 +1,28 @@
+import time
+import threading
+
+class RateLimiter:
+    def __init__(self, max_concurrent: int = 4, requests_per_minute: float = 60):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self):
+        self._semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_start)
+            self._next_start = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def release(self):
+        self._semaphore.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -1,8 +1,11 @@
 import os
 import json
+import logging
 from cryptography.fernet import Fernet
 from typing import Dict, Any
 
+logger = logging.getLogger(__name__)
+
 class EncryptedSettingsManager:
     def __init__(self):
         self.config_dir = os.path.join(os.path.expanduser("~"), ".blog_generator")
@@ -14,8 +17,26 @@ class EncryptedSettingsManager:
             'google_api_key': '',
             'unsplash_access_key': '',
             'pixabay_api_key': '',
+            'naver_extra_credentials': [],
+            'google_extra_api_keys': [],
             'last_category_index': 0,
             'last_keyword': '',
+            'news_cache_max_age': 600,
+            'recent_keywords': [],
+            'prefetch_enabled': False,
+            'prefetch_interval_minutes': 5,
+            'prefetch_daily_quota': 1000,
+            'speculative_prefetch_enabled': True,
+            'news_feeds': [],
+            'news_jsonl_paths': [],
+            'news_source_deadline': 15,
+            'gemini_model_tiers': ['gemini-2.5-flash', 'gemini-2.5-flash-lite'],
+            'generation_latency_budget': 120,
+            'generation_deadline': 180,
+            'generation_hedge_enabled': True,
+            'generation_candidates': 1,
+            'candidate_mode': 'stories',
+            'profiling_enabled': False,
             'window_x': 100,
             'window_y': 100,
             'window_width': 1200,
@@ -27,7 +48,7 @@ class EncryptedSettingsManager:
             self.cipher = self._get_or_create_cipher()
             self.load_settings()
         except Exception as e:
-            print(f"암호화 초기화 실패, 기본 설정 사용: {e}")
+            logger.error("암호화 초기화 실패, 기본 설정 사용: %s", e)
 
     def _get_or_create_cipher(self):
         try:
@@ -40,7 +61,7 @@ class EncryptedSettingsManager:
                     f.write(key)
             return Fernet(key)
         except Exception as e:
-            print(f"암호화 키 생성 실패: {e}")
+            logger.error("암호화 키 생성 실패: %s", e, extra={'path': self.key_file})
             return None
 
     def load_settings(self):
@@ -58,7 +79,7 @@ class EncryptedSettingsManager:
             else:
                 self.save_settings()
         except Exception as e:
-            print(f"설정 로드 실패, 기본값 사용: {e}")
+            logger.error("설정 로드 실패, 기본값 사용: %s", e, extra={'path': self.settings_file})
             self.settings = self.default_settings.copy()
 
     def save_settings(self):
@@ -71,9 +92,9 @@ class EncryptedSettingsManager:
                 with open(self.settings_file, 'wb') as f:
                     f.write(encrypted_data)
             else:
-                print("암호화 키가 없어 저장 실패")
+                logger.error("암호화 키가 없어 저장 실패")
         except Exception as e:
-            print(f"설정 저장 실패: {e}")
+            logger.error("설정 저장 실패: %s", e, extra={'path': self.settings_file})
 
     def get_window_geometry(self) -> Dict[str, int]:
         return {
@@ -101,16 +122,56 @@ class EncryptedSettingsManager:
         self.settings['last_keyword'] = keyword
         self.save_settings()
 
-    def get_api_settings(self) -> Dict[str, str]:
+    def add_recent_keyword(self, keyword: str, max_keywords: int = 10):
+        keyword = keyword.strip()
+        if not keyword:
+            return
+        keywords = [k for k in self.settings.get('recent_keywords', []) if k != keyword]
+        self.settings['recent_keywords'] = [keyword] + keywords[:max_keywords - 1]
+        self.save_settings()
+
+    def get_prefetch_settings(self) -> Dict[str, Any]:
+        return {
+            'prefetch_enabled': self.settings.get('prefetch_enabled', False),
+            'prefetch_interval_minutes': self.settings.get('prefetch_interval_minutes', 5),
+            'prefetch_daily_quota': self.settings.get('prefetch_daily_quota', 1000),
+            'speculative_prefetch_enabled': self.settings.get('speculative_prefetch_enabled', True)
+        }
+
+    def get_news_source_settings(self) -> Dict[str, Any]:
+        return {
+            'news_feeds': self.settings.get('news_feeds', []),
+            'news_jsonl_paths': self.settings.get('news_jsonl_paths', []),
+            'news_source_deadline': self.settings.get('news_source_deadline', 15)
+        }
+
+    def get_generation_settings(self) -> Dict[str, Any]:
+        return {
+            'gemini_model_tiers': self.settings.get('gemini_model_tiers', ['gemini-2.5-flash', 'gemini-2.5-flash-lite']),
+            'generation_latency_budget': self.settings.get('generation_latency_budget', 120),
+            'generation_deadline': self.settings.get('generation_deadline', 180),
+            'generation_hedge_enabled': self.settings.get('generation_hedge_enabled', True),
+            'generation_candidates': self.settings.get('generation_candidates', 1),
+            'candidate_mode': self.settings.get('candidate_mode', 'stories')
+        }
+
+    def get_debug_settings(self) -> Dict[str, Any]:
+        return {
+            'profiling_enabled': self.settings.get('profiling_enabled', False)
+        }
+
+    def get_api_settings(self) -> Dict[str, Any]:
         return {
             'naver_client_id': self.settings.get('naver_client_id', ''),
             'naver_client_secret': self.settings.get('naver_client_secret', ''),
             'google_api_key': self.settings.get('google_api_key', ''),
             'unsplash_access_key': self.settings.get('unsplash_access_key', ''),
-            'pixabay_api_key': self.settings.get('pixabay_api_key', '')
+            'pixabay_api_key': self.settings.get('pixabay_api_key', ''),
+            'naver_extra_credentials': self.settings.get('naver_extra_credentials', []),
+            'google_extra_api_keys': self.settings.get('google_extra_api_keys', [])
         }
 
-    def set_api_settings(self, api_settings: Dict[str, str]):
+    def set_api_settings(self, api_settings: Dict[str, Any]):
         filtered_settings = {k: v for k, v in api_settings.items()
                            if k not in ['gmail', 'gmail_password']}
         for key, value in filtered_settings.items():
@@ -165,8 +226,26 @@ DEFAULT_SETTINGS = {
     'google_api_key': '',
     'unsplash_access_key': '',
     'pixabay_api_key': '',
+    'naver_extra_credentials': [],
+    'google_extra_api_keys': [],
     'last_category_index': 0,
     'last_keyword': '',
+    'news_cache_max_age': 600,
+    'recent_keywords': [],
+    'prefetch_enabled': False,
+    'prefetch_interval_minutes': 5,
+    'prefetch_daily_quota': 1000,
+    'speculative_prefetch_enabled': True,
+    'news_feeds': [],
+    'news_jsonl_paths': [],
+    'news_source_deadline': 15,
+    'gemini_model_tiers': ['gemini-2.5-flash', 'gemini-2.5-flash-lite'],
+    'generation_latency_budget': 120,
+    'generation_deadline': 180,
+    'generation_hedge_enabled': True,
+    'generation_candidates': 1,
+    'candidate_mode': 'stories',
+    'profiling_enabled': False,
     'window_x': 100,
     'window_y': 100,
     'window_width': 1200,
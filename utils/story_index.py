@@ -0,0 +1,94 @@
+import logging
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".blog_generator", "story_index.db")
+
+_BRACKET_RE = re.compile(r'\[[^\]]*\]|\([^)]*\)|【[^】]*】|<[^>]*>')
+_TOKEN_RE = re.compile(r'[가-힣A-Za-z0-9]{2,}')
+FINGERPRINT_TOKENS = 4
+
+def title_tokens(title: str) -> set:
+    return set(_TOKEN_RE.findall(_BRACKET_RE.sub(' ', title or '').lower()))
+
+def title_similarity(title_a: str, title_b: str) -> float:
+    tokens_a = title_tokens(title_a)
+    tokens_b = title_tokens(title_b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+def title_fingerprint(title: str) -> str:
+    tokens = title_tokens(title)
+    if len(tokens) < 3:
+        return ''
+    # 언론사마다 어순과 수식어가 달라도 핵심 단어가 겹치면 같은 값이 나오도록 해시값이 가장 작은 토큰만 사용 (min-hash)
+    selected = sorted(tokens, key=lambda t: hashlib.md5(t.encode('utf-8')).digest())[:FINGERPRINT_TOKENS]
+    return hashlib.sha1(' '.join(sorted(selected)).encode('utf-8')).hexdigest()
+
+def open_story_index(db_path: str = DEFAULT_INDEX_PATH):
+    try:
+        return StoryIndex(db_path)
+    except Exception as e:
+        logger.warning("발행 기록 색인 열기 실패 (중복 검사 없이 진행): %s", e, extra={'path': db_path})
+        return None
+
+class StoryIndex:
+    # 여러 작업 프로세스가 같은 DB를 함께 쓰므로 프로세스별 메모리 캐시 없이 SQLite만 기준으로 확인 (색인 조회라 충분히 빠름)
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS stories ("
+                "link TEXT PRIMARY KEY, title TEXT NOT NULL DEFAULT '', fingerprint TEXT NOT NULL DEFAULT '', "
+                "published_at INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_fingerprint ON stories(fingerprint)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def is_covered(self, news_item: Dict) -> bool:
+        link = news_item.get('originallink') or news_item.get('link', '')
+        fingerprint = title_fingerprint(news_item.get('title', ''))
+        with self._lock:
+            if link and self._conn.execute("SELECT 1 FROM stories WHERE link = ?", (link,)).fetchone():
+                return True
+            if fingerprint and self._conn.execute(
+                    "SELECT 1 FROM stories WHERE fingerprint = ? LIMIT 1", (fingerprint,)).fetchone():
+                return True
+        return False
+
+    def record(self, news_item: Dict):
+        self.record_many([news_item])
+
+    def record_many(self, news_items: Iterable[Dict]):
+        rows = []
+        for news_item in news_items:
+            link = news_item.get('originallink') or news_item.get('link', '')
+            if not link:
+                continue
+            title = news_item.get('title', '')
+            rows.append((link, title, title_fingerprint(title), int(time.time())))
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO stories (link, title, fingerprint, published_at) VALUES (?, ?, ?, ?)", rows)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM stories").fetchone()[0]
@@ -1,32 +1,71 @@
+import logging
 import json
 import re
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit,
     QPushButton, QLabel, QFrame, QTabWidget, QTextEdit,
     QProgressBar, QMessageBox, QFileDialog
 )
 from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QMimeData, QUrl
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QImage, QColor, QPainter, QTextCursor, QTextDocument
 from utils.image_downloader import ImageDownloader
+from utils.post_history import PostHistory
+from utils.naver_news import CATEGORIES
+from utils.profiler import RunProfiler, format_summary
+from utils.image_hash_index import dhash, get_image_hash_index
+from utils.exporter import BundleExporter, post_slug
+from .history_panel import HistoryPanel
+from .image_gallery import ImageGallery, ThumbnailLoader
+
+logger = logging.getLogger(__name__)
+
+PENDING_IMAGE_SCHEME = 'pending'
+IMAGE_FAILED_HTML = '<span style="color:red;">이미지를 불러올 수 없습니다</span>'
+FAILED_IMAGE_SCHEME = 'failed'
+
+def image_tag(src):
+    return f'<div align="center" style="margin: 1em 0;"><img src="{src}" style="max-width:90%; border-radius: 8px;"></div>'
 
 class ImageProcessingThread(QThread):
+    text_ready = pyqtSignal(str, str)
+    image_ready = pyqtSignal(str, str)
+    image_failed = pyqtSignal(str)
     finished = pyqtSignal(str, str, dict)
     error = pyqtSignal(str)
+    profile_ready = pyqtSignal(dict)
 
-    def __init__(self, blog_data, image_downloader):
+    def __init__(self, blog_data, image_downloader, image_timeout=20):
         super().__init__()
         self.blog_data = blog_data
         self.image_downloader = image_downloader
+        self.image_timeout = image_timeout
         self.local_image_paths = {}
+        self.elapsed = 0.0
 
     def run(self):
+        profiler = RunProfiler('image_processing')
         try:
-            display_html = self._process_content_for_display()
-            markdown_content = self._process_content_for_markdown()
+            with profiler:
+                started = time.perf_counter()
+                markdown_content = self._process_content_for_markdown()
+                image_urls = self._collect_image_urls()
+                placeholder_html = self._process_content_for_display(
+                    lambda key: image_tag(f"{PENDING_IMAGE_SCHEME}:{key}") if key in image_urls else None
+                )
+                self.text_ready.emit(placeholder_html, markdown_content)
+
+                self._download_images(image_urls)
+                display_html = self._process_content_for_display(self._final_image_html)
+                self.elapsed = round(time.perf_counter() - started, 3)
             self.finished.emit(display_html, markdown_content, self.local_image_paths)
         except Exception as e:
             self.error.emit(str(e))
+        finally:
+            if profiler.summary:
+                self.profile_ready.emit(profiler.summary)
 
     def _get_content_as_string(self):
         content = self.blog_data.get('body', '') or self.blog_data.get('content', '')
@@ -36,34 +75,57 @@ class ImageProcessingThread(QThread):
             content = str(content)
         return content
 
-    def _process_content_for_display(self):
-        content = self._get_content_as_string()
-        title = self.blog_data.get('title', '')
-        conclusion = self.blog_data.get('conclusion', '')
-        tags = self.blog_data.get('tags', [])
+    def _collect_image_urls(self):
         images_data = self.blog_data.get('images', {})
-        image_markers = re.findall(r'\[이미지_\d+\]', content)
-
-        for marker in image_markers:
+        image_urls = {}
+        for marker in re.findall(r'\[이미지_\d+\]', self._get_content_as_string()):
             marker_key = marker.strip('[]')
-            if marker_key in images_data and images_data[marker_key]:
-                img_data = images_data[marker_key][0]
-                img_url = img_data.get('url', '')
+            if images_data.get(marker_key):
+                img_url = images_data[marker_key][0].get('url', '')
                 if img_url:
-                    local_path = self.image_downloader.download_image(
-                        img_url, filename_prefix=marker_key.replace('_', '')
-                    )
-                    if local_path and os.path.exists(local_path):
-                        file_url = self.image_downloader.get_file_url(local_path)
-                        self.local_image_paths[marker_key] = local_path
-                        img_tag = f'<div align="center" style="margin: 1em 0;"><img src="{file_url}" style="max-width:90%; border-radius: 8px;"></div>'
-                        content = content.replace(marker, img_tag)
-                    else:
-                        content = content.replace(marker, '<p style="color:red;">이미지를 불러올 수 없습니다</p>')
+                    image_urls[marker_key] = img_url
+        return image_urls
+
+    def _download_images(self, image_urls):
+        if not image_urls:
+            return
+        executor = ThreadPoolExecutor(max_workers=len(image_urls))
+        futures = {
+            executor.submit(self.image_downloader.download_image, url, filename_prefix=key.replace('_', '')): key
+            for key, url in image_urls.items()
+        }
+        pending = set(image_urls)
+        try:
+            for future in as_completed(futures, timeout=self.image_timeout):
+                marker_key = futures[future]
+                pending.discard(marker_key)
+                local_path = future.result()
+                if local_path and os.path.exists(local_path):
+                    self.local_image_paths[marker_key] = local_path
+                    self.image_ready.emit(marker_key, local_path)
                 else:
-                    content = content.replace(marker, '')
-            else:
-                content = content.replace(marker, '')
+                    self.image_failed.emit(marker_key)
+        except FuturesTimeoutError:
+            for marker_key in pending:
+                logger.warning("이미지 다운로드 시간 초과", extra={'marker': marker_key})
+                self.image_failed.emit(marker_key)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _final_image_html(self, marker_key):
+        if marker_key in self.local_image_paths:
+            return image_tag(self.image_downloader.get_file_url(self.local_image_paths[marker_key]))
+        if marker_key in self._collect_image_urls():
+            return f'<div align="center">{IMAGE_FAILED_HTML}</div>'
+        return None
+
+    def _process_content_for_display(self, image_html_for):
+        content = self._get_content_as_string()
+        title = self.blog_data.get('title', '')
+        conclusion = self.blog_data.get('conclusion', '')
+        tags = self.blog_data.get('tags', [])
+        for marker in re.findall(r'\[이미지_\d+\]', content):
+            content = content.replace(marker, image_html_for(marker.strip('[]')) or '')
         return self._build_display_html(title, content, conclusion, tags)
 
     def _process_content_for_markdown(self):
@@ -119,21 +181,56 @@ class ImageProcessingThread(QThread):
         """
         return html
 
+class ImageSwapThread(QThread):
+    image_ready = pyqtSignal(str, str, str)
+    image_failed = pyqtSignal(str, str)
+
+    def __init__(self, marker_key, url, image_downloader, parent=None):
+        super().__init__(parent)
+        self.marker_key = marker_key
+        self.url = url
+        self.image_downloader = image_downloader
+
+    def run(self):
+        local_path = self.image_downloader.download_image(self.url, filename_prefix=self.marker_key.replace('_', ''))
+        if not local_path:
+            self.image_failed.emit(self.marker_key, self.url)
+            return
+        self._record_hash(local_path)
+        self.image_ready.emit(self.marker_key, self.url, local_path)
+
+    def _record_hash(self, local_path):
+        hash_index = get_image_hash_index()
+        if not hash_index:
+            return
+        try:
+            with open(local_path, 'rb') as f:
+                phash = dhash(f.read())
+            if phash is not None:
+                hash_index.record_use(phash, self.url)
+        except Exception as e:
+            logger.warning("이미지 해시 기록 실패: %s", e, extra={'url': self.url})
+
 class GenerateTab(QWidget):
     generation_requested = pyqtSignal(str, str, int)
     search_settings_changed = pyqtSignal(int, str)
 
     def __init__(self):
         super().__init__()
-        self.categories = {
-            "정치": 100, "경제": 101, "사회": 102,
-            "생활/문화": 103, "세계": 104, "IT/과학": 105
-        }
+        self.categories = dict(CATEGORIES)
         self.blog_data = None
         self.markdown_content = None
         self.local_image_paths = {}
         self.image_downloader = ImageDownloader()
         self.processing_thread = None
+        self.post_history = self._open_post_history()
+        self.history_panel = None
+        self.profile_text = None
+        self.current_post_id = None
+        self.thumbnail_loader = ThumbnailLoader(parent=self)
+        self.image_gallery = None
+        self._image_names = {}
+        self._swap_threads = set()
         self.setup_ui()
         self.connect_signals()
 
@@ -195,16 +292,23 @@ class GenerateTab(QWidget):
         
         self.result_tabs.addTab(self.preview_text, "📖 미리보기")
         self.result_tabs.addTab(self.json_text, "📄 JSON 원본")
+        self.image_gallery = ImageGallery(self.thumbnail_loader)
+        self.result_tabs.addTab(self.image_gallery, "🖼️ 이미지 선택")
+        if self.post_history:
+            self.history_panel = HistoryPanel(self.post_history)
+            self.result_tabs.addTab(self.history_panel, "🕘 기록")
         result_layout.addWidget(self.result_tabs)
 
         button_layout = QHBoxLayout()
         self.copy_text_button = QPushButton("📝 텍스트만 복사")
         self.copy_all_button = QPushButton("📋 이미지 복사")
         self.save_button = QPushButton("💾 HTML 저장")
+        self.export_button = QPushButton("📦 묶음 내보내기")
         button_layout.addStretch()
         button_layout.addWidget(self.copy_text_button)
         button_layout.addWidget(self.copy_all_button)
         button_layout.addWidget(self.save_button)
+        button_layout.addWidget(self.export_button)
         result_layout.addLayout(button_layout)
         
         main_layout.addWidget(self.result_widget, 1)
@@ -216,6 +320,17 @@ class GenerateTab(QWidget):
         self.copy_text_button.clicked.connect(self.copy_text_only)
         self.copy_all_button.clicked.connect(self.copy_with_images_to_clipboard)
         self.save_button.clicked.connect(self.save_to_html)
+        self.export_button.clicked.connect(self.export_bundle)
+        self.image_gallery.image_selected.connect(self.on_image_selected)
+        if self.history_panel:
+            self.history_panel.post_selected.connect(self.open_history_post)
+
+    def _open_post_history(self):
+        try:
+            return PostHistory()
+        except Exception as e:
+            logger.warning("생성 기록 저장소 열기 실패 (기록 없이 진행): %s", e)
+            return None
 
     def start_generation(self):
         self.generate_button.setEnabled(False)
@@ -231,22 +346,190 @@ class GenerateTab(QWidget):
 
     def on_generation_finished(self, blog_data):
         self.blog_data = blog_data
+        self.current_post_id = None
         self.json_text.setPlainText(json.dumps(self.blog_data, ensure_ascii=False, indent=2))
+        self.image_gallery.set_images(self.blog_data.get('images', {}))
         
         self.processing_thread = ImageProcessingThread(self.blog_data, self.image_downloader)
+        self.processing_thread.text_ready.connect(self.on_text_ready)
+        self.processing_thread.image_ready.connect(self.on_image_ready)
+        self.processing_thread.image_failed.connect(self.on_image_failed)
         self.processing_thread.finished.connect(self.on_image_processing_finished)
         self.processing_thread.error.connect(self.on_generation_error)
+        self.processing_thread.profile_ready.connect(self.on_profile_ready)
         self.processing_thread.start()
 
+    def on_text_ready(self, html_content, markdown_content):
+        self.markdown_content = markdown_content
+        self.preview_text.setHtml(html_content)
+        document = self.preview_text.document()
+        placeholder = self._create_image_placeholder()
+        self._image_names = {}
+        for marker_key in re.findall(rf'{PENDING_IMAGE_SCHEME}:(이미지_\d+)', html_content):
+            self._image_names[marker_key] = f"{PENDING_IMAGE_SCHEME}:{marker_key}"
+            document.addResource(QTextDocument.ResourceType.ImageResource,
+                                 QUrl(self._image_names[marker_key]), placeholder)
+        document.markContentsDirty(0, document.characterCount())
+
+    def _create_image_placeholder(self, text="이미지 불러오는 중...", color="#777777"):
+        image = QImage(640, 360, QImage.Format.Format_RGB32)
+        image.fill(QColor("#e6e6e6"))
+        painter = QPainter(image)
+        painter.setPen(QColor(color))
+        painter.setFont(QFont("Arial", 14))
+        painter.drawText(image.rect(), Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        return image
+
+    def _find_image(self, marker_key):
+        document = self.preview_text.document()
+        name = self._image_names.get(marker_key)
+        if not name:
+            return None, None
+        block = document.begin()
+        while block.isValid():
+            it = block.begin()
+            while not it.atEnd():
+                fragment = it.fragment()
+                char_format = fragment.charFormat()
+                if char_format.isImageFormat() and char_format.toImageFormat().name() == name:
+                    cursor = QTextCursor(document)
+                    cursor.setPosition(fragment.position())
+                    cursor.setPosition(fragment.position() + fragment.length(), QTextCursor.MoveMode.KeepAnchor)
+                    return cursor, char_format.toImageFormat()
+                it += 1
+            block = block.next()
+        return None, None
+
+    def _set_image_name(self, marker_key, name):
+        cursor, image_format = self._find_image(marker_key)
+        if cursor is None:
+            return False
+        image_format.setName(name)
+        cursor.setCharFormat(image_format)
+        self._image_names[marker_key] = name
+        return True
+
+    def on_image_ready(self, marker_key, local_path):
+        self._set_image_name(marker_key, self.image_downloader.get_file_url(local_path))
+
+    def on_image_failed(self, marker_key):
+        # 이미지 자리는 그대로 두고 실패 표시로만 바꿔 갤러리에서 다른 후보로 교체할 수 있게 함
+        name = f"{FAILED_IMAGE_SCHEME}:{marker_key}"
+        self.preview_text.document().addResource(
+            QTextDocument.ResourceType.ImageResource, QUrl(name),
+            self._create_image_placeholder("이미지를 불러올 수 없습니다", "red"))
+        self._set_image_name(marker_key, name)
+
+    def on_image_selected(self, marker_key, candidate):
+        if not self.blog_data or not candidate.get('url'):
+            return
+        if self.processing_thread and self.processing_thread.isRunning():
+            QMessageBox.information(self, "이미지 교체", "이미지 처리가 끝난 뒤 교체할 수 있습니다.")
+            return
+        url = candidate['url']
+        candidates = self.blog_data.get('images', {}).get(marker_key, [])
+        if candidates and candidates[0].get('url') == url:
+            return
+        # 선택한 후보를 맨 앞으로 옮겨 두면 복사·저장·기록이 모두 이 사진을 기준으로 동작
+        self.blog_data['images'][marker_key] = [candidate] + [c for c in candidates if c.get('url') != url]
+        self.json_text.setPlainText(json.dumps(self.blog_data, ensure_ascii=False, indent=2))
+
+        # 원본을 받는 동안 메모리에 있는 썸네일을 확대해 바로 보여줌
+        thumb_url = candidate.get('thumb_url') or url
+        pixmap = self.thumbnail_loader.cached(thumb_url)
+        if pixmap is not None:
+            self.preview_text.document().addResource(
+                QTextDocument.ResourceType.ImageResource, QUrl(thumb_url),
+                pixmap.scaledToWidth(640, Qt.TransformationMode.SmoothTransformation))
+            self._set_image_name(marker_key, thumb_url)
+
+        # 같은 자리를 연달아 바꿔도 앞선 스레드는 끝까지 살려 두고, 결과는 _is_current_image에서 걸러냄
+        swap_thread = ImageSwapThread(marker_key, url, self.image_downloader, parent=self)
+        swap_thread.image_ready.connect(self.on_swap_ready)
+        swap_thread.image_failed.connect(self.on_swap_failed)
+        swap_thread.finished.connect(lambda: self._on_swap_finished(swap_thread))
+        self._swap_threads.add(swap_thread)
+        swap_thread.start()
+
+    def _on_swap_finished(self, swap_thread):
+        self._swap_threads.discard(swap_thread)
+        swap_thread.deleteLater()
+
+    def wait_for_swaps(self):
+        # 내려받기에는 제한 시간이 있으므로 창을 닫을 때 끝날 때까지 기다려도 오래 걸리지 않음
+        for swap_thread in list(self._swap_threads):
+            swap_thread.wait()
+
+    def _is_current_image(self, marker_key, url):
+        candidates = self.blog_data.get('images', {}).get(marker_key, []) if self.blog_data else []
+        return bool(candidates) and candidates[0].get('url') == url
+
+    def on_swap_ready(self, marker_key, url, local_path):
+        if not self._is_current_image(marker_key, url):
+            return
+        self.local_image_paths[marker_key] = local_path
+        if not self._set_image_name(marker_key, self.image_downloader.get_file_url(local_path)):
+            logger.warning("미리보기에서 이미지 위치를 찾지 못했습니다.", extra={'marker': marker_key})
+        if self.post_history and self.current_post_id:
+            try:
+                self.post_history.update_images(self.current_post_id, self.blog_data,
+                                                self.preview_text.toHtml(), self.local_image_paths)
+            except Exception as e:
+                logger.warning("생성 기록 갱신 실패: %s", e, extra={'post_id': self.current_post_id})
+
+    def on_swap_failed(self, marker_key, url):
+        if self._is_current_image(marker_key, url):
+            QMessageBox.warning(self, "이미지 교체 실패", "선택한 이미지를 내려받지 못했습니다.")
+
     def on_image_processing_finished(self, html_content, markdown_content, image_paths):
         self.markdown_content = markdown_content
         self.local_image_paths = image_paths
-        self.preview_text.setHtml(html_content)
+        self._save_to_history(html_content)
         
         self.progress_bar.setVisible(False)
         self.generate_button.setEnabled(True)
         QMessageBox.information(self, "성공", "블로그 포스팅 생성이 완료되었습니다.")
 
+    def _save_to_history(self, html_content):
+        if not self.post_history:
+            return
+        timings = dict(self.blog_data.get('timings', {}))
+        if self.processing_thread:
+            timings['image_download'] = self.processing_thread.elapsed
+        try:
+            self.current_post_id = self.post_history.add_post(self.blog_data, self.markdown_content, html_content,
+                                                              self.local_image_paths, timings)
+            self.history_panel.refresh()
+        except Exception as e:
+            logger.warning("생성 기록 저장 실패: %s", e, extra={'title': self.blog_data.get('title', '')})
+
+    def open_history_post(self, post_id):
+        post = self.post_history.get_post(post_id)
+        if not post:
+            QMessageBox.warning(self, "열기 실패", "선택한 기록을 찾을 수 없습니다.")
+            return
+        self.blog_data = post['blog_data']
+        self.markdown_content = post['markdown']
+        self.local_image_paths = post['image_paths']
+        self.current_post_id = post_id
+        self._image_names = {key: self.image_downloader.get_file_url(path)
+                             for key, path in self.local_image_paths.items()}
+        self.json_text.setPlainText(json.dumps(self.blog_data, ensure_ascii=False, indent=2))
+        self.image_gallery.set_images(self.blog_data.get('images', {}))
+        self.preview_text.setHtml(post['html'])
+        self.result_tabs.setCurrentWidget(self.preview_text)
+
+    def on_profile_ready(self, summary):
+        if self.profile_text is None:
+            self.profile_text = QTextEdit()
+            self.profile_text.setReadOnly(True)
+            self.profile_text.setFont(QFont("Courier New", 10))
+            self.result_tabs.addTab(self.profile_text, "🔬 프로파일")
+        # 최근 실행이 위에 오도록 앞에 붙이고, 오래된 기록은 잘라서 문서가 계속 커지지 않게 함
+        previous = self.profile_text.toPlainText().split('\n\n\n')[:9]
+        self.profile_text.setPlainText('\n\n\n'.join([format_summary(summary, max_rows=8)] + previous).strip())
+
     def on_generation_error(self, error_msg):
         self.progress_bar.setVisible(False)
         self.generate_button.setEnabled(True)
@@ -318,4 +601,25 @@ class GenerateTab(QWidget):
                     f.write(html_content)
                 QMessageBox.information(self, "저장 완료", f"파일이 성공적으로 저장되었습니다:\n{file_path}")
             except Exception as e:
-                QMessageBox.critical(self, "저장 실패", f"파일 저장 중 오류가 발생했습니다:\n{str(e)}")
\ No newline at end of file
+                QMessageBox.critical(self, "저장 실패", f"파일 저장 중 오류가 발생했습니다:\n{str(e)}")
+
+    def export_bundle(self):
+        if not self.blog_data:
+            QMessageBox.warning(self, "내보내기 실패", "내보낼 콘텐츠가 없습니다.")
+            return
+        if self.processing_thread and self.processing_thread.isRunning():
+            QMessageBox.information(self, "내보내기", "이미지 처리가 끝난 뒤 내보낼 수 있습니다.")
+            return
+
+        linked_filter = "ZIP 묶음 - 이미지 파일 연결 (*.zip)"
+        inline_filter = "ZIP 묶음 - HTML에 이미지 포함 (*.zip)"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "묶음 내보내기", f"{post_slug(self.blog_data)}.zip", f"{linked_filter};;{inline_filter}")
+        if not file_path:
+            return
+        try:
+            with BundleExporter(file_path, 'zip', inline_images=selected_filter == inline_filter) as exporter:
+                exporter.add_post(self.blog_data, self.local_image_paths)
+            QMessageBox.information(self, "내보내기 완료", f"Markdown, HTML, 이미지를 묶어 저장했습니다:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "내보내기 실패", f"내보내는 중 오류가 발생했습니다:\n{str(e)}")
@@ -0,0 +1,137 @@
+import logging
+from datetime import datetime
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QListView,
+    QPushButton, QLabel, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+class PostHistoryModel(QAbstractListModel):
+    PAGE_SIZE = 50
+    PostIdRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, post_history, parent=None):
+        super().__init__(parent)
+        self.post_history = post_history
+        self.query = ''
+        self.rows = []
+        self.total = 0
+        self.reload()
+
+    def reload(self, query=None):
+        self.beginResetModel()
+        if query is not None:
+            self.query = query
+        self.rows = []
+        try:
+            self.total = self.post_history.count(self.query)
+        except Exception as e:
+            logger.warning("기록 조회 실패: %s", e, extra={'query': self.query})
+            self.total = 0
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return len(self.rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = self.post_history.list_page(len(self.rows), self.PAGE_SIZE, self.query)
+        if not page:
+            self.total = len(self.rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        row = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            created = datetime.fromtimestamp(row['created_at']).strftime("%Y-%m-%d %H:%M")
+            category = f"[{row['category']}] " if row['category'] else ''
+            return f"{created}  {category}{row['title']}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return row['title']
+        if role == self.PostIdRole:
+            return row['id']
+        return None
+
+class HistoryPanel(QWidget):
+    post_selected = pyqtSignal(int)
+
+    def __init__(self, post_history):
+        super().__init__()
+        self.post_history = post_history
+        self.model = PostHistoryModel(post_history, self)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.setup_ui()
+        self.connect_signals()
+        self.update_count_label()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 5, 0, 0)
+
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("제목 또는 본문 검색")
+        self.count_label = QLabel()
+        search_layout.addWidget(self.search_edit, 1)
+        search_layout.addWidget(self.count_label)
+        layout.addLayout(search_layout)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.list_view, 1)
+
+        button_layout = QHBoxLayout()
+        self.open_button = QPushButton("📂 열기")
+        self.refresh_button = QPushButton("🔄 새로고침")
+        button_layout.addStretch()
+        button_layout.addWidget(self.refresh_button)
+        button_layout.addWidget(self.open_button)
+        layout.addLayout(button_layout)
+
+    def connect_signals(self):
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.list_view.doubleClicked.connect(self.open_index)
+        self.open_button.clicked.connect(self.open_selected)
+        self.refresh_button.clicked.connect(self.refresh)
+
+    def apply_search(self):
+        self.model.reload(self.search_edit.text().strip())
+        self.update_count_label()
+
+    def refresh(self):
+        self.model.reload()
+        self.update_count_label()
+
+    def update_count_label(self):
+        self.count_label.setText(f"{self.model.total}건")
+
+    def open_selected(self):
+        indexes = self.list_view.selectionModel().selectedIndexes()
+        if indexes:
+            self.open_index(indexes[0])
+
+    def open_index(self, index):
+        post_id = self.model.data(index, PostHistoryModel.PostIdRole)
+        if post_id is not None:
+            self.post_selected.emit(post_id)
@@ -0,0 +1,127 @@
+import logging
+from collections import OrderedDict
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QListView, QScrollArea, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QObject, QSize, QUrl, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QPixmap
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+logger = logging.getLogger(__name__)
+
+THUMB_SIZE = QSize(160, 100)
+USER_AGENT = b'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+class ThumbnailLoader(QObject):
+    thumbnail_ready = pyqtSignal(str, QPixmap)
+
+    def __init__(self, max_items=300, timeout_ms=10000, parent=None):
+        super().__init__(parent)
+        self.max_items = max_items
+        self.timeout_ms = timeout_ms
+        self.manager = QNetworkAccessManager(self)
+        self._cache = OrderedDict()
+        self._pending = set()
+
+    def cached(self, url):
+        pixmap = self._cache.get(url)
+        if pixmap is not None:
+            self._cache.move_to_end(url)
+        return pixmap
+
+    def load(self, url):
+        if not url or url in self._pending:
+            return
+        pixmap = self.cached(url)
+        if pixmap is not None:
+            self.thumbnail_ready.emit(url, pixmap)
+            return
+        request = QNetworkRequest(QUrl(url))
+        request.setRawHeader(b'User-Agent', USER_AGENT)
+        request.setTransferTimeout(self.timeout_ms)
+        self._pending.add(url)
+        reply = self.manager.get(request)
+        reply.finished.connect(lambda: self._on_finished(url, reply))
+
+    def _on_finished(self, url, reply):
+        self._pending.discard(url)
+        reply.deleteLater()
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            logger.warning("썸네일 불러오기 실패: %s", reply.errorString(), extra={'url': url})
+            return
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(bytes(reply.readAll())):
+            logger.warning("썸네일 형식 오류", extra={'url': url})
+            return
+        self._cache[url] = pixmap
+        # 메모리에는 최근에 본 썸네일만 남기고 오래된 것부터 버림 (LRU)
+        while len(self._cache) > self.max_items:
+            self._cache.popitem(last=False)
+        self.thumbnail_ready.emit(url, pixmap)
+
+class ImageGallery(QScrollArea):
+    image_selected = pyqtSignal(str, object)
+
+    def __init__(self, thumbnail_loader, parent=None):
+        super().__init__(parent)
+        self.thumbnail_loader = thumbnail_loader
+        self._items_by_url = {}
+        self._placeholder = QPixmap(THUMB_SIZE)
+        self._placeholder.fill(QColor("#e6e6e6"))
+        self.setWidgetResizable(True)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.set_images({})
+
+    def set_images(self, images):
+        self._items_by_url = {}
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        for marker_key, candidates in images.items():
+            if not candidates:
+                continue
+            layout.addWidget(QLabel(f"{marker_key} — 후보 {len(candidates)}개 (클릭하면 교체)"))
+            layout.addWidget(self._create_strip(marker_key, candidates))
+        if not layout.count():
+            layout.addWidget(QLabel("이미지 후보가 없습니다."))
+        layout.addStretch()
+        self.setWidget(container)
+
+    def _create_strip(self, marker_key, candidates):
+        strip = QListWidget()
+        strip.setViewMode(QListView.ViewMode.IconMode)
+        strip.setFlow(QListView.Flow.LeftToRight)
+        strip.setWrapping(False)
+        strip.setMovement(QListView.Movement.Static)
+        strip.setIconSize(THUMB_SIZE)
+        strip.setSpacing(6)
+        strip.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        strip.setFixedHeight(THUMB_SIZE.height() + 60)
+        # 선택하면 원본 목록의 순서가 바뀌므로 갤러리는 처음 순서의 사본을 기준으로 동작
+        candidates = list(candidates)
+        for index, candidate in enumerate(candidates):
+            thumb_url = candidate.get('thumb_url') or candidate.get('url', '')
+            pixmap = self.thumbnail_loader.cached(thumb_url)
+            item = QListWidgetItem(QIcon(pixmap or self._placeholder), candidate.get('source', ''))
+            item.setData(Qt.ItemDataRole.UserRole, index)
+            item.setToolTip(self._tooltip(candidate))
+            strip.addItem(item)
+            self._items_by_url.setdefault(thumb_url, []).append(item)
+            if pixmap is None:
+                self.thumbnail_loader.load(thumb_url)
+        strip.setCurrentRow(0)
+        strip.itemClicked.connect(lambda item: self.image_selected.emit(
+            marker_key, candidates[item.data(Qt.ItemDataRole.UserRole)]))
+        return strip
+
+    @staticmethod
+    def _tooltip(candidate):
+        lines = [candidate.get('description') or '', f"{candidate.get('photographer', '')} / {candidate.get('source', '')}"]
+        if candidate.get('width') and candidate.get('height'):
+            lines.append(f"{candidate['width']}×{candidate['height']}")
+        if 'score' in candidate:
+            lines.append(f"점수: {candidate['score']}")
+        return '\n'.join(line for line in lines if line)
+
+    def on_thumbnail_ready(self, url, pixmap):
+        for item in self._items_by_url.get(url, []):
+            item.setIcon(QIcon(pixmap))
@@ -1,23 +1,47 @@
+import logging
 import os
+import time
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QTabWidget, QMessageBox
 )
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QIcon
 from .generate_tab import GenerateTab
 from .settings_tab import SettingsTab
 from utils import SettingsManager
-from workers import Worker
+from utils.news_archive import NewsArchive
+from utils.naver_news import build_search_query
+from utils.credential_pool import naver_pool_from_settings, gemini_pool_from_settings
+from utils.story_index import open_story_index
+from utils import profiler
+from workers import Worker, NewsPrefetcher, SpeculativeFetcher
+
+logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.settings_manager = SettingsManager()
+        profiler.apply_setting(self.settings_manager.get_setting('profiling_enabled', False))
+        self.news_archive = self._open_news_archive()
+        self.story_index = open_story_index()
+        self.rebuild_credential_pools()
         self.worker = None
+        self.news_prefetcher = None
+        self.stopping_prefetchers = []
+        self.speculative_fetcher = None
+        self.speculative_fetchers = []
+        self.prepared_generation = None
+        self.speculative_timer = QTimer(self)
+        self.speculative_timer.setSingleShot(True)
+        self.speculative_timer.setInterval(800)
         self.setup_ui()
         self.set_app_icon()
         self.load_previous_settings()
         self.connect_signals()
         self.check_api_keys_on_startup()
+        self.restart_news_prefetcher()
+        self.schedule_speculative_fetch()
 
     def setup_ui(self):
         self.setWindowTitle('Blog Generator')
@@ -35,6 +59,18 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.settings_tab, "설정")
         layout.addWidget(self.tabs)
 
+    def _open_news_archive(self):
+        try:
+            return NewsArchive()
+        except Exception as e:
+            logger.warning("뉴스 아카이브 열기 실패 (아카이브 없이 진행): %s", e)
+            return None
+
+    def rebuild_credential_pools(self):
+        api_settings = self.settings_manager.get_api_settings()
+        self.naver_pool = naver_pool_from_settings(api_settings)
+        self.gemini_pool = gemini_pool_from_settings(api_settings)
+
     def set_app_icon(self):
         icon_path = 'icon/app_icon.svg'
         if os.path.exists(icon_path):
@@ -42,18 +78,62 @@ class MainWindow(QMainWindow):
 
     def load_previous_settings(self):
         try:
-            api_settings = self.settings_manager.get_api_settings()
-            self.settings_tab.set_form_data(api_settings)
+            self.settings_tab.set_form_data(self._get_settings_form_data())
             
             search_settings = self.settings_manager.get_last_search_settings()
             self.generate_tab.category_dropdown.setCurrentIndex(search_settings.get('category_index', 0))
             self.generate_tab.topic_edit.setText(search_settings.get('keyword', ''))
         except Exception as e:
-            print(f"이전 설정 로드 실패: {e}")
+            logger.warning("이전 설정 로드 실패: %s", e)
+
+    def _get_settings_form_data(self):
+        return {**self.settings_manager.get_api_settings(), **self.settings_manager.get_prefetch_settings(),
+                **self.settings_manager.get_news_source_settings(), **self.settings_manager.get_generation_settings(),
+                **self.settings_manager.get_debug_settings()}
+
+    def restart_news_prefetcher(self):
+        self.stop_news_prefetcher()
+        prefetch_settings = self.settings_manager.get_prefetch_settings()
+        api_settings = self.settings_manager.get_api_settings()
+        if not prefetch_settings['prefetch_enabled'] or not self.news_archive:
+            return
+        if not api_settings.get('naver_client_id') or not api_settings.get('naver_client_secret'):
+            return
+        self.news_prefetcher = NewsPrefetcher(
+            api_settings['naver_client_id'], api_settings['naver_client_secret'],
+            self.news_archive, self.generate_tab.categories,
+            recent_keywords=self.settings_manager.get_setting('recent_keywords', []),
+            interval_seconds=prefetch_settings['prefetch_interval_minutes'] * 60,
+            daily_quota=prefetch_settings['prefetch_daily_quota'],
+            max_age=self.settings_manager.get_setting('news_cache_max_age', 600),
+            credential_pool=self.naver_pool
+        )
+        self.news_prefetcher.start()
+
+    def stop_news_prefetcher(self):
+        # 네트워크 호출 중이면 바로 멈추지 않으므로 끝날 때까지 참조를 유지하고 UI는 기다리지 않음
+        prefetcher = self.news_prefetcher
+        self.news_prefetcher = None
+        if not prefetcher:
+            return
+        prefetcher.stop()
+        self.stopping_prefetchers.append(prefetcher)
+        # finished를 먼저 연결한 뒤 상태를 확인해야 그 사이에 끝난 스레드도 놓치지 않음
+        prefetcher.finished.connect(lambda: self._release_news_prefetcher(prefetcher))
+        if not prefetcher.isRunning():
+            self._release_news_prefetcher(prefetcher)
+
+    def _release_news_prefetcher(self, prefetcher):
+        if prefetcher not in self.stopping_prefetchers:
+            return
+        self.stopping_prefetchers.remove(prefetcher)
+        prefetcher.deleteLater()
 
     def connect_signals(self):
         self.generate_tab.generation_requested.connect(self.handle_generation_request)
         self.generate_tab.search_settings_changed.connect(self.save_search_settings)
+        self.generate_tab.search_settings_changed.connect(self.schedule_speculative_fetch)
+        self.speculative_timer.timeout.connect(self.start_speculative_fetch)
         self.settings_tab.settings_saved.connect(self.handle_settings_save)
         self.settings_tab.settings_cancelled.connect(self.handle_settings_cancel)
 
@@ -72,6 +152,64 @@ class MainWindow(QMainWindow):
                 "설정 탭에서 모든 필수 API 키를 입력하고 저장해주세요."
             )
 
+    def schedule_speculative_fetch(self, *args):
+        self.cancel_speculative_fetch()
+        if self.settings_manager.get_setting('speculative_prefetch_enabled', True):
+            self.speculative_timer.start()
+
+    def cancel_speculative_fetch(self):
+        self.speculative_timer.stop()
+        if self.speculative_fetcher:
+            self.speculative_fetcher.cancel()
+            self.speculative_fetcher = None
+
+    def start_speculative_fetch(self):
+        api_settings = self.settings_manager.get_api_settings()
+        if not api_settings.get('naver_client_id') or not api_settings.get('naver_client_secret'):
+            return
+        if self.worker and self.worker.isRunning():
+            return
+        form_data = self.generate_tab.get_form_data()
+        query = build_search_query(form_data['topic'], form_data['category_name'], form_data['category_id'])
+        if self.prepared_generation and self.prepared_generation['query'] == query \
+                and self._is_prepared_fresh(self.prepared_generation):
+            return
+        fetcher = SpeculativeFetcher(
+            api_settings['naver_client_id'], api_settings['naver_client_secret'],
+            form_data['topic'], form_data['category_id'], form_data['category_name'],
+            news_archive=self.news_archive,
+            news_cache_max_age=self.settings_manager.get_setting('news_cache_max_age', 0),
+            credential_pool=self.naver_pool,
+            story_index=self.story_index,
+            settings_manager=self.settings_manager
+        )
+        fetcher.prepared.connect(self.on_speculative_prepared)
+        fetcher.finished.connect(lambda: self._release_speculative_fetcher(fetcher))
+        self.speculative_fetchers.append(fetcher)
+        self.speculative_fetcher = fetcher
+        fetcher.start()
+
+    def _release_speculative_fetcher(self, fetcher):
+        if fetcher in self.speculative_fetchers:
+            self.speculative_fetchers.remove(fetcher)
+        if self.speculative_fetcher is fetcher:
+            self.speculative_fetcher = None
+
+    def on_speculative_prepared(self, prepared):
+        if self.sender() is self.speculative_fetcher and not self.speculative_fetcher.is_cancelled():
+            self.prepared_generation = prepared
+
+    def _is_prepared_fresh(self, prepared):
+        max_age = self.settings_manager.get_setting('news_cache_max_age', 0)
+        return time.time() - prepared['prepared_at'] <= max_age
+
+    def _take_prepared_generation(self, query):
+        prepared = self.prepared_generation
+        self.prepared_generation = None
+        if prepared and prepared['query'] == query and self._is_prepared_fresh(prepared):
+            return prepared
+        return None
+
     def handle_generation_request(self, category_name, topic, category_id):
         api_settings = self.settings_manager.get_api_settings()
         missing_keys = [key for key in ['naver_client_id', 'naver_client_secret', 'google_api_key'] if not api_settings.get(key)]
@@ -82,21 +220,39 @@ class MainWindow(QMainWindow):
             self.generate_tab.on_generation_error("API 키가 설정되지 않았습니다.")
             return
 
+        if topic:
+            self.settings_manager.add_recent_keyword(topic)
+            if self.news_prefetcher:
+                self.news_prefetcher.set_recent_keywords(self.settings_manager.get_setting('recent_keywords', []))
+
+        self.cancel_speculative_fetch()
+        prepared = self._take_prepared_generation(build_search_query(topic, category_name, category_id))
+
         self.worker = Worker(
             api_settings['naver_client_id'], api_settings['naver_client_secret'], api_settings['google_api_key'],
-            topic, category_id, category_name
+            topic, category_id, category_name,
+            news_archive=self.news_archive,
+            news_cache_max_age=self.settings_manager.get_setting('news_cache_max_age', 0),
+            prepared=prepared,
+            naver_pool=self.naver_pool,
+            gemini_pool=self.gemini_pool,
+            settings_manager=self.settings_manager,
+            story_index=self.story_index
         )
         self.worker.finished.connect(self.generate_tab.on_generation_finished)
+        self.worker.profile_ready.connect(self.generate_tab.on_profile_ready)
         self.worker.error.connect(self.generate_tab.on_generation_error)
         self.worker.start()
 
     def handle_settings_save(self, settings_data):
         self.settings_manager.set_api_settings(settings_data)
+        profiler.apply_setting(self.settings_manager.get_setting('profiling_enabled', False))
+        self.rebuild_credential_pools()
+        self.restart_news_prefetcher()
         QMessageBox.information(self, "저장 완료", "API 키 설정이 저장되었습니다.")
 
     def handle_settings_cancel(self):
-        api_settings = self.settings_manager.get_api_settings()
-        self.settings_tab.set_form_data(api_settings)
+        self.settings_tab.set_form_data(self._get_settings_form_data())
 
     def save_search_settings(self, category_index, keyword):
         self.settings_manager.set_last_search_settings(category_index, keyword)
@@ -109,5 +265,16 @@ class MainWindow(QMainWindow):
         if self.worker and self.worker.isRunning():
             self.worker.terminate()
             self.worker.wait(1000)
-            
+
+        self.generate_tab.wait_for_swaps()
+        self.stop_news_prefetcher()
+        self.cancel_speculative_fetch()
+        # 아카이브에 쓰는 스레드가 모두 끝난 뒤에 닫음
+        for thread in list(self.stopping_prefetchers) + list(self.speculative_fetchers):
+            thread.wait()
+        if self.news_archive:
+            self.news_archive.close()
+        if self.story_index:
+            self.story_index.close()
+
         event.accept()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit,
-    QPushButton, QLabel, QGroupBox, QMessageBox
+    QPushButton, QLabel, QGroupBox, QMessageBox, QCheckBox, QSpinBox, QPlainTextEdit, QComboBox
 )
 from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtGui import QFont, QDesktopServices
@@ -32,6 +32,10 @@ class SettingsTab(QWidget):
         self.naver_client_secret_edit.setPlaceholderText("네이버 Developer Console에서 발급받은 Client Secret")
         news_layout.addRow("Naver Client ID:", self.naver_client_id_edit)
         news_layout.addRow("Naver Client Secret:", self.naver_client_secret_edit)
+        self.naver_extra_edit = QPlainTextEdit()
+        self.naver_extra_edit.setPlaceholderText("추가 키 (선택사항, 한 줄에 하나씩 ClientID:ClientSecret)")
+        self.naver_extra_edit.setMaximumHeight(60)
+        news_layout.addRow("추가 Naver 키:", self.naver_extra_edit)
         
         naver_url = "https://developers.naver.com/apps/"
         naver_info_label = QLabel(f'네이버 뉴스 검색을 위해 필요합니다<br>발급: <a href="{naver_url}">{naver_url}</a>')
@@ -48,6 +52,34 @@ class SettingsTab(QWidget):
         self.google_api_key_edit.setEchoMode(QLineEdit.EchoMode.Password)
         self.google_api_key_edit.setPlaceholderText("Google AI Studio에서 발급받은 API Key")
         ai_layout.addRow("Google API Key:", self.google_api_key_edit)
+        self.google_extra_edit = QPlainTextEdit()
+        self.google_extra_edit.setPlaceholderText("추가 키 (선택사항, 한 줄에 하나씩)")
+        self.google_extra_edit.setMaximumHeight(60)
+        ai_layout.addRow("추가 Google 키:", self.google_extra_edit)
+        self.model_tiers_edit = QLineEdit()
+        self.model_tiers_edit.setPlaceholderText("gemini-2.5-flash, gemini-2.5-flash-lite")
+        ai_layout.addRow("모델 단계:", self.model_tiers_edit)
+        self.latency_budget_spin = QSpinBox()
+        self.latency_budget_spin.setRange(10, 600)
+        self.latency_budget_spin.setSuffix(" 초")
+        ai_layout.addRow("생성 시간 한도:", self.latency_budget_spin)
+        self.run_deadline_spin = QSpinBox()
+        self.run_deadline_spin.setRange(0, 900)
+        self.run_deadline_spin.setSuffix(" 초")
+        self.run_deadline_spin.setSpecialValueText("제한 없음")
+        self.run_deadline_spin.setToolTip("뉴스 검색부터 이미지 다운로드까지 한 번의 실행에 쓸 전체 시간. "
+                                          "시간이 모자라면 이미지 단계를 줄이거나 건너뜁니다.")
+        ai_layout.addRow("전체 마감 시간:", self.run_deadline_spin)
+        self.hedge_check = QCheckBox("응답이 늦으면 다음 단계 모델을 동시에 호출하기")
+        ai_layout.addRow(self.hedge_check)
+        self.candidates_spin = QSpinBox()
+        self.candidates_spin.setRange(1, 5)
+        self.candidates_spin.setSuffix(" 개")
+        ai_layout.addRow("동시 생성 후보:", self.candidates_spin)
+        self.candidate_mode_combo = QComboBox()
+        self.candidate_mode_combo.addItem("상위 뉴스 여러 개", 'stories')
+        self.candidate_mode_combo.addItem("같은 뉴스 여러 버전", 'variations')
+        ai_layout.addRow("후보 방식:", self.candidate_mode_combo)
         
         ai_url = "https://aistudio.google.com/app/apikey"
         ai_info_label = QLabel(f'AI 블로그 생성을 위해 필요합니다<br>발급: <a href="{ai_url}">{ai_url}</a>')
@@ -83,6 +115,59 @@ class SettingsTab(QWidget):
         image_group.setLayout(image_layout)
         layout.addWidget(image_group)
 
+        prefetch_group = QGroupBox("백그라운드 뉴스 미리 가져오기 (선택사항)")
+        prefetch_layout = QFormLayout()
+        self.prefetch_enabled_check = QCheckBox("카테고리별 뉴스를 주기적으로 미리 가져오기")
+        self.prefetch_interval_spin = QSpinBox()
+        self.prefetch_interval_spin.setRange(1, 120)
+        self.prefetch_interval_spin.setSuffix(" 분")
+        self.prefetch_quota_spin = QSpinBox()
+        self.prefetch_quota_spin.setRange(0, 25000)
+        self.prefetch_quota_spin.setSingleStep(100)
+        self.prefetch_quota_spin.setSuffix(" 회/일")
+        self.speculative_prefetch_check = QCheckBox("카테고리/키워드 변경 시 뉴스와 프롬프트를 미리 준비하기")
+        prefetch_layout.addRow(self.prefetch_enabled_check)
+        prefetch_layout.addRow(self.speculative_prefetch_check)
+        prefetch_layout.addRow("갱신 주기:", self.prefetch_interval_spin)
+        prefetch_layout.addRow("일일 호출 한도:", self.prefetch_quota_spin)
+
+        prefetch_info_label = QLabel('생성 시작 시 검색 단계를 건너뛸 수 있도록 최근 뉴스를 로컬에 미리 저장합니다')
+        prefetch_info_label.setFont(QFont("Arial", 9))
+        prefetch_layout.addRow(prefetch_info_label)
+
+        prefetch_group.setLayout(prefetch_layout)
+        layout.addWidget(prefetch_group)
+
+        sources_group = QGroupBox("추가 뉴스 소스 (선택사항)")
+        sources_layout = QFormLayout()
+        self.news_feeds_edit = QPlainTextEdit()
+        self.news_feeds_edit.setPlaceholderText("RSS/Atom 피드 주소 (한 줄에 하나씩)")
+        self.news_feeds_edit.setMaximumHeight(60)
+        self.news_jsonl_edit = QPlainTextEdit()
+        self.news_jsonl_edit.setPlaceholderText("로컬 JSONL 뉴스 파일 경로 (한 줄에 하나씩)")
+        self.news_jsonl_edit.setMaximumHeight(60)
+        self.news_deadline_spin = QSpinBox()
+        self.news_deadline_spin.setRange(1, 60)
+        self.news_deadline_spin.setSuffix(" 초")
+        sources_layout.addRow("피드:", self.news_feeds_edit)
+        sources_layout.addRow("JSONL 파일:", self.news_jsonl_edit)
+        sources_layout.addRow("소스별 제한 시간:", self.news_deadline_spin)
+        sources_info_label = QLabel('네이버 검색과 동시에 조회해 결과를 합치며, 제한 시간 안에 응답하지 않은 소스는 건너뜁니다')
+        sources_info_label.setFont(QFont("Arial", 9))
+        sources_layout.addRow(sources_info_label)
+        sources_group.setLayout(sources_layout)
+        layout.addWidget(sources_group)
+
+        debug_group = QGroupBox("디버그")
+        debug_layout = QFormLayout()
+        self.profiling_check = QCheckBox("생성 실행마다 CPU·메모리 프로파일 기록")
+        debug_layout.addRow(self.profiling_check)
+        debug_info_label = QLabel('~/.blog_generator/profiles 폴더에 실행별 보고서를 저장하고 생성 탭에 요약을 표시합니다')
+        debug_info_label.setFont(QFont("Arial", 9))
+        debug_layout.addRow(debug_info_label)
+        debug_group.setLayout(debug_layout)
+        layout.addWidget(debug_group)
+
         button_layout = QHBoxLayout()
         save_button = QPushButton("설정 저장")
         save_button.clicked.connect(self.save_settings)
@@ -100,18 +185,62 @@ class SettingsTab(QWidget):
         self.naver_client_id_edit.setText(settings_data.get('naver_client_id', ''))
         self.naver_client_secret_edit.setText(settings_data.get('naver_client_secret', ''))
         self.google_api_key_edit.setText(settings_data.get('google_api_key', ''))
+        self.naver_extra_edit.setPlainText('\n'.join(
+            f"{c.get('client_id', '')}:{c.get('client_secret', '')}"
+            for c in settings_data.get('naver_extra_credentials', [])
+        ))
+        self.google_extra_edit.setPlainText('\n'.join(settings_data.get('google_extra_api_keys', [])))
         self.unsplash_key_edit.setText(settings_data.get('unsplash_access_key', ''))
         self.pixabay_key_edit.setText(settings_data.get('pixabay_api_key', ''))
+        self.prefetch_enabled_check.setChecked(bool(settings_data.get('prefetch_enabled', False)))
+        self.prefetch_interval_spin.setValue(int(settings_data.get('prefetch_interval_minutes', 5)))
+        self.prefetch_quota_spin.setValue(int(settings_data.get('prefetch_daily_quota', 1000)))
+        self.speculative_prefetch_check.setChecked(bool(settings_data.get('speculative_prefetch_enabled', True)))
+        self.news_feeds_edit.setPlainText('\n'.join(settings_data.get('news_feeds', [])))
+        self.news_jsonl_edit.setPlainText('\n'.join(settings_data.get('news_jsonl_paths', [])))
+        self.news_deadline_spin.setValue(int(settings_data.get('news_source_deadline', 15)))
+        self.model_tiers_edit.setText(', '.join(settings_data.get('gemini_model_tiers', [])))
+        self.latency_budget_spin.setValue(int(settings_data.get('generation_latency_budget', 120)))
+        self.run_deadline_spin.setValue(int(settings_data.get('generation_deadline', 180)))
+        self.hedge_check.setChecked(bool(settings_data.get('generation_hedge_enabled', True)))
+        self.candidates_spin.setValue(int(settings_data.get('generation_candidates', 1)))
+        mode_index = self.candidate_mode_combo.findData(settings_data.get('candidate_mode', 'stories'))
+        self.candidate_mode_combo.setCurrentIndex(max(0, mode_index))
+        self.profiling_check.setChecked(bool(settings_data.get('profiling_enabled', False)))
 
     def get_form_data(self):
         return {
             'naver_client_id': self.naver_client_id_edit.text().strip(),
             'naver_client_secret': self.naver_client_secret_edit.text().strip(),
             'google_api_key': self.google_api_key_edit.text().strip(),
+            'naver_extra_credentials': self._parse_naver_extra_credentials(),
+            'google_extra_api_keys': [line.strip() for line in self.google_extra_edit.toPlainText().splitlines() if line.strip()],
             'unsplash_access_key': self.unsplash_key_edit.text().strip(),
-            'pixabay_api_key': self.pixabay_key_edit.text().strip()
+            'pixabay_api_key': self.pixabay_key_edit.text().strip(),
+            'prefetch_enabled': self.prefetch_enabled_check.isChecked(),
+            'prefetch_interval_minutes': self.prefetch_interval_spin.value(),
+            'prefetch_daily_quota': self.prefetch_quota_spin.value(),
+            'speculative_prefetch_enabled': self.speculative_prefetch_check.isChecked(),
+            'news_feeds': [line.strip() for line in self.news_feeds_edit.toPlainText().splitlines() if line.strip()],
+            'news_jsonl_paths': [line.strip() for line in self.news_jsonl_edit.toPlainText().splitlines() if line.strip()],
+            'news_source_deadline': self.news_deadline_spin.value(),
+            'gemini_model_tiers': [name.strip() for name in self.model_tiers_edit.text().split(',') if name.strip()],
+            'generation_latency_budget': self.latency_budget_spin.value(),
+            'generation_deadline': self.run_deadline_spin.value(),
+            'generation_hedge_enabled': self.hedge_check.isChecked(),
+            'generation_candidates': self.candidates_spin.value(),
+            'candidate_mode': self.candidate_mode_combo.currentData(),
+            'profiling_enabled': self.profiling_check.isChecked()
         }
 
+    def _parse_naver_extra_credentials(self):
+        credentials = []
+        for line in self.naver_extra_edit.toPlainText().splitlines():
+            client_id, _, client_secret = line.strip().partition(':')
+            if client_id.strip() and client_secret.strip():
+                credentials.append({'client_id': client_id.strip(), 'client_secret': client_secret.strip()})
+        return credentials
+
     def save_settings(self):
         settings_data = self.get_form_data()
         required_keys = ['naver_client_id', 'naver_client_secret', 'google_api_key']
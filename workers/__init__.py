@@ -1,3 +1,7 @@
 from .worker import Worker
+from .pipeline import GenerationPipeline, PipelineError
+from .news_prefetcher import NewsPrefetcher
+from .speculative_fetcher import SpeculativeFetcher
+from .job_queue import DurableJobQueue, JobQueueRunner
 
-__all__ = ['Worker']
\ No newline at end of file
+__all__ = ['Worker', 'GenerationPipeline', 'PipelineError', 'NewsPrefetcher', 'SpeculativeFetcher', 'DurableJobQueue', 'JobQueueRunner']
\ No newline at end of file
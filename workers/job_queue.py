@@ -0,0 +1,424 @@
+import logging
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from utils.naver_news import CATEGORIES
+from utils.credential_pool import CredentialsExhaustedError, naver_pool_from_settings, gemini_pool_from_settings
+from utils.profiler import RunProfiler
+from utils.metrics import JOBS, RETRIES
+from .pipeline import GenerationPipeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.expanduser("~"), ".blog_generator", "job_queue.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    stage TEXT NOT NULL DEFAULT '',
+    checkpoints TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker_id TEXT,
+    lease_expires REAL NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, not_before, lease_expires);
+"""
+
+class DurableJobQueue:
+    def __init__(self, db_path: str = DEFAULT_QUEUE_PATH, lease_seconds: float = 300):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # 여러 프로세스가 같은 큐를 공유하므로 스레드마다 별도 연결과 명시적 트랜잭션 사용
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, params: Dict[str, Any], max_attempts: int = 3) -> int:
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO jobs (params, max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (json.dumps(params, ensure_ascii=False), max_attempts, now, now)
+        )
+        return cursor.lastrowid
+
+    def enqueue_many(self, params_list: Iterable[Dict[str, Any]], max_attempts: int = 3) -> List[int]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job_ids = [self.enqueue(params, max_attempts) for params in params_list]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return job_ids
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 시도 횟수를 다 쓴 채 임대가 만료된 작업은 다시 가져가지 않고 실패로 마감
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, worker_id = NULL, lease_expires = 0, updated_at = ? "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                ('임대 만료 후 재시도 횟수 초과', now, now)
+            )
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE (status = 'queued' AND not_before <= ?) "
+                "OR (status = 'running' AND lease_expires < ? AND attempts < max_attempts) ORDER BY id LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if not row:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row[0])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row[0])
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT id, params, status, stage, checkpoints, result, error, attempts, max_attempts, worker_id "
+            "FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            'id': row[0],
+            'params': json.loads(row[1]),
+            'status': row[2],
+            'stage': row[3],
+            'checkpoints': json.loads(row[4]),
+            'result': json.loads(row[5]) if row[5] else None,
+            'error': row[6],
+            'attempts': row[7],
+            'max_attempts': row[8],
+            'worker_id': row[9]
+        }
+
+    def _update_owned(self, job_id: int, worker_id: str, assignments: str, params: tuple) -> bool:
+        cursor = self._conn().execute(
+            f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND worker_id = ? AND status = 'running'",
+            params + (time.time(), job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def renew_lease(self, job_id: int, worker_id: str) -> bool:
+        return self._update_owned(job_id, worker_id, "lease_expires = ?", (time.time() + self.lease_seconds,))
+
+    def save_checkpoint(self, job_id: int, worker_id: str, stage: str, checkpoints: Dict[str, Any]) -> bool:
+        return self._update_owned(job_id, worker_id, "stage = ?, checkpoints = ?, lease_expires = ?",
+                                  (stage, json.dumps(checkpoints, ensure_ascii=False), time.time() + self.lease_seconds))
+
+    def complete(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        return self._update_owned(job_id, worker_id, "status = 'succeeded', result = ?, error = NULL, lease_expires = 0",
+                                  (json.dumps(result, ensure_ascii=False),))
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry_after: float = 0,
+             count_attempt: bool = True) -> bool:
+        job = self.get(job_id)
+        if not count_attempt:
+            return self._update_owned(job_id, worker_id,
+                                      "status = 'queued', error = ?, worker_id = NULL, lease_expires = 0, "
+                                      "not_before = ?, attempts = attempts - 1",
+                                      (error, time.time() + retry_after))
+        if job and job['attempts'] < job['max_attempts']:
+            return self._update_owned(job_id, worker_id,
+                                      "status = 'queued', error = ?, worker_id = NULL, lease_expires = 0, not_before = ?",
+                                      (error, time.time() + retry_after))
+        return self._update_owned(job_id, worker_id, "status = 'failed', error = ?, lease_expires = 0", (error,))
+
+    def requeue_failed(self) -> int:
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = 'queued', attempts = 0, worker_id = NULL, updated_at = ? WHERE status = 'failed'",
+            (time.time(),)
+        )
+        return cursor.rowcount
+
+    def next_queued_at(self) -> Optional[float]:
+        row = self._conn().execute("SELECT MIN(not_before) FROM jobs WHERE status = 'queued'").fetchone()
+        return row[0] if row else None
+
+    def succeeded_ids(self) -> List[int]:
+        return [row[0] for row in self._conn().execute("SELECT id FROM jobs WHERE status = 'succeeded' ORDER BY id")]
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+class LeaseLostError(Exception):
+    pass
+
+class LeaseHeartbeat:
+    # 작업이 도는 동안 임대를 주기적으로 연장해 긴 Gemini 호출이나 배치 중에 다른 워커가 가져가지 않게 함
+    def __init__(self, job_queue: DurableJobQueue, worker_id: str, job_ids: Iterable[int]):
+        self.job_queue = job_queue
+        self.worker_id = worker_id
+        self.job_ids = set(job_ids)
+        self.lost = set()
+        self.interval = max(1.0, job_queue.lease_seconds / 3)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{worker_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                job_ids = self.job_ids - self.lost
+            for job_id in job_ids:
+                if not self.job_queue.renew_lease(job_id, self.worker_id):
+                    self.mark_lost(job_id)
+
+    def mark_lost(self, job_id: int):
+        with self._lock:
+            if job_id in self.lost:
+                return
+            self.lost.add(job_id)
+        logger.warning("작업 임대를 잃었습니다. 결과를 버립니다.", extra={'job_id': job_id, 'worker_id': self.worker_id})
+
+    def release(self, job_id: int):
+        with self._lock:
+            self.job_ids.discard(job_id)
+
+    def check(self, job_id: int):
+        with self._lock:
+            lost = job_id in self.lost
+        if lost:
+            raise LeaseLostError(f"작업 {job_id}의 임대를 다른 워커가 가져갔습니다.")
+
+class JobQueueRunner:
+    def __init__(self, job_queue: DurableJobQueue, settings_manager, news_archive=None, worker_id=None,
+                 download_images=True, story_index=None, batch_size=1):
+        self.job_queue = job_queue
+        self.settings_manager = settings_manager
+        self.news_archive = news_archive
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.download_images = download_images
+        self.story_index = story_index
+        self.batch_size = max(1, batch_size)
+        api_settings = settings_manager.get_api_settings()
+        self.naver_pool = naver_pool_from_settings(api_settings)
+        self.gemini_pool = gemini_pool_from_settings(api_settings)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self, threads: int = 1, stop_when_empty: bool = True):
+        workers = [threading.Thread(target=self._loop, args=(f"{self.worker_id}#{i}", stop_when_empty), daemon=True)
+                   for i in range(max(1, threads))]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def _loop(self, worker_id: str, stop_when_empty: bool):
+        while not self._stop_event.is_set():
+            jobs = []
+            while len(jobs) < self.batch_size:
+                job = self.job_queue.claim(worker_id)
+                if not job:
+                    break
+                jobs.append(job)
+            if not jobs:
+                if stop_when_empty:
+                    # 재시도 대기 중인 작업이 남아 있으면 가장 이른 재시도 시각까지 기다렸다가 이어서 처리
+                    next_at = self.job_queue.next_queued_at()
+                    if next_at is None:
+                        return
+                    delay = max(0.0, next_at - time.time())
+                    logger.info("재시도 대기 중인 작업이 있어 %.0f초 기다립니다.", delay, extra={'worker_id': worker_id})
+                    self._stop_event.wait(delay + 0.1)
+                    continue
+                self._stop_event.wait(5)
+                continue
+            with LeaseHeartbeat(self.job_queue, worker_id, [job['id'] for job in jobs]) as heartbeat:
+                if len(jobs) == 1:
+                    self._run_job(jobs[0], worker_id, heartbeat)
+                else:
+                    self._run_batch(jobs, worker_id, heartbeat)
+
+    def _run_batch(self, jobs: List[Dict[str, Any]], worker_id: str, heartbeat: LeaseHeartbeat):
+        pipelines = {}
+        for job in jobs:
+            try:
+                pipeline = self._create_pipeline(job, worker_id, heartbeat)
+                pipeline.prepare_news()
+            except Exception as e:
+                self._handle_failure(job, worker_id, e)
+                heartbeat.release(job['id'])
+                continue
+            pipelines[job['id']] = (job, pipeline)
+
+        batch = [(job, pipeline) for job, pipeline in pipelines.values()
+                 if pipeline.needs_blog() and len(pipeline.checkpoints['news'].get('candidates', [])) <= 1]
+        batch_budget = self._batch_budget(batch) if len(batch) > 1 else None
+        if batch_budget:
+            started = time.perf_counter()
+            try:
+                results = batch[0][1]._get_blog_generator().generate_batch(
+                    [pipeline.checkpoints['news'] for _, pipeline in batch], batch_budget)
+            except Exception as e:
+                # 배치 요청이 실패하면 각 작업이 아래에서 단건 생성으로 이어서 처리됨
+                RETRIES.inc(operation='batch_generate', reason='single_fallback')
+                logger.warning("배치 생성 실패, 단건 생성으로 진행: %s", e, extra={'batch_size': len(batch)})
+                results = [None] * len(batch)
+            elapsed = time.perf_counter() - started
+            for (job, pipeline), blog_data in zip(batch, results):
+                if blog_data and job['id'] not in heartbeat.lost:
+                    try:
+                        pipeline.accept_blog(blog_data, elapsed, batch_size=len(batch))
+                    except LeaseLostError:
+                        # 임대를 잃은 작업은 아래 _finish_job에서 결과 없이 정리됨
+                        pass
+            logger.info("배치 생성 완료: %d/%d개 (%.1f초)", sum(1 for r in results if r), len(batch), elapsed,
+                        extra={'batch_size': len(batch), 'elapsed': round(elapsed, 3)})
+
+        with ThreadPoolExecutor(max_workers=len(pipelines) or 1) as executor:
+            for job, pipeline in pipelines.values():
+                executor.submit(self._finish_job, job, worker_id, pipeline, heartbeat)
+
+    def _batch_budget(self, batch) -> Optional[float]:
+        # 배치 요청은 묶인 작업 중 마감이 가장 가까운 작업과 작업 임대 시간을 넘지 않게 자름
+        blog_generator = batch[0][1]._get_blog_generator()
+        budget = min(blog_generator.latency_budget * len(batch), self.job_queue.lease_seconds)
+        for _, pipeline in batch:
+            limit = pipeline._get_run_deadline().limit('blog')
+            if limit is not None:
+                budget = min(budget, limit)
+        # 글 한 편 분량의 시간도 남지 않았으면 배치가 끝나지 못하고 남은 시간만 쓰므로 각자 단건 생성으로 처리
+        if budget < blog_generator.latency_budget:
+            RETRIES.inc(operation='batch_generate', reason='insufficient_budget')
+            logger.info("배치 생성에 남은 시간 부족, 단건 생성으로 진행 (%.1f초)", budget,
+                        extra={'batch_size': len(batch), 'budget': round(budget, 3)})
+            return None
+        return budget
+
+    def _run_job(self, job: Dict[str, Any], worker_id: str, heartbeat: LeaseHeartbeat):
+        try:
+            pipeline = self._create_pipeline(job, worker_id, heartbeat)
+        except Exception as e:
+            self._handle_failure(job, worker_id, e)
+            return
+        self._finish_job(job, worker_id, pipeline, heartbeat)
+
+    def _save_checkpoint(self, job: Dict[str, Any], worker_id: str, heartbeat: LeaseHeartbeat,
+                         stage: str, checkpoints: Dict[str, Any]):
+        heartbeat.check(job['id'])
+        if not self.job_queue.save_checkpoint(job['id'], worker_id, stage, checkpoints):
+            heartbeat.mark_lost(job['id'])
+            heartbeat.check(job['id'])
+
+    def _create_pipeline(self, job: Dict[str, Any], worker_id: str, heartbeat: LeaseHeartbeat) -> GenerationPipeline:
+        params = job['params']
+        category_name = params.get('category', 'IT/과학')
+        api_settings = self.settings_manager.get_api_settings()
+        resumed = [stage for stage in GenerationPipeline.STAGES if stage in job['checkpoints']]
+        logger.info("작업 시작 (시도 %s, 완료된 단계: %s)", job['attempts'], ', '.join(resumed) or '없음',
+                    extra={'job_id': job['id'], 'attempt': job['attempts']})
+        return GenerationPipeline(
+            api_settings['naver_client_id'], api_settings['naver_client_secret'], api_settings['google_api_key'],
+            params.get('keyword', ''), CATEGORIES.get(category_name), category_name,
+            news_archive=self.news_archive,
+            news_cache_max_age=self.settings_manager.get_setting('news_cache_max_age', 0),
+            naver_pool=self.naver_pool, gemini_pool=self.gemini_pool,
+            settings_manager=self.settings_manager,
+            checkpoints=job['checkpoints'],
+            checkpoint_callback=lambda stage, checkpoints: self._save_checkpoint(
+                job, worker_id, heartbeat, stage, checkpoints),
+            download_images=params.get('options', {}).get('download_images', self.download_images),
+            story_index=self.story_index,
+            latency_budget=params.get('options', {}).get('latency_budget'),
+            deadline=params.get('options', {}).get('deadline'),
+            candidates=params.get('options', {}).get('candidates'),
+            candidate_mode=params.get('options', {}).get('candidate_mode')
+        )
+
+    def _finish_job(self, job: Dict[str, Any], worker_id: str, pipeline: GenerationPipeline,
+                    heartbeat: LeaseHeartbeat):
+        profiler = RunProfiler(f"job_{job['id']}")
+        try:
+            heartbeat.check(job['id'])
+            with profiler:
+                result = pipeline.run()
+            heartbeat.check(job['id'])
+        except Exception as e:
+            self._handle_failure(job, worker_id, e)
+            return
+        finally:
+            heartbeat.release(job['id'])
+            if profiler.summary:
+                logger.info("프로파일: %s", profiler.summary['report_path'], extra={'job_id': job['id']})
+        if not self.job_queue.complete(job['id'], worker_id, result):
+            JOBS.inc(runner='queue', status='lease_lost')
+            logger.warning("작업 임대를 잃어 결과를 저장하지 않았습니다.", extra={'job_id': job['id']})
+            return
+        JOBS.inc(runner='queue', status='succeeded')
+        deadline_report = pipeline.deadline_report or {}
+        logger.info("작업 완료: %s", result.get('title', ''),
+                    extra={'job_id': job['id'], 'elapsed': deadline_report.get('elapsed'),
+                           'deadline_exceeded': deadline_report.get('exceeded'),
+                           'overruns': ','.join(deadline_report.get('overruns', [])),
+                           'degraded': ','.join(deadline_report.get('degraded', []))})
+
+    def _handle_failure(self, job: Dict[str, Any], worker_id: str, error: Exception):
+        if isinstance(error, LeaseLostError):
+            # 다른 워커가 이미 작업을 가져갔으므로 상태를 건드리지 않음
+            JOBS.inc(runner='queue', status='lease_lost')
+            logger.warning("작업 중단: %s", error, extra={'job_id': job['id']})
+            return
+        if isinstance(error, CredentialsExhaustedError):
+            self.job_queue.fail(job['id'], worker_id, str(error), retry_after=3600, count_attempt=False)
+            JOBS.inc(runner='queue', status='quota_exhausted')
+            logger.warning("API 한도 소진, 1시간 뒤 재시도: %s", error, extra={'job_id': job['id']})
+            return
+        self.job_queue.fail(job['id'], worker_id, str(error), retry_after=30 * job['attempts'])
+        JOBS.inc(runner='queue', status='failed')
+        logger.error("작업 실패: %s", error, extra={'job_id': job['id'], 'attempt': job['attempts']})
+
+def load_jobs_file(path: str) -> List[Dict[str, Any]]:
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                jobs.append(json.loads(line))
+    return jobs
@@ -0,0 +1,75 @@
+import logging
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+from utils.naver_news import NaverNewsClient, NaverAPIError, build_search_query
+from utils.news_sources import fetch_incremental
+
+logger = logging.getLogger(__name__)
+
+class NewsPrefetcher(QThread):
+    query_refreshed = pyqtSignal(str, int)
+    quota_exhausted = pyqtSignal(int)
+
+    USAGE_NAME = 'naver_prefetch'
+
+    def __init__(self, naver_id, naver_secret, news_archive, categories, recent_keywords=None,
+                 interval_seconds=300, daily_quota=1000, max_age=600, credential_pool=None):
+        super().__init__()
+        self.credential_pool = credential_pool
+        self.naver_id = naver_id
+        self.naver_secret = naver_secret
+        self.news_archive = news_archive
+        self.categories = dict(categories)
+        self.recent_keywords = list(recent_keywords or [])
+        self.interval_seconds = max(30, interval_seconds)
+        self.daily_quota = daily_quota
+        self.max_age = max_age
+        self._stop_event = threading.Event()
+        self._keywords_lock = threading.Lock()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def set_recent_keywords(self, keywords):
+        with self._keywords_lock:
+            self.recent_keywords = list(keywords)
+
+    def _targets(self):
+        targets = [(build_search_query('', name, category_id), name) for name, category_id in self.categories.items()]
+        with self._keywords_lock:
+            keywords = list(self.recent_keywords)
+        targets.extend((build_search_query(keyword), '전체') for keyword in keywords if keyword.strip())
+        unique_targets = []
+        seen = set()
+        for query, category in targets:
+            if query not in seen:
+                seen.add(query)
+                unique_targets.append((query, category))
+        return unique_targets
+
+    def run(self):
+        client = NaverNewsClient(self.naver_id, self.naver_secret, credential_pool=self.credential_pool)
+        # 만료 직전에 갱신되도록 한 주기만큼 일찍 오래된 것으로 간주
+        refresh_age = max(0, self.max_age - self.interval_seconds)
+        while not self._stop_event.is_set():
+            for query, category in self._targets():
+                if self._stop_event.is_set():
+                    break
+                if self.news_archive.is_fresh(query, refresh_age):
+                    continue
+                used = self.news_archive.usage_today(self.USAGE_NAME)
+                if used >= self.daily_quota:
+                    self.quota_exhausted.emit(used)
+                    break
+                try:
+                    news_items, calls = fetch_incremental(client, self.news_archive, query, category)
+                    self.news_archive.add_usage(self.USAGE_NAME, calls)
+                    self.query_refreshed.emit(query, len(news_items))
+                except NaverAPIError as e:
+                    self.news_archive.add_usage(self.USAGE_NAME)
+                    logger.warning("뉴스 미리 가져오기 실패: %s", e, extra={'query': query})
+                    if e.status_code in (401, 403, 429):
+                        break
+                except Exception as e:
+                    logger.warning("뉴스 미리 가져오기 실패: %s", e, extra={'query': query})
+            self._stop_event.wait(self.interval_seconds)
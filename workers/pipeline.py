@@ -0,0 +1,380 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ai_modules import BlogGenerator
+from ai_modules.blog_prompts import BlogPrompts
+from ai_modules.blog_scorer import score_blog
+from ai_modules.news_ranker import rank_news
+from ai_modules.image_searcher import ImageSearcher
+from utils.naver_news import build_search_query
+from utils.news_sources import build_news_sources, gather_news
+from utils.image_downloader import ImageDownloader, DOWNLOAD_TIMEOUT
+from utils.credential_pool import CredentialsExhaustedError
+from utils.story_index import title_similarity
+from utils.image_hash_index import get_image_hash_index
+from utils.metrics import STAGE_SECONDS, cache_lookup
+from utils.deadline import RunDeadline, DEFAULT_RUN_DEADLINE, MIN_STAGE_BUDGET, cap_timeout
+from utils.article_fetcher import DEFAULT_DEADLINE as ARTICLE_DEADLINE
+
+logger = logging.getLogger(__name__)
+
+class PipelineError(Exception):
+    pass
+
+class GenerationPipeline:
+    STAGES = ('news', 'blog', 'images', 'downloads')
+    CANDIDATE_MODES = ('stories', 'variations')
+    VARIATION_TEMPERATURES = (0.7, 0.9, 1.0, 0.5, 1.1)
+    MAX_CANDIDATES = len(VARIATION_TEMPERATURES)
+
+    def __init__(self, naver_id, naver_secret, gemini_key, topic, category_id, category_name,
+                 news_archive=None, news_cache_max_age=0, prepared=None,
+                 naver_pool=None, gemini_pool=None, settings_manager=None, progress_callback=None,
+                 checkpoints=None, checkpoint_callback=None, download_images=False, image_downloader=None,
+                 story_index=None, latency_budget=None, candidates=None, candidate_mode=None, news_sources=None,
+                 deadline=None):
+        self.naver_id = naver_id
+        self.naver_secret = naver_secret
+        self.gemini_key = gemini_key
+        self.topic = topic
+        self.category_id = category_id
+        self.category_name = category_name
+        self.news_archive = news_archive
+        self.news_cache_max_age = news_cache_max_age
+        self.prepared = prepared
+        self.naver_pool = naver_pool
+        self.gemini_pool = gemini_pool
+        self.settings_manager = settings_manager
+        self.progress_callback = progress_callback
+        self.checkpoints = dict(checkpoints or {})
+        self.checkpoint_callback = checkpoint_callback
+        self.download_images = download_images
+        self.image_downloader = image_downloader
+        self.story_index = story_index
+        self.latency_budget = latency_budget
+        self.news_sources = news_sources
+        generation_settings = settings_manager.get_generation_settings() if settings_manager else {}
+        self.candidates = max(1, int(candidates or generation_settings.get('generation_candidates', 1)))
+        self.candidate_mode = candidate_mode or generation_settings.get('candidate_mode', 'stories')
+        if self.candidate_mode not in self.CANDIDATE_MODES:
+            raise PipelineError(f"알 수 없는 후보 생성 방식: {self.candidate_mode}")
+        # 한 번의 실행 전체에 주어지는 시간 (0이면 제한 없음)
+        self.deadline = float(deadline if deadline is not None
+                              else generation_settings.get('generation_deadline', DEFAULT_RUN_DEADLINE))
+        self.run_deadline = None
+        # 마지막 실행의 단계별 시간 예산 결과. 글 데이터와 섞이지 않도록 따로 보관
+        self.deadline_report = None
+        self.chosen_news = None
+        self.blog_generator = None
+
+    def _report(self, stage, message):
+        if self.progress_callback:
+            self.progress_callback(stage, message)
+
+    def _checkpoint(self, stage, data, timings):
+        self.checkpoints[stage] = data
+        self.checkpoints['timings'] = timings
+        if self.checkpoint_callback:
+            self.checkpoint_callback(stage, self.checkpoints)
+
+    def _get_run_deadline(self):
+        # 첫 단계를 시작할 때 시계를 시작하고, 체크포인트로 이미 끝난 단계는 예산을 나눠 받지 않음
+        if not self.run_deadline:
+            stages = [stage for stage in self.STAGES if stage not in self.checkpoints
+                      and (stage != 'downloads' or self.download_images)]
+            self.run_deadline = RunDeadline(self.deadline, stages)
+        return self.run_deadline
+
+    @staticmethod
+    def _expires_at(limit):
+        return None if limit is None else time.monotonic() + limit
+
+    @staticmethod
+    def _time_left(expires_at):
+        return None if expires_at is None else max(0.0, expires_at - time.monotonic())
+
+    @staticmethod
+    def _record_timing(timings, stage, started):
+        elapsed = time.perf_counter() - started
+        timings[stage] = round(elapsed, 3)
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+
+    def _get_blog_generator(self):
+        if not self.blog_generator:
+            generation_settings = self.settings_manager.get_generation_settings() if self.settings_manager else {}
+            self.blog_generator = BlogGenerator(
+                self.gemini_key, credential_pool=self.gemini_pool, story_index=self.story_index,
+                model_tiers=generation_settings.get('gemini_model_tiers'),
+                latency_budget=self.latency_budget or generation_settings.get('generation_latency_budget', 120),
+                hedge=generation_settings.get('generation_hedge_enabled', True)
+            )
+        return self.blog_generator
+
+    def prepare_news(self):
+        if 'news' not in self.checkpoints:
+            timings = dict(self.checkpoints.get('timings', {}))
+            started = time.perf_counter()
+            self._report('search', "뉴스 검색 중...")
+            with self._get_run_deadline().stage('news') as limit:
+                expires_at = self._expires_at(limit)
+                cache_lookup('prepared_news', bool(self.prepared))
+                if self.prepared:
+                    news_list = self.prepared['news_list']
+                else:
+                    news_list = self._search_news(expires_at)
+                if not news_list:
+                    raise PipelineError("검색된 뉴스가 없습니다.")
+                news_pick = self._pick_news(news_list, expires_at)
+            self._record_timing(timings, 'search', started)
+            self._checkpoint('news', news_pick, timings)
+        return self.checkpoints['news']
+
+    def needs_blog(self):
+        return 'blog' not in self.checkpoints
+
+    def accept_blog(self, blog_data, elapsed, batch_size=1):
+        # 배치 요청으로 만든 결과를 단건 생성과 같은 체크포인트로 넣어 이후 단계가 그대로 이어지게 함
+        timings = dict(self.checkpoints.get('timings', {}))
+        timings['generate'] = round(elapsed, 3)
+        timings['batch_size'] = batch_size
+        STAGE_SECONDS.observe(elapsed, stage='generate')
+        self._get_run_deadline().record('blog', elapsed)
+        self._checkpoint('blog', blog_data, timings)
+        self._record_story(self.checkpoints['news']['top_news'])
+
+    def run(self):
+        self.prepare_news()
+        run_deadline = self._get_run_deadline()
+        timings = dict(self.checkpoints.get('timings', {}))
+        if 'blog' not in self.checkpoints:
+            started = time.perf_counter()
+            self._report('generate', "AI 블로그 생성 중...")
+            with run_deadline.stage('blog') as limit:
+                blog_data = self._generate_blog(self.checkpoints['news'], limit)
+            if not blog_data:
+                raise PipelineError("블로그 생성에 실패했습니다.")
+            self._record_timing(timings, 'generate', started)
+            self._checkpoint('blog', blog_data, timings)
+            self._record_story(self.chosen_news)
+
+        if 'images' not in self.checkpoints:
+            if run_deadline.allows('images'):
+                started = time.perf_counter()
+                self._report('images', "이미지 검색 중...")
+                with run_deadline.stage('images') as limit:
+                    images = self._search_images(self.checkpoints['blog'], limit)
+                self._record_timing(timings, 'image_search', started)
+            else:
+                # 이미지는 없어도 글이 완성되므로 남은 시간이 없으면 건너뜀
+                self._report('images', "남은 시간이 부족해 이미지 검색을 건너뜁니다.")
+                images = {}
+            self._checkpoint('images', images, timings)
+
+        final_blog = dict(self.checkpoints['blog'])
+        final_blog['images'] = self.checkpoints['images']
+        if self.download_images:
+            if 'downloads' not in self.checkpoints:
+                if run_deadline.allows('downloads'):
+                    started = time.perf_counter()
+                    self._report('downloads', "이미지 다운로드 중...")
+                    with run_deadline.stage('downloads') as limit:
+                        local_images = self._download_images(final_blog['images'], limit)
+                    self._record_timing(timings, 'image_download', started)
+                else:
+                    self._report('downloads', "남은 시간이 부족해 이미지 다운로드를 건너뜁니다.")
+                    local_images = {}
+                self._checkpoint('downloads', local_images, timings)
+            final_blog['local_images'] = self.checkpoints['downloads']
+        final_blog['timings'] = timings
+        self.deadline_report = deadline_report = run_deadline.report()
+        if deadline_report['overruns'] or deadline_report['degraded']:
+            overruns = ', '.join(deadline_report['overruns']) or '없음'
+            degraded = ', '.join(deadline_report['degraded']) or '없음'
+            self._report('deadline', f"시간 예산 초과 단계: {overruns} / 축소된 단계: {degraded}")
+        self._report('done', "완료!")
+        return final_blog
+
+    def _search_news(self, expires_at=None):
+        try:
+            search_query = build_search_query(self.topic, self.category_name, self.category_id)
+
+            sources = self._get_news_sources()
+            if not sources:
+                raise Exception("네이버 API 키가 설정되지 않았습니다. 설정 탭에서 API 키를 입력해주세요.")
+
+            category = getattr(self, 'category_name', '전체')
+            if self.news_archive and self.news_cache_max_age > 0 \
+                    and self.news_archive.is_fresh(search_query, self.news_cache_max_age):
+                cached = self.news_archive.get_query_results(search_query, limit=50, category=category)
+                cache_lookup('news_archive', bool(cached))
+                if cached:
+                    return [item.to_dict() for item in cached]
+
+            news_items = self._gather_news(sources, search_query, category, expires_at=expires_at)
+            if not news_items and search_query != '최신뉴스' and self._time_left(expires_at) != 0:
+                news_items = self._gather_news(sources, '최신뉴스', '전체', limit=30, expires_at=expires_at)
+            if not news_items:
+                raise Exception(f"'{search_query}' 검색 결과가 없습니다.")
+            return [item.to_dict() for item in news_items]
+        except CredentialsExhaustedError:
+            raise
+        except Exception as e:
+            raise Exception(f"뉴스 검색 중 오류: {str(e)}")
+
+    def _get_news_sources(self):
+        if self.news_sources is None:
+            self.news_sources = build_news_sources(self.settings_manager, self.naver_id, self.naver_secret,
+                                                   self.naver_pool, news_archive=self.news_archive)
+        return self.news_sources
+
+    def _gather_news(self, sources, query, category, limit=50, expires_at=None):
+        news_items, errors = gather_news(sources, query, category, limit, timeout=self._time_left(expires_at))
+        if not news_items and errors:
+            # 모든 소스가 실패했을 때만 오류로 처리하고, 키 소진 같은 예외는 그대로 올려 재시도 정책이 적용되게 함
+            raise next(iter(errors.values()))
+        return news_items
+
+    def _pick_news(self, news_list, expires_at=None):
+        if self.prepared and self.candidates == 1:
+            return {'top_news': self.prepared['top_news'], 'prompt': self.prepared['prompt']}
+        blog_generator = self._get_blog_generator()
+        blog_generator.set_news_data(news_list)
+        # 원문을 다 받지 못해도 기본 배경 정보로 진행되므로 뉴스 단계에 남은 시간만큼만 기다림
+        context_deadline = None if expires_at is None else cap_timeout(ARTICLE_DEADLINE, self._time_left(expires_at))
+        if self.candidates == 1 or self.candidate_mode == 'variations':
+            top_news = blog_generator._select_top_news()
+            if not top_news:
+                raise PipelineError("분석할 뉴스가 없습니다")
+            additional_info = blog_generator._get_additional_context(top_news, context_deadline)
+            news_pick = {'top_news': top_news, 'prompt': BlogPrompts.get_blog_prompt(top_news, additional_info)}
+            if self.candidates > 1:
+                news_pick['candidates'] = [{'top_news': top_news, 'prompt': news_pick['prompt'], 'temperature': t}
+                                           for t in self.VARIATION_TEMPERATURES[:self.candidates]]
+            return news_pick
+
+        stories = self._distinct_top_stories(news_list)
+        if not stories:
+            raise PipelineError("분석할 뉴스가 없습니다")
+        with ThreadPoolExecutor(max_workers=len(stories)) as executor:
+            contexts = list(executor.map(lambda news: blog_generator._get_additional_context(news, context_deadline),
+                                         stories))
+        candidates = [{'top_news': news, 'prompt': BlogPrompts.get_blog_prompt(news, context), 'temperature': 0.7}
+                      for news, context in zip(stories, contexts)]
+        return {'top_news': stories[0], 'prompt': candidates[0]['prompt'], 'candidates': candidates}
+
+    def _distinct_top_stories(self, news_list, max_similarity=0.5):
+        # 같은 사건을 다룬 기사끼리 후보 자리를 나눠 갖지 않도록 제목이 많이 겹치는 기사는 건너뜀
+        stories = []
+        for _, news in rank_news(news_list, self.story_index):
+            title = news.get('title', '')
+            if any(title_similarity(title, chosen.get('title', '')) >= max_similarity for chosen in stories):
+                continue
+            stories.append(news)
+            if len(stories) >= self.candidates:
+                break
+        return stories
+
+    def _record_story(self, top_news):
+        if not self.story_index:
+            return
+        try:
+            self.story_index.record(top_news)
+        except Exception as e:
+            logger.warning("발행 기록 저장 실패 (계속 진행): %s", e, extra={'title': top_news.get('title', '')})
+
+    def _generate_blog(self, news_pick, limit=None):
+        blog_generator = self._get_blog_generator()
+        latency_budget = None if limit is None else min(blog_generator.latency_budget, limit)
+        if len(news_pick.get('candidates', [])) > 1:
+            return self._generate_candidates(news_pick['candidates'], latency_budget)
+        self.chosen_news = news_pick['top_news']
+        blog_data = blog_generator._generate_with_sdk(news_pick['prompt'], latency_budget=latency_budget)
+        return blog_generator._post_process(blog_data, news_pick['top_news'])
+
+    def _generate_candidates(self, candidates, latency_budget=None):
+        blog_generator = self._get_blog_generator()
+
+        def generate(candidate):
+            blog_data = blog_generator._generate_with_sdk(candidate['prompt'], candidate['temperature'], latency_budget)
+            return blog_generator._post_process(blog_data, candidate['top_news'])
+
+        results = []
+        errors = []
+        with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            futures = [(candidate, executor.submit(generate, candidate)) for candidate in candidates]
+            for candidate, future in futures:
+                try:
+                    blog_data = future.result()
+                    results.append((score_blog(blog_data), blog_data, candidate))
+                except CredentialsExhaustedError:
+                    raise
+                except Exception as e:
+                    errors.append(e)
+                    logger.warning("후보 생성 실패: %s", e, extra={'title': candidate['top_news'].get('title', '')})
+        if not results:
+            raise errors[-1] if errors else PipelineError("블로그 생성에 실패했습니다.")
+
+        results.sort(key=lambda x: x[0], reverse=True)
+        best_score, best, best_candidate = results[0]
+        best = dict(best)
+        best['candidate_scores'] = [{
+            'title': blog_data.get('title', ''),
+            'source_title': candidate['top_news'].get('title', ''),
+            'generator': blog_data.get('generator', ''),
+            'temperature': candidate['temperature'],
+            'score': score
+        } for score, blog_data, candidate in results]
+        self.chosen_news = best_candidate['top_news']
+        logger.info("후보 %d개 중 최고 점수 %s: %s", len(results), best_score, best.get('title', ''),
+                    extra={'candidates': len(results), 'score': best_score})
+        return best
+
+    def _search_images(self, blog_data, limit=None):
+        try:
+            expires_at = self._expires_at(limit)
+            image_keywords = blog_data.get('image_keywords', [])
+            if not image_keywords:
+                return {}
+            if not self.settings_manager:
+                from utils import SettingsManager
+                self.settings_manager = SettingsManager()
+            image_searcher = ImageSearcher(self.settings_manager)
+            context = ' '.join([blog_data.get('title', '')] + list(blog_data.get('tags', [])))
+            images = image_searcher.search_images(image_keywords, context=context, timeout=limit)
+            self._prefer_unused_images(images, expires_at)
+            return images
+        except Exception as e:
+            logger.warning("이미지 검색 오류 (계속 진행): %s", e, extra={'topic': self.topic})
+            return {}
+
+    def _prefer_unused_images(self, images, expires_at=None):
+        hash_index = get_image_hash_index()
+        if not hash_index:
+            return
+        # 최근 글에 쓴 사진과 비슷하지 않은 후보를 맨 앞으로 옮기고 바로 기록해 두 번째 이미지도 첫 번째와 겹치지 않게 함
+        for candidates in images.values():
+            chosen, phash = hash_index.pick_unused(candidates, expires_at=expires_at)
+            if not chosen:
+                continue
+            candidates.remove(chosen)
+            candidates.insert(0, chosen)
+            if phash is not None:
+                hash_index.record_use(phash, chosen['url'])
+
+    def _download_images(self, images, limit=None):
+        if not self.image_downloader:
+            self.image_downloader = ImageDownloader()
+        expires_at = self._expires_at(limit)
+        local_images = {}
+        for marker_key, candidates in images.items():
+            if candidates and candidates[0].get('url'):
+                timeout = cap_timeout(DOWNLOAD_TIMEOUT, self._time_left(expires_at))
+                if timeout < MIN_STAGE_BUDGET:
+                    # 남은 이미지는 원격 주소로 두고 받은 것까지만 사용
+                    self._get_run_deadline().degrade('downloads', 'budget_exhausted')
+                    break
+                local_path = self.image_downloader.download_image(
+                    candidates[0]['url'], filename_prefix=marker_key.replace('_', ''), timeout=timeout)
+                if local_path:
+                    local_images[marker_key] = local_path
+        return local_images
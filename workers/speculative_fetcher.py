@@ -0,0 +1,82 @@
+import logging
+import time
+import threading
+from PyQt6.QtCore import QThread, pyqtSignal
+from ai_modules.blog_prompts import BlogPrompts
+from ai_modules.news_ranker import select_top_news
+from utils.naver_news import build_search_query
+from utils.news_sources import build_news_sources, gather_news, DEFAULT_SOURCE_DEADLINE
+from utils.article_fetcher import get_article_fetcher
+
+logger = logging.getLogger(__name__)
+
+class SpeculativeFetcher(QThread):
+    prepared = pyqtSignal(dict)
+
+    USAGE_NAME = 'naver_speculative'
+
+    def __init__(self, naver_id, naver_secret, topic, category_id, category_name,
+                 news_archive=None, news_cache_max_age=0, credential_pool=None, story_index=None,
+                 settings_manager=None):
+        super().__init__()
+        self.credential_pool = credential_pool
+        self.naver_id = naver_id
+        self.naver_secret = naver_secret
+        self.topic = topic
+        self.category_id = category_id
+        self.category_name = category_name
+        self.news_archive = news_archive
+        self.news_cache_max_age = news_cache_max_age
+        self.story_index = story_index
+        self.settings_manager = settings_manager
+        self.query = build_search_query(topic, category_name, category_id)
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            news_list = self._fetch_news()
+            if not news_list or self.is_cancelled():
+                return
+            top_news = select_top_news(news_list, self.story_index)
+            if not top_news or self.is_cancelled():
+                return
+            additional_info = get_article_fetcher().build_context(top_news, news_list) \
+                or BlogPrompts.get_news_context(top_news)
+            prompt = BlogPrompts.get_blog_prompt(top_news, additional_info)
+            if self.is_cancelled():
+                return
+            self.prepared.emit({
+                'query': self.query,
+                'news_list': news_list,
+                'top_news': top_news,
+                'prompt': prompt,
+                'prepared_at': time.time()
+            })
+        except Exception as e:
+            logger.warning("추천 뉴스 미리 준비 실패: %s", e, extra={'query': self.query})
+
+    def _fetch_news(self):
+        category = self.category_name or '전체'
+        if self.news_archive and self.news_cache_max_age > 0 \
+                and self.news_archive.is_fresh(self.query, self.news_cache_max_age):
+            cached = self.news_archive.get_query_results(self.query, limit=50, category=category)
+            if cached:
+                return [item.to_dict() for item in cached]
+        if self.is_cancelled():
+            return []
+        sources = build_news_sources(self.settings_manager, self.naver_id, self.naver_secret, self.credential_pool,
+                                     news_archive=self.news_archive)
+        source_settings = self.settings_manager.get_news_source_settings() if self.settings_manager else {}
+        timeout = source_settings.get('news_source_deadline', DEFAULT_SOURCE_DEADLINE)
+        news_items, _ = gather_news(sources, self.query, category, timeout=timeout)
+        if self.is_cancelled():
+            return []
+        if self.news_archive:
+            self.news_archive.add_usage(self.USAGE_NAME)
+        return [item.to_dict() for item in news_items]